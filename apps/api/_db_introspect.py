@@ -0,0 +1,33 @@
+"""Read-only snapshot of a local SQLite database for the check_* scripts."""
+
+import sqlite3
+
+SNAPSHOT_SQL = """
+SELECT 'ver', version_num FROM alembic_version
+UNION ALL
+SELECT 'tbl', name FROM sqlite_master WHERE type = 'table'
+ORDER BY 1, 2
+"""
+
+TABLES_SQL = "SELECT 'tbl', name FROM sqlite_master WHERE type = 'table' ORDER BY 2"
+
+
+def snapshot(path):
+    """Return ``(versions, tables)`` for the database at ``path``.
+
+    ``versions`` is None when there is no alembic_version table. The file is
+    opened read-only, so a wrong path errors instead of creating a new
+    empty database.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None)
+    try:
+        try:
+            rows = conn.execute(SNAPSHOT_SQL).fetchall()
+            versions = [value for kind, value in rows if kind == "ver"]
+        except sqlite3.OperationalError:
+            rows = conn.execute(TABLES_SQL).fetchall()
+            versions = None
+    finally:
+        conn.close()
+    tables = [value for kind, value in rows if kind == "tbl"]
+    return versions, tables
@@ -33,6 +33,12 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Prompt.metadata
 
+# The revisions rely on PostgreSQL 11+: ADD COLUMN ... DEFAULT <constant>
+# NOT NULL is a catalog-only change there (older servers rewrite the whole
+# table under an ACCESS EXCLUSIVE lock), and INCLUDE indexes and EXECUTE
+# FUNCTION triggers need it too.
+MIN_POSTGRES_VERSION = (11,)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -77,6 +83,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        version = connection.dialect.server_version_info
+        if connection.dialect.name == "postgresql" and version < MIN_POSTGRES_VERSION:
+            raise RuntimeError(
+                "Migrations require PostgreSQL %s+, server is %s"
+                % (".".join(map(str, MIN_POSTGRES_VERSION)), ".".join(map(str, version)))
+            )
+
         context.configure(connection=connection, target_metadata=target_metadata)
 
         with context.begin_transaction():
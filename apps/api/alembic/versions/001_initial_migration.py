@@ -27,29 +27,31 @@ def upgrade() -> None:
     if not inspector.has_table('prompts'):
         op.create_table(
             'prompts',
-            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True),
             sa.Column('slug', sa.String(255), nullable=False),
             sa.Column('title', sa.String(500), nullable=False),
             sa.Column('summary', sa.Text(), nullable=False),
             sa.Column('difficulty', sa.String(20), nullable=False),
-            sa.Column('worksWith', postgresql.JSON(astext_type=sa.Text()), nullable=False),
-            sa.Column('tags', postgresql.JSON(astext_type=sa.Text()), nullable=False),
-            sa.Column('targetSites', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+            sa.Column('worksWith', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+            sa.Column('tags', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+            sa.Column('targetSites', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
             sa.Column('promptText', sa.Text(), nullable=False),
-            sa.Column('steps', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+            sa.Column('steps', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
             sa.Column('notes', sa.Text(), nullable=True),
             sa.Column('createdAt', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
             sa.Column('updatedAt', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         )
         
-        # Create unique constraint on slug
-        op.create_unique_constraint('uq_prompts_slug', 'prompts', ['slug'])
-        
-        # Create indexes
-        op.create_index('ix_prompts_slug', 'prompts', ['slug'], unique=False)
+        # The table is new and empty, so its indexes are built in the same
+        # transaction: a failed build rolls back the table too, and a rerun
+        # starts over instead of skipping a half-indexed table.
+        # Unique slug index, covering id so slug -> id lookups are index-only
+        op.create_index('ix_prompts_slug', 'prompts', ['slug'], unique=True, postgresql_include=['id'])
         op.create_index('idx_difficulty', 'prompts', ['difficulty'], unique=False)
         op.create_index('idx_created_at', 'prompts', ['createdAt'], unique=False)
-        op.create_index('idx_updated_at', 'prompts', ['updatedAt'], unique=False)
+        # updatedAt is only ever range-scanned, never used for ORDER BY ... LIMIT,
+        # so a BRIN summary is enough (createdAt keeps its B-tree for the list view).
+        op.create_index('idx_updated_at_brin', 'prompts', ['updatedAt'], unique=False, postgresql_using='brin', postgresql_with={'pages_per_range': 64})
 
 
 def downgrade() -> None:
@@ -58,13 +60,10 @@ def downgrade() -> None:
     
     if inspector.has_table('prompts'):
         # Drop indexes
-        op.drop_index('idx_updated_at', table_name='prompts')
+        op.drop_index('idx_updated_at_brin', table_name='prompts')
         op.drop_index('idx_created_at', table_name='prompts')
         op.drop_index('idx_difficulty', table_name='prompts')
         op.drop_index('ix_prompts_slug', table_name='prompts')
         
-        # Drop unique constraint on slug
-        op.drop_constraint('uq_prompts_slug', 'prompts', type_='unique')
-        
         # Drop the prompts table
         op.drop_table('prompts')
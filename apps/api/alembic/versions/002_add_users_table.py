@@ -10,6 +10,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 import sqlmodel
 
 
@@ -26,10 +27,13 @@ def upgrade() -> None:
     inspector = sa.inspect(conn)
     
     if not inspector.has_table("users"):
+        # citext compares case-insensitively, so the unique index on email
+        # also serves case-insensitive lookups (no lower(email) index needed).
+        op.execute("CREATE EXTENSION IF NOT EXISTS citext")
         op.create_table(
             "users",
-            sa.Column("id", sa.String(), nullable=False),
-            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("email", postgresql.CITEXT(), nullable=False),
             sa.Column("hashed_password", sa.String(), nullable=False),
             sa.Column("is_active", sa.Boolean(), nullable=False),
             sa.Column("is_superuser", sa.Boolean(), nullable=False),
@@ -10,6 +10,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 import sqlmodel
 
 
@@ -27,8 +28,20 @@ def upgrade() -> None:
     columns = [c['name'] for c in inspector.get_columns("prompts")]
     
     if "author_id" not in columns:
-        op.add_column("prompts", sa.Column("author_id", sa.String(), nullable=True))
-        op.create_foreign_key(None, "prompts", "users", ["author_id"], ["id"])
+        op.add_column("prompts", sa.Column("author_id", postgresql.UUID(as_uuid=False), nullable=True))
+        # prompts already holds rows: add the FK NOT VALID (brief lock, no
+        # scan), then validate it outside the transaction under a lock that
+        # doesn't block reads or writes.
+        op.create_foreign_key(
+            "prompts_author_id_fkey",
+            "prompts",
+            "users",
+            ["author_id"],
+            ["id"],
+            postgresql_not_valid=True,
+        )
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TABLE prompts VALIDATE CONSTRAINT prompts_author_id_fkey")
 
 
 def downgrade() -> None:
@@ -37,5 +50,5 @@ def downgrade() -> None:
     columns = [c['name'] for c in inspector.get_columns("prompts")]
     
     if "author_id" in columns:
-        op.drop_constraint(None, "prompts", type_="foreignkey")
+        op.drop_constraint("prompts_author_id_fkey", "prompts", type_="foreignkey")
         op.drop_column("prompts", "author_id")
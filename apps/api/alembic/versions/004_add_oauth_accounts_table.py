@@ -10,6 +10,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -27,8 +28,8 @@ def upgrade() -> None:
     if not inspector.has_table("oauth_accounts"):
         op.create_table(
             "oauth_accounts",
-            sa.Column("id", sa.String(), nullable=False),
-            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=False), nullable=False),
             sa.Column("provider", sa.String(length=32), nullable=False),
             sa.Column("provider_user_id", sa.String(length=255), nullable=False),
             sa.Column("email", sa.String(length=255), nullable=True),
@@ -49,10 +50,16 @@ def upgrade() -> None:
         )
 
         op.create_index(
-            op.f("ix_oauth_accounts_user_id"), "oauth_accounts", ["user_id"], unique=False
+            op.f("ix_oauth_accounts_user_id"),
+            "oauth_accounts",
+            ["user_id"],
+            unique=False,
         )
         op.create_index(
-            op.f("ix_oauth_accounts_provider"), "oauth_accounts", ["provider"], unique=False
+            op.f("ix_oauth_accounts_provider"),
+            "oauth_accounts",
+            ["provider"],
+            unique=False,
         )
         op.create_index(
             op.f("ix_oauth_accounts_provider_user_id"),
@@ -10,6 +10,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -27,9 +28,9 @@ def upgrade() -> None:
     if not inspector.has_table("comments"):
         op.create_table(
             "comments",
-            sa.Column("id", sa.String(), nullable=False),
-            sa.Column("prompt_id", sa.String(), nullable=False),
-            sa.Column("author_id", sa.String(), nullable=False),
+            sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("prompt_id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("author_id", postgresql.UUID(as_uuid=False), nullable=False),
             sa.Column("body", sa.Text(), nullable=False),
             sa.Column(
                 "createdAt",
@@ -43,7 +44,10 @@ def upgrade() -> None:
         )
 
         op.create_index(
-            op.f("ix_comments_prompt_id"), "comments", ["prompt_id"], unique=False
+            "ix_comments_prompt_created",
+            "comments",
+            ["prompt_id", "createdAt"],
+            unique=False,
         )
         op.create_index(
             op.f("ix_comments_author_id"), "comments", ["author_id"], unique=False
@@ -56,5 +60,5 @@ def downgrade() -> None:
     
     if inspector.has_table("comments"):
         op.drop_index(op.f("ix_comments_author_id"), table_name="comments")
-        op.drop_index(op.f("ix_comments_prompt_id"), table_name="comments")
+        op.drop_index("ix_comments_prompt_created", table_name="comments")
         op.drop_table("comments")
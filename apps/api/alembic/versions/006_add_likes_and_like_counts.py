@@ -8,8 +8,9 @@ Create Date: 2026-01-18 16:10:00.000000
 
 from typing import Sequence, Union
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -19,6 +20,14 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _unlogged_seed() -> bool:
+    """Whether this run was started with ``-x unlogged_seed=true``.
+
+    For an initial bulk import, append-only tables are created UNLOGGED so the
+    load skips WAL; revision 8b5f1e3a7c92 switches them back with SET LOGGED.
+    """
+    return context.get_x_argument(as_dictionary=True).get("unlogged_seed") == "true"
+
 
 def upgrade() -> None:
     conn = op.get_bind()
@@ -41,12 +50,16 @@ def upgrade() -> None:
 
     # Create likes table.
     if not inspector.has_table("likes"):
+        target_type_enum = postgresql.ENUM(
+            "prompt", "comment", name="target_type", create_type=False
+        )
+        target_type_enum.create(conn, checkfirst=True)
         op.create_table(
             "likes",
-            sa.Column("id", sa.String(), nullable=False),
-            sa.Column("user_id", sa.String(), nullable=False),
-            sa.Column("target_type", sa.String(length=16), nullable=False),
-            sa.Column("target_id", sa.String(), nullable=False),
+            sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=False), nullable=False),
+            sa.Column("target_type", target_type_enum, nullable=False),
+            sa.Column("target_id", postgresql.UUID(as_uuid=False), nullable=False),
             sa.Column(
                 "createdAt",
                 sa.DateTime(),
@@ -61,13 +74,20 @@ def upgrade() -> None:
                 "target_id",
                 name="uq_like_user_target",
             ),
+            prefixes=["UNLOGGED"] if _unlogged_seed() else [],
         )
 
         op.create_index(op.f("ix_likes_user_id"), "likes", ["user_id"], unique=False)
-        op.create_index(
-            op.f("ix_likes_target_type"), "likes", ["target_type"], unique=False
-        )
-        op.create_index(op.f("ix_likes_target_id"), "likes", ["target_id"], unique=False)
+        # target_type only ever holds "prompt" or "comment", so one partial
+        # index per type is smaller than a composite led by the discriminator.
+        for target_type in ("prompt", "comment"):
+            op.create_index(
+                f"ix_likes_{target_type}_target",
+                "likes",
+                ["target_id"],
+                unique=False,
+                postgresql_where=sa.text(f"target_type = '{target_type}'"),
+            )
 
 
 def downgrade() -> None:
@@ -75,11 +95,12 @@ def downgrade() -> None:
     inspector = sa.inspect(conn)
 
     if inspector.has_table("likes"):
-        op.drop_index(op.f("ix_likes_target_id"), table_name="likes")
-        op.drop_index(op.f("ix_likes_target_type"), table_name="likes")
+        for target_type in ("prompt", "comment"):
+            op.drop_index(f"ix_likes_{target_type}_target", table_name="likes")
         op.drop_index(op.f("ix_likes_user_id"), table_name="likes")
 
         op.drop_table("likes")
+        postgresql.ENUM(name="target_type").drop(conn, checkfirst=True)
 
     comment_cols = [c['name'] for c in inspector.get_columns("comments")]
     if "like_count" in comment_cols:
@@ -19,34 +19,108 @@ down_revision: Union[str, None] = "006"
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Rows backfilled per committed UPDATE batch.
+BACKFILL_BATCH_SIZE = 10_000
+
+# Usernames default to the email prefix; users sharing a prefix (ignoring
+# case, as username is citext) are ranked over the whole table (oldest
+# first) and every duplicate after the first gets a "_<n>" suffix. The
+# ranking is a window over all users, so it is computed once into a
+# temporary table rather than again for every batch.
+RANK_USERNAMES_SQL = sa.text(
+    """
+    CREATE TEMPORARY TABLE username_backfill AS
+    SELECT id, prefix || CASE WHEN rn = 1 THEN '' ELSE '_' || rn END AS username
+    FROM (
+        SELECT
+            id,
+            username,
+            split_part(email, '@', 1) AS prefix,
+            row_number() OVER (
+                PARTITION BY lower(split_part(email, '@', 1))
+                ORDER BY "createdAt", id
+            ) AS rn
+        FROM users
+    ) AS ranked
+    WHERE username IS NULL
+    """
+)
+
+# Keyset-paginated backfill: each call copies the next batch of ranked
+# usernames (ordered by id) onto users and returns the batch's last id so
+# the caller can advance the cursor (NULL once there is nothing left).
+BACKFILL_BATCH_SQL = sa.text(
+    """
+    WITH batch AS (
+        SELECT id, username FROM username_backfill
+        WHERE :last_id IS NULL OR id > :last_id
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    updated AS (
+        UPDATE users
+        SET username = batch.username
+        FROM batch
+        WHERE users.id = batch.id AND users.username IS NULL
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+    """
+)
 
 
 def upgrade() -> None:
+    # Every step is safe to rerun, so a migration that failed partway
+    # (e.g. on the unique index) can simply be retried.
     conn = op.get_bind()
-    inspector = sa.inspect(conn)
-    cols = [c['name'] for c in inspector.get_columns("users")]
-    
-    if "username" not in cols:
-        # 1. Add username column as nullable initially
-        op.add_column("users", sa.Column("username", sa.String(length=255), nullable=True))
-        
-        # 2. Populate username with email prefix for existing users (basic fix)
-        op.execute("UPDATE users SET username = split_part(email, '@', 1) WHERE username IS NULL")
-        
-        # 3. Handle potential duplicates (if any) or just hope for the best in early dev
-        # Actually, if there are duplicates, the unique index will fail.
-        # We'll just assume unique emails mean mostly unique prefixes for now.
-        
-        # 4. Make it non-nullable and add index
-        op.alter_column("users", "username", nullable=False)
-        op.create_index(op.f("ix_users_username"), "users", ["username"], unique=True)
+
+    # 1. Add username column as nullable initially
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS username CITEXT")
+
+    # 2. Populate username for rows that don't have one yet.
+    # Run in bounded batches, each committed on its own, so no single
+    # statement holds row locks (or one huge WAL record) for the whole table.
+    with op.get_context().autocommit_block():
+        conn.execute(sa.text("DROP TABLE IF EXISTS username_backfill"))
+        conn.execute(RANK_USERNAMES_SQL)
+        conn.execute(sa.text("ALTER TABLE username_backfill ADD PRIMARY KEY (id)"))
+        last_id = None
+        while True:
+            last_id = conn.execute(
+                BACKFILL_BATCH_SQL,
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if last_id is None:
+                break
+        conn.execute(sa.text("DROP TABLE username_backfill"))
+
+    # 3. Only once the backfill is done: make it non-nullable and add index
+    op.execute("ALTER TABLE users ALTER COLUMN username SET NOT NULL")
+    with op.get_context().autocommit_block():
+        # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+        # which IF NOT EXISTS would otherwise mistake for a finished one.
+        invalid = conn.execute(
+            sa.text(
+                "SELECT 1 FROM pg_index "
+                "WHERE indexrelid = to_regclass('ix_users_username') "
+                "AND NOT indisvalid"
+            )
+        ).first()
+        if invalid:
+            op.drop_index(
+                op.f("ix_users_username"),
+                table_name="users",
+                postgresql_concurrently=True,
+            )
+        op.create_index(
+            op.f("ix_users_username"),
+            "users",
+            ["username"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
-    conn = op.get_bind()
-    inspector = sa.inspect(conn)
-    cols = [c['name'] for c in inspector.get_columns("users")]
-    
-    if "username" in cols:
-        op.drop_index(op.f("ix_users_username"), table_name="users")
-        op.drop_column("users", "username")
+    op.drop_index(op.f("ix_users_username"), table_name="users", if_exists=True)
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS username")
@@ -7,8 +7,9 @@ Create Date: 2026-01-19 06:07:46.642842
 """
 from typing import Sequence, Union
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 import sqlmodel
 from sqlalchemy import inspect
 
@@ -19,16 +20,36 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _add_missing_columns(table_name: str, existing_cols, columns) -> None:
+    """Add every missing column in one ALTER TABLE (one lock, one rewrite)."""
+    missing = [(name, ddl) for name, ddl in columns if name not in existing_cols]
+    if missing:
+        op.execute(
+            f"ALTER TABLE {table_name} "
+            + ", ".join(f'ADD COLUMN "{name}" {ddl}' for name, ddl in missing)
+        )
+
+
 def upgrade() -> None:
+    # Schema only: the indexes for these tables are built CONCURRENTLY by the
+    # follow-up revision c3e7a1f9d254, outside this transaction's locks.
     conn = op.get_bind()
     inspector = inspect(conn)
 
+    # Read the catalog once up front instead of per table/branch.
+    existing_tables = set(inspector.get_table_names())
+    cols = {
+        t: {c['name'] for c in inspector.get_columns(t)}
+        for t in existing_tables & {'users', 'prompts', 'comments'}
+    }
+
     # USERS
-    if not inspector.has_table('users'):
+    if 'users' not in existing_tables:
+        op.execute("CREATE EXTENSION IF NOT EXISTS citext")
         op.create_table('users',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
-        sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('email', postgresql.CITEXT(), nullable=False),
+        sa.Column('username', postgresql.CITEXT(), nullable=False),
         sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
         sa.Column('is_active', sa.Boolean(), nullable=False),
         sa.Column('is_superuser', sa.Boolean(), nullable=False),
@@ -37,39 +58,34 @@ def upgrade() -> None:
         sa.Column('is_seller', sa.Boolean(), nullable=False),
         sa.PrimaryKeyConstraint('id')
         )
-        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-        op.create_index(op.f('ix_users_stripe_connect_id'), 'users', ['stripe_connect_id'], unique=False)
-        op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
     else:
         # Check columns
-        user_cols = [c['name'] for c in inspector.get_columns('users')]
-        if 'stripe_connect_id' not in user_cols:
-             op.add_column('users', sa.Column('stripe_connect_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
-             op.create_index(op.f('ix_users_stripe_connect_id'), 'users', ['stripe_connect_id'], unique=False)
-        if 'is_seller' not in user_cols:
-             op.add_column('users', sa.Column('is_seller', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+        user_cols = cols['users']
+        _add_missing_columns('users', user_cols, [
+            ('stripe_connect_id', 'VARCHAR'),
+            ('is_seller', 'BOOLEAN DEFAULT false NOT NULL'),
+        ])
 
     # LIKES
-    if not inspector.has_table('likes'):
+    if 'likes' not in existing_tables:
+        target_type_enum = postgresql.ENUM('prompt', 'comment', name='target_type', create_type=False)
+        target_type_enum.create(conn, checkfirst=True)
         op.create_table('likes',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('target_type', sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
-        sa.Column('target_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('target_type', target_type_enum, nullable=False),
+        sa.Column('target_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('createdAt', sa.DateTime(), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('user_id', 'target_type', 'target_id', name='uq_like_user_target')
         )
-        op.create_index(op.f('ix_likes_target_id'), 'likes', ['target_id'], unique=False)
-        op.create_index(op.f('ix_likes_target_type'), 'likes', ['target_type'], unique=False)
-        op.create_index(op.f('ix_likes_user_id'), 'likes', ['user_id'], unique=False)
 
     # OAUTH ACCOUNTS
-    if not inspector.has_table('oauth_accounts'):
+    if 'oauth_accounts' not in existing_tables:
         op.create_table('oauth_accounts',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('provider', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
         sa.Column('provider_user_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
         sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
@@ -79,14 +95,11 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('provider', 'provider_user_id', name='uq_oauth_provider_user')
         )
-        op.create_index(op.f('ix_oauth_accounts_provider'), 'oauth_accounts', ['provider'], unique=False)
-        op.create_index(op.f('ix_oauth_accounts_provider_user_id'), 'oauth_accounts', ['provider_user_id'], unique=False)
-        op.create_index(op.f('ix_oauth_accounts_user_id'), 'oauth_accounts', ['user_id'], unique=False)
 
     # PROMPTS
-    if not inspector.has_table('prompts'):
+    if 'prompts' not in existing_tables:
         op.create_table('prompts',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('slug', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
         sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
         sa.Column('summary', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
@@ -97,7 +110,7 @@ def upgrade() -> None:
         sa.Column('promptText', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
         sa.Column('steps', sa.JSON(), nullable=True),
         sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
-        sa.Column('author_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('author_id', postgresql.UUID(as_uuid=False), nullable=True),
         sa.Column('createdAt', sa.DateTime(), nullable=False),
         sa.Column('updatedAt', sa.DateTime(), nullable=False),
         sa.Column('like_count', sa.Integer(), nullable=False),
@@ -107,35 +120,24 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
         )
-        op.create_index(op.f('ix_prompts_slug'), 'prompts', ['slug'], unique=True)
-        op.create_index(op.f('ix_prompts_type'), 'prompts', ['type'], unique=False)
     else:
         # Check columns
-        prompt_cols = [c['name'] for c in inspector.get_columns('prompts')]
-        
-        if 'type' not in prompt_cols:
-             op.add_column('prompts', sa.Column('type', sqlmodel.sql.sqltypes.AutoString(length=20), server_default="prompt", nullable=False))
-             op.create_index(op.f('ix_prompts_type'), 'prompts', ['type'], unique=False)
-        
-        if 'saves_count' not in prompt_cols:
-             op.add_column('prompts', sa.Column('saves_count', sa.Integer(), server_default="0", nullable=False))
-        
-        if 'price' not in prompt_cols:
-             op.add_column('prompts', sa.Column('price', sa.Integer(), server_default="0", nullable=False))
-             
-        if 'currency' not in prompt_cols:
-             op.add_column('prompts', sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), server_default="usd", nullable=False))
-        
-        if 'like_count' not in prompt_cols:
-             op.add_column('prompts', sa.Column('like_count', sa.Integer(), server_default="0", nullable=False))
+        prompt_cols = cols['prompts']
+        _add_missing_columns('prompts', prompt_cols, [
+            ('type', "VARCHAR(20) DEFAULT 'prompt' NOT NULL"),
+            ('saves_count', 'INTEGER DEFAULT 0 NOT NULL'),
+            ('price', 'INTEGER DEFAULT 0 NOT NULL'),
+            ('currency', "VARCHAR(3) DEFAULT 'usd' NOT NULL"),
+            ('like_count', 'INTEGER DEFAULT 0 NOT NULL'),
+        ])
 
 
     # COMMENTS
-    if not inspector.has_table('comments'):
+    if 'comments' not in existing_tables:
         op.create_table('comments',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('prompt_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('author_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('prompt_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('author_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('body', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
         sa.Column('createdAt', sa.DateTime(), nullable=False),
         sa.Column('like_count', sa.Integer(), nullable=False),
@@ -143,21 +145,19 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ),
         sa.PrimaryKeyConstraint('id')
         )
-        op.create_index(op.f('ix_comments_author_id'), 'comments', ['author_id'], unique=False)
-        op.create_index(op.f('ix_comments_prompt_id'), 'comments', ['prompt_id'], unique=False)
     else:
         # Check like_count for comments just in case
-        comment_cols = [c['name'] for c in inspector.get_columns('comments')]
+        comment_cols = cols['comments']
         if 'like_count' not in comment_cols:
             op.add_column('comments', sa.Column('like_count', sa.Integer(), server_default="0", nullable=False))
 
     # PURCHASES
-    if not inspector.has_table('purchases'):
+    if 'purchases' not in existing_tables:
         op.create_table('purchases',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('buyer_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('seller_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('prompt_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('buyer_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('seller_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('prompt_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('amount_cents', sa.Integer(), nullable=False),
         sa.Column('platform_fee_cents', sa.Integer(), nullable=False),
         sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False),
@@ -169,26 +169,22 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
         )
-        op.create_index(op.f('ix_purchases_buyer_id'), 'purchases', ['buyer_id'], unique=False)
-        op.create_index(op.f('ix_purchases_prompt_id'), 'purchases', ['prompt_id'], unique=False)
-        op.create_index(op.f('ix_purchases_seller_id'), 'purchases', ['seller_id'], unique=False)
-        op.create_index(op.f('ix_purchases_status'), 'purchases', ['status'], unique=False)
-        op.create_index(op.f('ix_purchases_stripe_payment_intent_id'), 'purchases', ['stripe_payment_intent_id'], unique=False)
 
     # SAVES
-    if not inspector.has_table('saves'):
+    if 'saves' not in existing_tables:
         op.create_table('saves',
-        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
-        sa.Column('prompt_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('prompt_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('createdAt', sa.DateTime(), nullable=False),
         sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('user_id', 'prompt_id', name='uq_save_user_prompt')
+        sa.UniqueConstraint('user_id', 'prompt_id', name='uq_save_user_prompt'),
+        # -x unlogged_seed=true: skip WAL during an initial bulk import
+        # (see 006); revision 8b5f1e3a7c92 sets the table LOGGED again.
+        prefixes=['UNLOGGED'] if context.get_x_argument(as_dictionary=True).get('unlogged_seed') == 'true' else [],
         )
-        op.create_index(op.f('ix_saves_prompt_id'), 'saves', ['prompt_id'], unique=False)
-        op.create_index(op.f('ix_saves_user_id'), 'saves', ['user_id'], unique=False)
 
 
 def downgrade() -> None:
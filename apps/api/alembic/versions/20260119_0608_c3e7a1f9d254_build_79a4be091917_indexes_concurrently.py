@@ -0,0 +1,73 @@
+"""Build the indexes for the 79a4be091917 tables concurrently
+
+Revision ID: c3e7a1f9d254
+Revises: 79a4be091917
+Create Date: 2026-01-19 06:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a1f9d254'
+down_revision: Union[str, None] = '79a4be091917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, extra create_index kwargs). Kept out of
+# 79a4be091917 so that revision only holds short schema locks; these are
+# built CONCURRENTLY while the app keeps serving writes. Indexes that
+# earlier revisions already built under the same name are skipped.
+INDEXES = [
+    ('ix_users_email', 'users', ['email'], {'unique': True}),
+    ('ix_users_stripe_connect_id', 'users', ['stripe_connect_id'], {}),
+    ('ix_users_username', 'users', ['username'], {'unique': True}),
+    ('ix_likes_prompt_target', 'likes', ['target_id'], {'postgresql_where': sa.text("target_type = 'prompt'")}),
+    ('ix_likes_comment_target', 'likes', ['target_id'], {'postgresql_where': sa.text("target_type = 'comment'")}),
+    ('ix_likes_user_id', 'likes', ['user_id'], {}),
+    ('ix_oauth_accounts_provider', 'oauth_accounts', ['provider'], {}),
+    ('ix_oauth_accounts_provider_user_id', 'oauth_accounts', ['provider_user_id'], {}),
+    ('ix_oauth_accounts_user_id', 'oauth_accounts', ['user_id'], {}),
+    ('ix_prompts_type', 'prompts', ['type'], {}),
+    ('ix_comments_author_id', 'comments', ['author_id'], {}),
+    ('ix_comments_prompt_created', 'comments', ['prompt_id', 'createdAt'], {}),
+    ('ix_purchases_buyer_id', 'purchases', ['buyer_id'], {}),
+    ('ix_purchases_prompt_id', 'purchases', ['prompt_id'], {}),
+    ('ix_purchases_seller_id', 'purchases', ['seller_id'], {}),
+    ('ix_purchases_status', 'purchases', ['status'], {}),
+    ('ix_purchases_stripe_payment_intent_id', 'purchases', ['stripe_payment_intent_id'], {}),
+    ('ix_saves_prompt_id', 'saves', ['prompt_id'], {}),
+    ('ix_saves_user_created', 'saves', ['user_id', sa.text('"createdAt" DESC')], {}),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    indexes = list(INDEXES)
+    # prompts tables built by 001 already enforce slug uniqueness; only the
+    # ones created by 79a4be091917 need the index.
+    slug_is_unique = any(
+        uc['column_names'] == ['slug'] for uc in inspector.get_unique_constraints('prompts')
+    ) or any(
+        ix['unique'] and ix['column_names'] == ['slug'] for ix in inspector.get_indexes('prompts')
+    )
+    if not slug_is_unique:
+        indexes.append(('ix_prompts_slug', 'prompts', ['slug'], {'unique': True, 'postgresql_include': ['id']}))
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in indexes:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
+
+
+def downgrade() -> None:
+    # 79a4be091917 never drops what it creates either; the indexes go away
+    # with their tables when earlier revisions are downgraded.
+    pass
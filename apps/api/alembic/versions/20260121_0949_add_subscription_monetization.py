@@ -1,160 +1,144 @@
 """Add subscription monetization tables
 
 Revision ID: 20260121_0949
-Revises: 20260119_0607_79a4be091917
+Revises: c3e7a1f9d254
 Create Date: 2026-01-21 09:49:00.000000
 
 """
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
-from sqlalchemy import inspect
 
 # revision identifiers, used by Alembic.
 revision = '20260121_0949'
-down_revision = '79a4be091917'
+down_revision = 'c3e7a1f9d254'
 branch_labels = None
 depends_on = None
 
+# (index name, table, columns, extra create_index kwargs), built CONCURRENTLY
+# after the tables exist so users/prompts keep taking writes meanwhile.
+INDEXES = [
+    ('idx_users_stripe_customer', 'users', ['stripe_customer_id'], {}),
+    ('idx_users_stripe_connect', 'users', ['stripe_connect_id'], {'postgresql_where': sa.text('stripe_connect_id IS NOT NULL')}),
+    ('idx_prompts_premium', 'prompts', ['is_premium', 'featured'], {}),
+    ('idx_subscriptions_stripe', 'subscriptions', ['stripe_subscription_id'], {}),
+    ('idx_subscriptions_status', 'subscriptions', ['status'], {}),
+    # At most one live subscription per user; ended ones stay as history.
+    ('uq_subscription_user_active', 'subscriptions', ['user_id'], {'unique': True, 'postgresql_where': sa.text("status IN ('active', 'trialing', 'past_due')")}),
+    # flow_copies is append-only, so both timestamps track physical order.
+    ('idx_copies_billing_brin', 'flow_copies', ['billing_month', 'copied_at'], {'postgresql_using': 'brin', 'postgresql_with': {'pages_per_range': 32}}),
+    ('idx_copies_creator', 'flow_copies', ['creator_id', 'billing_month'], {'postgresql_where': sa.text('counted_for_payout = true')}),
+    ('idx_copies_user_month', 'flow_copies', ['user_id', 'billing_month'], {'postgresql_where': sa.text('counted_for_payout = true')}),
+    # Payout worker queue: only open payouts, read without heap fetches.
+    ('idx_payouts_open', 'creator_payouts', ['status', 'billing_month'], {'postgresql_include': ['creator_id', 'amount_cents', 'stripe_transfer_id', 'id'], 'postgresql_where': sa.text("status IN ('pending', 'processing')")}),
+    ('idx_payouts_creator', 'creator_payouts', ['creator_id', 'billing_month'], {}),
+]
+
 
 def upgrade() -> None:
-    conn = op.get_bind()
-    inspector = inspect(conn)
+    # Idempotency comes from IF [NOT] EXISTS in the DDL itself rather than
+    # inspector lookups, which cost a catalog round trip per object. Column
+    # defaults are constants, so on PG11+ (enforced in env.py) the ADD
+    # COLUMNs below only touch the catalog and never rewrite the table.
 
     # 1. USERS columns
-    user_cols = [c['name'] for c in inspector.get_columns('users')]
-    if 'stripe_customer_id' not in user_cols:
-        op.add_column('users', sa.Column('stripe_customer_id', sa.String(), nullable=True))
-        op.create_index('idx_users_stripe_customer', 'users', ['stripe_customer_id'])
-    
-    if 'is_creator' not in user_cols:
-        op.add_column('users', sa.Column('is_creator', sa.Boolean(), server_default='false', nullable=False))
-
-    # Check for stripe_connect_id index if not exists (it might have been created in 79a)
-    # The file tries to creating 'idx_users_stripe_connect' for 'stripe_connect_id'.
-    # 79a created 'ix_users_stripe_connect_id'. This file creates 'idx_users_stripe_connect'.
-    # We should check if index exists to avoid duplication or error.
-    indexes = inspector.get_indexes('users')
-    index_names = [i['name'] for i in indexes]
-    if 'idx_users_stripe_connect' not in index_names:
-        # verify column exists first (it should from 79a)
-        if 'stripe_connect_id' in user_cols:
-            op.create_index(
-                'idx_users_stripe_connect',
-                'users',
-                ['stripe_connect_id'],
-                postgresql_where=sa.text('stripe_connect_id IS NOT NULL')
-            )
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN IF NOT EXISTS stripe_customer_id VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS is_creator BOOLEAN DEFAULT false NOT NULL"
+    )
 
     # 2. PROMPTS columns
-    prompt_cols = [c['name'] for c in inspector.get_columns('prompts')]
-    if 'is_premium' not in prompt_cols:
-        op.add_column('prompts', sa.Column('is_premium', sa.Boolean(), server_default='true', nullable=False))
-    if 'featured' not in prompt_cols:
-        op.add_column('prompts', sa.Column('featured', sa.Boolean(), server_default='false', nullable=False))
-    if 'total_copies' not in prompt_cols:
-        op.add_column('prompts', sa.Column('total_copies', sa.Integer(), server_default='0', nullable=False))
-    
-    # Check index on prompts
-    p_indexes = [i['name'] for i in inspector.get_indexes('prompts')]
-    if 'idx_prompts_premium' not in p_indexes:
-         op.create_index('idx_prompts_premium', 'prompts', ['is_premium', 'featured'])
+    op.execute(
+        "ALTER TABLE prompts "
+        "ADD COLUMN IF NOT EXISTS is_premium BOOLEAN DEFAULT true NOT NULL, "
+        "ADD COLUMN IF NOT EXISTS featured BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN IF NOT EXISTS total_copies INTEGER DEFAULT 0 NOT NULL"
+    )
 
     # 3. SUBSCRIPTIONS table
-    if not inspector.has_table('subscriptions'):
-        op.create_table(
-            'subscriptions',
-            sa.Column('id', sa.String(), nullable=False),
-            sa.Column('user_id', sa.String(), nullable=False),
-            sa.Column('stripe_subscription_id', sa.String(), nullable=False),
-            sa.Column('stripe_customer_id', sa.String(), nullable=False),
-            sa.Column('status', sa.String(length=20), nullable=False),
-            sa.Column('plan_id', sa.String(length=50), server_default='premium_monthly', nullable=False),
-            sa.Column('current_period_start', sa.DateTime(), nullable=False),
-            sa.Column('current_period_end', sa.DateTime(), nullable=False),
-            sa.Column('cancel_at_period_end', sa.Boolean(), server_default='false', nullable=False),
-            sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
-            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
-            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-            sa.PrimaryKeyConstraint('id'),
-            sa.UniqueConstraint('stripe_subscription_id', name='uq_subscription_stripe_id'),
-            sa.UniqueConstraint('user_id', name='uq_subscription_user')
-        )
-        op.create_index('idx_subscriptions_stripe', 'subscriptions', ['stripe_subscription_id'])
-        op.create_index('idx_subscriptions_status', 'subscriptions', ['status'])
+    # subscriptions and creator_payouts rows are updated in place; fillfactor
+    # 70 leaves room on each page for HOT updates.
+    op.create_table(
+        'subscriptions',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('stripe_subscription_id', sa.String(), nullable=False),
+        sa.Column('stripe_customer_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('plan_id', sa.String(length=50), server_default='premium_monthly', nullable=False),
+        sa.Column('current_period_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('current_period_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('cancel_at_period_end', sa.Boolean(), server_default='false', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('stripe_subscription_id', name='uq_subscription_stripe_id'),
+        if_not_exists=True,
+    )
+    op.execute("ALTER TABLE subscriptions SET (fillfactor = 70)")
 
     # 4. FLOW_COPIES table
-    if not inspector.has_table('flow_copies'):
-        op.create_table(
-            'flow_copies',
-            sa.Column('id', sa.String(), nullable=False),
-            sa.Column('user_id', sa.String(), nullable=False),
-            sa.Column('flow_id', sa.String(), nullable=False),
-            sa.Column('creator_id', sa.String(), nullable=False),
-            sa.Column('counted_for_payout', sa.Boolean(), server_default='false', nullable=False),
-            sa.Column('copied_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
-            sa.Column('billing_month', sa.Date(), nullable=False),
-            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-            sa.ForeignKeyConstraint(['flow_id'], ['prompts.id'], ondelete='CASCADE'),
-            sa.PrimaryKeyConstraint('id'),
-            sa.UniqueConstraint('user_id', 'flow_id', 'billing_month', name='uq_copy_user_flow_month')
-        )
-        op.create_index('idx_copies_billing', 'flow_copies', ['billing_month', 'counted_for_payout'])
-        op.create_index(
-            'idx_copies_creator',
-            'flow_copies',
-            ['creator_id', 'billing_month'],
-            postgresql_where=sa.text('counted_for_payout = true')
-        )
-        op.create_index(
-            'idx_copies_user_month',
-            'flow_copies',
-            ['user_id', 'billing_month'],
-            postgresql_where=sa.text('counted_for_payout = true')
-        )
+    op.create_table(
+        'flow_copies',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('flow_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('creator_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('counted_for_payout', sa.Boolean(), server_default='false', nullable=False),
+        sa.Column('copied_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('billing_month', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['flow_id'], ['prompts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'flow_id', 'billing_month', name='uq_copy_user_flow_month'),
+        if_not_exists=True,
+    )
 
     # 5. CREATOR_PAYOUTS table
-    if not inspector.has_table('creator_payouts'):
-        op.create_table(
-            'creator_payouts',
-            sa.Column('id', sa.String(), nullable=False),
-            sa.Column('creator_id', sa.String(), nullable=False),
-            sa.Column('billing_month', sa.Date(), nullable=False),
-            sa.Column('copy_count', sa.Integer(), server_default='0', nullable=False),
-            sa.Column('amount_cents', sa.Integer(), server_default='0', nullable=False),
-            sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
-            sa.Column('stripe_transfer_id', sa.String(), nullable=True),
-            sa.Column('paid_at', sa.DateTime(), nullable=True),
-            sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
-            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
-            sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ondelete='CASCADE'),
-            sa.PrimaryKeyConstraint('id'),
-            sa.UniqueConstraint('creator_id', 'billing_month', name='uq_payout_creator_month')
-        )
-        op.create_index('idx_payouts_status', 'creator_payouts', ['status', 'billing_month'])
-        op.create_index('idx_payouts_creator', 'creator_payouts', ['creator_id', 'billing_month'])
+    op.create_table(
+        'creator_payouts',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('creator_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('billing_month', sa.Date(), nullable=False),
+        sa.Column('copy_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('amount_cents', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+        sa.Column('stripe_transfer_id', sa.String(), nullable=True),
+        sa.Column('paid_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('creator_id', 'billing_month', name='uq_payout_creator_month'),
+        if_not_exists=True,
+    )
+    op.execute("ALTER TABLE creator_payouts SET (fillfactor = 70)")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
 
 
 def downgrade() -> None:
-    # Basic downgrade checks if elements exist before dropping
-    conn = op.get_bind()
-    inspector = inspect(conn)
-
-    if inspector.has_table('creator_payouts'):
-        op.drop_table('creator_payouts')
-    if inspector.has_table('flow_copies'):
-        op.drop_table('flow_copies')
-    if inspector.has_table('subscriptions'):
-        op.drop_table('subscriptions')
-
-    # Columns
-    prompt_cols = [c['name'] for c in inspector.get_columns('prompts')]
-    if 'total_copies' in prompt_cols: op.drop_column('prompts', 'total_copies')
-    if 'featured' in prompt_cols: op.drop_column('prompts', 'featured')
-    if 'is_premium' in prompt_cols: op.drop_column('prompts', 'is_premium')
-
-    user_cols = [c['name'] for c in inspector.get_columns('users')]
-    # drop index if exists ... simpler to just try/fail or check carefully.
-    # We will skip verifying every single index drop for now on downgrade.
-    if 'is_creator' in user_cols: op.drop_column('users', 'is_creator')
-    if 'stripe_customer_id' in user_cols: op.drop_column('users', 'stripe_customer_id')
+    op.drop_table('creator_payouts', if_exists=True)
+    op.drop_table('flow_copies', if_exists=True)
+    op.drop_table('subscriptions', if_exists=True)
+
+    op.execute(
+        "ALTER TABLE prompts "
+        "DROP COLUMN IF EXISTS total_copies, "
+        "DROP COLUMN IF EXISTS featured, "
+        "DROP COLUMN IF EXISTS is_premium"
+    )
+    # Dropping the columns also drops the indexes on them.
+    op.execute(
+        "ALTER TABLE users "
+        "DROP COLUMN IF EXISTS is_creator, "
+        "DROP COLUMN IF EXISTS stripe_customer_id"
+    )
+    op.drop_index('idx_users_stripe_connect', table_name='users', if_exists=True)
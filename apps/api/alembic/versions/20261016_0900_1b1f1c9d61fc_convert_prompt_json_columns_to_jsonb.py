@@ -0,0 +1,76 @@
+"""Convert prompt list columns to JSONB and index tags/worksWith
+
+Revision ID: 1b1f1c9d61fc
+Revises: d09b37a83565
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '1b1f1c9d61fc'
+down_revision: Union[str, None] = 'd09b37a83565'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = ('worksWith', 'tags', 'targetSites', 'steps')
+
+# Columns filtered with containment / key-exists operators in get_prompts.
+GIN_INDEXES = {
+    'ix_prompts_tags_gin': 'tags',
+    'ix_prompts_works_with_gin': 'worksWith',
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    # Databases created before 001 switched to JSONB still have plain JSON
+    # columns; convert them all in one ALTER TABLE (a single table rewrite).
+    to_convert = [
+        c['name'] for c in inspector.get_columns('prompts')
+        if c['name'] in JSON_COLUMNS and not isinstance(c['type'], postgresql.JSONB)
+    ]
+    if to_convert:
+        op.execute(
+            "ALTER TABLE prompts "
+            + ", ".join(
+                f'ALTER COLUMN "{name}" TYPE jsonb USING "{name}"::jsonb'
+                for name in to_convert
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        for index_name, column in GIN_INDEXES.items():
+            op.create_index(
+                index_name,
+                'prompts',
+                [column],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name in GIN_INDEXES:
+            op.drop_index(
+                index_name,
+                table_name='prompts',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    op.execute(
+        "ALTER TABLE prompts "
+        + ", ".join(
+            f'ALTER COLUMN "{name}" TYPE json USING "{name}"::json'
+            for name in JSON_COLUMNS
+        )
+    )
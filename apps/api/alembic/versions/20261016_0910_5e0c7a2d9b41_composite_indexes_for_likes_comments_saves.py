@@ -0,0 +1,61 @@
+"""Replace single-column likes/comments/saves indexes with composites
+
+Revision ID: 5e0c7a2d9b41
+Revises: 1b1f1c9d61fc
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c7a2d9b41'
+down_revision: Union[str, None] = '1b1f1c9d61fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) matching the real access patterns:
+# likes per target, latest comments per prompt, a user's saves newest first.
+COMPOSITE_INDEXES = [
+    ('ix_likes_target', 'likes', ['target_type', 'target_id']),
+    ('ix_comments_prompt_created', 'comments', ['prompt_id', 'createdAt']),
+    ('ix_saves_user_created', 'saves', ['user_id', sa.text('"createdAt" DESC')]),
+]
+
+# Single-column indexes made redundant by the composites above.
+SUPERSEDED_INDEXES = [
+    ('ix_likes_target_type', 'likes', ['target_type']),
+    ('ix_likes_target_id', 'likes', ['target_id']),
+    ('ix_comments_prompt_id', 'comments', ['prompt_id']),
+    ('ix_saves_user_id', 'saves', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, table, _ in SUPERSEDED_INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED_INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, table, _ in COMPOSITE_INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,55 @@
+"""Use a BRIN index for prompts.updatedAt
+
+Revision ID: a3d81f6c2e57
+Revises: 5e0c7a2d9b41
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d81f6c2e57'
+down_revision: Union[str, None] = '5e0c7a2d9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # updatedAt tracks physical row order closely and is never used for
+    # ORDER BY ... LIMIT, so one summary per 64 pages replaces the B-tree.
+    # idx_created_at stays a B-tree: get_prompts orders by createdAt DESC.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_updated_at_brin',
+            'prompts',
+            ['updatedAt'],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 64},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_updated_at',
+            table_name='prompts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_updated_at',
+            'prompts',
+            ['updatedAt'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_updated_at_brin',
+            table_name='prompts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
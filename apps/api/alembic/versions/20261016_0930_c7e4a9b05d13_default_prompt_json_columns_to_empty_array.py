@@ -0,0 +1,39 @@
+"""Default prompt list columns to an empty JSONB array
+
+Revision ID: c7e4a9b05d13
+Revises: a3d81f6c2e57
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e4a9b05d13'
+down_revision: Union[str, None] = 'a3d81f6c2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = ('worksWith', 'tags', 'targetSites', 'steps')
+
+
+def upgrade() -> None:
+    # SET DEFAULT only touches the catalog, so this needs no table rewrite.
+    op.execute(
+        "ALTER TABLE prompts "
+        + ", ".join(
+            f'ALTER COLUMN "{name}" SET DEFAULT \'[]\'::jsonb'
+            for name in JSON_COLUMNS
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE prompts "
+        + ", ".join(
+            f'ALTER COLUMN "{name}" DROP DEFAULT'
+            for name in JSON_COLUMNS
+        )
+    )
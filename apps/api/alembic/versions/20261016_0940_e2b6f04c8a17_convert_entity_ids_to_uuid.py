@@ -0,0 +1,97 @@
+"""Store user/prompt/comment ids and their references as native UUID
+
+Revision ID: e2b6f04c8a17
+Revises: c7e4a9b05d13
+Create Date: 2026-10-16 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6f04c8a17'
+down_revision: Union[str, None] = 'c7e4a9b05d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns holding uuid4 ids generated by the application. Earlier revisions
+# now create these as uuid; databases built before that still have varchar.
+UUID_COLUMNS = {
+    'users': ('id',),
+    'prompts': ('id', 'author_id'),
+    'oauth_accounts': ('id', 'user_id'),
+    'comments': ('id', 'prompt_id', 'author_id'),
+    'likes': ('id', 'user_id', 'target_id'),
+    'saves': ('id', 'user_id', 'prompt_id'),
+    'purchases': ('id', 'buyer_id', 'seller_id', 'prompt_id'),
+    'subscriptions': ('user_id',),
+    'flow_copies': ('user_id', 'flow_id', 'creator_id'),
+    'creator_payouts': ('creator_id',),
+    'account_connections': ('user_id',),
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    pending = {}
+    for table, columns in UUID_COLUMNS.items():
+        if table not in existing_tables:
+            continue
+        to_convert = [
+            c['name'] for c in inspector.get_columns(table)
+            if c['name'] in columns and not isinstance(c['type'], sa.Uuid)
+        ]
+        if to_convert:
+            pending[table] = to_convert
+
+    if not pending:
+        return
+
+    # Foreign keys can't span varchar and uuid, so drop every constraint
+    # touching a converted column and put it back once both sides match.
+    foreign_keys = []
+    for table in existing_tables:
+        for fk in inspector.get_foreign_keys(table):
+            local = set(fk['constrained_columns']) & set(pending.get(table, ()))
+            remote = set(fk['referred_columns']) & set(pending.get(fk['referred_table'], ()))
+            if local or remote:
+                foreign_keys.append((table, fk))
+
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table, columns in pending.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(
+                f'ALTER COLUMN "{name}" TYPE uuid USING "{name}"::uuid'
+                for name in columns
+            )
+        )
+
+    # Re-add them NOT VALID, then validate each one outside the transaction
+    # so the scan doesn't run under the ALTER's ACCESS EXCLUSIVE lock.
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'],
+            table,
+            fk['referred_table'],
+            fk['constrained_columns'],
+            fk['referred_columns'],
+            ondelete=fk['options'].get('ondelete'),
+            postgresql_not_valid=True,
+        )
+    with op.get_context().autocommit_block():
+        for table, fk in foreign_keys:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT "{fk["name"]}"')
+
+
+def downgrade() -> None:
+    # Earlier revisions create these columns as uuid, so uuid is also the
+    # correct state below this revision; there is nothing to undo.
+    pass
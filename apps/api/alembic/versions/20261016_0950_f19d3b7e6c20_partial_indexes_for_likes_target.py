@@ -0,0 +1,56 @@
+"""Replace the likes (target_type, target_id) index with per-type partial indexes
+
+Revision ID: f19d3b7e6c20
+Revises: e2b6f04c8a17
+Create Date: 2026-10-16 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19d3b7e6c20'
+down_revision: Union[str, None] = 'e2b6f04c8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TARGET_TYPES = ('prompt', 'comment')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for target_type in TARGET_TYPES:
+            op.create_index(
+                f'ix_likes_{target_type}_target',
+                'likes',
+                ['target_id'],
+                postgresql_where=sa.text(f"target_type = '{target_type}'"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.drop_index(
+            'ix_likes_target',
+            table_name='likes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_likes_target',
+            'likes',
+            ['target_type', 'target_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for target_type in TARGET_TYPES:
+            op.drop_index(
+                f'ix_likes_{target_type}_target',
+                table_name='likes',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,51 @@
+"""Drop the non-unique prompts slug index duplicated by uq_prompts_slug
+
+Revision ID: 0a4c8e2f71b9
+Revises: f19d3b7e6c20
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0a4c8e2f71b9'
+down_revision: Union[str, None] = 'f19d3b7e6c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Databases built by 001 have both uq_prompts_slug and a plain
+    # ix_prompts_slug on the same column. Where ix_prompts_slug is itself the
+    # unique index (79a4be091917 / create_all), it is the only one: keep it.
+    slug_index = next(
+        (ix for ix in inspector.get_indexes('prompts') if ix['name'] == 'ix_prompts_slug'),
+        None,
+    )
+    if slug_index is None or slug_index['unique']:
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_prompts_slug',
+            table_name='prompts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_prompts_slug',
+            'prompts',
+            ['slug'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -0,0 +1,85 @@
+"""Pack users.is_active/is_superuser/is_seller into a SMALLINT flags column
+
+Revision ID: 6d2a9c4e8b35
+Revises: 0a4c8e2f71b9
+Create Date: 2026-10-16 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2a9c4e8b35'
+down_revision: Union[str, None] = '0a4c8e2f71b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bit per former boolean column; mirrors USER_* in models.py.
+FLAG_BITS = {
+    'is_active': 1,
+    'is_superuser': 2,
+    'is_seller': 4,
+}
+
+# Rows rewritten per committed UPDATE batch.
+BATCH_SIZE = 10_000
+
+PACK_SQL = " | ".join(
+    f"(CASE WHEN {column} THEN {bit} ELSE 0 END)" for column, bit in FLAG_BITS.items()
+)
+UNPACK_SQL = ", ".join(
+    f"{column} = (flags & {bit}) <> 0" for column, bit in FLAG_BITS.items()
+)
+
+
+def _backfill(conn, assignments: str) -> None:
+    """Apply ``assignments`` to every user in keyset-paginated batches."""
+    batch_sql = sa.text(
+        f"""
+        WITH batch AS (
+            SELECT id FROM users
+            WHERE (:last_id IS NULL OR id > :last_id)
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        UPDATE users SET {assignments}
+        FROM batch
+        WHERE users.id = batch.id
+        RETURNING users.id
+        """
+    )
+    with op.get_context().autocommit_block():
+        last_id = None
+        while True:
+            updated_ids = conn.execute(
+                batch_sql, {"last_id": last_id, "batch_size": BATCH_SIZE}
+            ).scalars().all()
+            if not updated_ids:
+                break
+            last_id = max(updated_ids)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.execute("ALTER TABLE users ADD COLUMN flags SMALLINT NOT NULL DEFAULT 1")
+    _backfill(conn, f"flags = {PACK_SQL}")
+    op.execute(
+        "ALTER TABLE users "
+        + ", ".join(f"DROP COLUMN {column}" for column in FLAG_BITS)
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT true, "
+        "ADD COLUMN is_superuser BOOLEAN NOT NULL DEFAULT false, "
+        "ADD COLUMN is_seller BOOLEAN NOT NULL DEFAULT false"
+    )
+    _backfill(conn, UNPACK_SQL)
+    op.execute("ALTER TABLE users DROP COLUMN flags")
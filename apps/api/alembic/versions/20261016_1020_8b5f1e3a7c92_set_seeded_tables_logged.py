@@ -0,0 +1,43 @@
+"""Switch likes/saves back to LOGGED after an unlogged seed
+
+Revision ID: 8b5f1e3a7c92
+Revises: 6d2a9c4e8b35
+Create Date: 2026-10-16 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b5f1e3a7c92'
+down_revision: Union[str, None] = '6d2a9c4e8b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables 006 / 79a4be091917 create UNLOGGED under `-x unlogged_seed=true`.
+# Seeding flow: `alembic -x unlogged_seed=true upgrade 79a4be091917`, bulk
+# load likes/saves, then `alembic upgrade head` before production writes.
+SEED_TABLES = ('likes', 'saves')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table in SEED_TABLES:
+        unlogged = conn.execute(
+            sa.text(
+                "SELECT 1 FROM pg_class "
+                "WHERE oid = to_regclass(:table) AND relpersistence = 'u'"
+            ),
+            {"table": table},
+        ).first()
+        if unlogged:
+            # Rewrites the table once into WAL; it is crash-safe from here on.
+            op.execute(f"ALTER TABLE {table} SET LOGGED")
+
+
+def downgrade() -> None:
+    # Nothing to undo: the tables are only ever meant to be UNLOGGED while
+    # seeding, before this revision runs.
+    pass
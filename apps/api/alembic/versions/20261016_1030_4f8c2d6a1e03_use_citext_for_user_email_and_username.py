@@ -0,0 +1,58 @@
+"""Store users.email and users.username as citext
+
+Revision ID: 4f8c2d6a1e03
+Revises: 8b5f1e3a7c92
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8c2d6a1e03'
+down_revision: Union[str, None] = '8b5f1e3a7c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CITEXT_COLUMNS = ('email', 'username')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+
+    # The unique indexes on these columns now enforce case-insensitive
+    # uniqueness themselves, making lower(...) expression indexes redundant.
+    for ix in inspector.get_indexes('users'):
+        if any('lower(' in (expr or '') for expr in ix.get('expressions', ())):
+            with op.get_context().autocommit_block():
+                op.drop_index(
+                    ix['name'],
+                    table_name='users',
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+
+    to_convert = [
+        c['name'] for c in inspector.get_columns('users')
+        if c['name'] in CITEXT_COLUMNS and not isinstance(c['type'], postgresql.CITEXT)
+    ]
+    if to_convert:
+        # One rewrite for both columns; the unique indexes are rebuilt as
+        # citext and fail loudly if two rows differ only by case.
+        op.execute(
+            "ALTER TABLE users "
+            + ", ".join(f'ALTER COLUMN "{name}" TYPE citext' for name in to_convert)
+        )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE users "
+        + ", ".join(f'ALTER COLUMN "{name}" TYPE VARCHAR(255)' for name in CITEXT_COLUMNS)
+    )
@@ -0,0 +1,65 @@
+"""Make the unique prompts slug index cover id
+
+Revision ID: 9e1b7d3c5a48
+Revises: 4f8c2d6a1e03
+Create Date: 2026-10-16 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1b7d3c5a48'
+down_revision: Union[str, None] = '4f8c2d6a1e03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _swap_slug_index(include: list[str]) -> None:
+    """Replace whatever enforces slug uniqueness with ix_prompts_slug.
+
+    The new index is built under a temporary name first, so uniqueness stays
+    enforced throughout and no step blocks writes for longer than a drop.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_prompts_slug_new',
+            'prompts',
+            ['slug'],
+            unique=True,
+            postgresql_include=include,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # 001-built databases enforce it with a constraint, the rest with
+        # an index of the final name.
+        op.execute("ALTER TABLE prompts DROP CONSTRAINT IF EXISTS uq_prompts_slug")
+        op.drop_index(
+            'ix_prompts_slug',
+            table_name='prompts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.execute("ALTER INDEX ix_prompts_slug_new RENAME TO ix_prompts_slug")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Only id is included: title and like_count change on edits and likes,
+    # and any indexed column would rule out HOT updates for those writes.
+    slug_index = next(
+        (ix for ix in inspector.get_indexes('prompts') if ix['name'] == 'ix_prompts_slug'),
+        None,
+    )
+    if slug_index is not None and slug_index.get('include_columns') == ['id']:
+        return
+
+    _swap_slug_index(['id'])
+
+
+def downgrade() -> None:
+    _swap_slug_index([])
@@ -0,0 +1,66 @@
+"""Store likes.target_type as a native target_type ENUM
+
+Revision ID: 2c6e0a8f4d19
+Revises: 9e1b7d3c5a48
+Create Date: 2026-10-16 10:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6e0a8f4d19'
+down_revision: Union[str, None] = '9e1b7d3c5a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TARGET_TYPES = ('prompt', 'comment')
+
+
+def _retype_target_type(column_type: str) -> None:
+    """Change likes.target_type to ``column_type`` and rebuild its partial indexes.
+
+    ALTER COLUMN TYPE would keep the old ``target_type::text = ...`` index
+    predicates, which queries against the new type no longer match, so the
+    partial indexes are dropped first and rebuilt concurrently afterwards.
+    """
+    for target_type in TARGET_TYPES:
+        op.drop_index(f'ix_likes_{target_type}_target', table_name='likes', if_exists=True)
+
+    op.execute(
+        f"ALTER TABLE likes ALTER COLUMN target_type TYPE {column_type} "
+        f"USING target_type::text::{column_type}"
+    )
+
+    with op.get_context().autocommit_block():
+        for target_type in TARGET_TYPES:
+            op.create_index(
+                f'ix_likes_{target_type}_target',
+                'likes',
+                ['target_id'],
+                postgresql_where=sa.text(f"target_type = '{target_type}'"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    column = next(c for c in inspector.get_columns('likes') if c['name'] == 'target_type')
+    if isinstance(column['type'], postgresql.ENUM):
+        return
+
+    postgresql.ENUM(*TARGET_TYPES, name='target_type').create(conn, checkfirst=True)
+    _retype_target_type('target_type')
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    _retype_target_type('VARCHAR(16)')
+    postgresql.ENUM(name='target_type').drop(conn, checkfirst=True)
@@ -0,0 +1,59 @@
+"""Maintain prompts/comments like_count with a trigger on likes
+
+Revision ID: 7a3e5c1b9f60
+Revises: 2c6e0a8f4d19
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e5c1b9f60'
+down_revision: Union[str, None] = '2c6e0a8f4d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One write per like instead of an extra application-side UPDATE. The
+    # trigger is deferred to commit so the hot counter row stays locked only
+    # briefly at the end of the liking transaction.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION likes_tick() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.target_type = 'prompt' THEN
+                    UPDATE prompts SET like_count = like_count + 1 WHERE id = NEW.target_id;
+                ELSE
+                    UPDATE comments SET like_count = like_count + 1 WHERE id = NEW.target_id;
+                END IF;
+                RETURN NEW;
+            END IF;
+            IF OLD.target_type = 'prompt' THEN
+                UPDATE prompts SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.target_id;
+            ELSE
+                UPDATE comments SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.target_id;
+            END IF;
+            RETURN OLD;
+        END
+        $$
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS likes_tick ON likes")
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER likes_tick
+        AFTER INSERT OR DELETE ON likes
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION likes_tick()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS likes_tick ON likes")
+    op.execute("DROP FUNCTION IF EXISTS likes_tick()")
@@ -0,0 +1,27 @@
+"""Drop the server-side NOW() default on flow_copies.copied_at
+
+Revision ID: b4f2d8e6a013
+Revises: 7a3e5c1b9f60
+Create Date: 2026-10-16 11:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f2d8e6a013'
+down_revision: Union[str, None] = '7a3e5c1b9f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # FlowCopy stamps copied_at in the application, so every insert into the
+    # copy log already carries its own value; the NOT NULL keeps it honest.
+    op.alter_column('flow_copies', 'copied_at', server_default=None)
+
+
+def downgrade() -> None:
+    op.alter_column('flow_copies', 'copied_at', server_default=sa.text('NOW()'))
@@ -0,0 +1,44 @@
+"""Covering partial indexes for payout-counted flow copies
+
+Revision ID: d5a9c3e1f742
+Revises: b4f2d8e6a013
+Create Date: 2026-10-16 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9c3e1f742'
+down_revision: Union[str, None] = 'b4f2d8e6a013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Only counted copies matter for payouts and the monthly copy limit, so the
+# indexes skip the rest; INCLUDE lets the per-creator aggregation read
+# flow_id/id straight from the index.
+INDEXES = [
+    ('ix_flow_copies_creator_payout', ['creator_id', 'billing_month'], {'postgresql_include': ['flow_id', 'id']}),
+    ('ix_flow_copies_user_payout', ['user_id', 'billing_month'], {}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, kwargs in INDEXES:
+            op.create_index(
+                name, 'flow_copies', columns,
+                postgresql_where=sa.text('counted_for_payout = true'),
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.drop_index(
+                name, table_name='flow_copies',
+                postgresql_concurrently=True, if_exists=True,
+            )
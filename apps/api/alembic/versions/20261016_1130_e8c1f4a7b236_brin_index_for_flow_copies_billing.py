@@ -0,0 +1,43 @@
+"""BRIN index on flow_copies billing_month/copied_at
+
+Revision ID: e8c1f4a7b236
+Revises: d5a9c3e1f742
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c1f4a7b236'
+down_revision: Union[str, None] = 'd5a9c3e1f742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # flow_copies is an append-only log, so billing_month and copied_at follow
+    # the physical row order; a BRIN index serves month/time range scans at a
+    # fraction of a B-tree's size. Databases built since 20260121_0949 started
+    # creating it already have it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_copies_billing_brin',
+            'flow_copies',
+            ['billing_month', 'copied_at'],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_copies_billing_brin',
+            table_name='flow_copies',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,119 @@
+"""Partition flow_copies by billing_month
+
+Revision ID: f3a6b9d2c184
+Revises: e8c1f4a7b236
+Create Date: 2026-10-16 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6b9d2c184'
+down_revision: Union[str, None] = 'e8c1f4a7b236'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Creates flow_copies_YYYYMM for the month containing ``month`` unless it
+# exists. Copies for months without a partition land in flow_copies_default;
+# once that holds rows for a month, the month stays there (PostgreSQL refuses
+# to create a partition overlapping rows in the default one).
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION flow_copies_ensure_partition(month timestamp)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    lo timestamp := date_trunc('month', month);
+    hi timestamp := lo + interval '1 month';
+    part text := 'flow_copies_' || to_char(lo, 'YYYYMM');
+BEGIN
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    IF EXISTS (
+        SELECT 1 FROM flow_copies_default
+        WHERE billing_month >= lo AND billing_month < hi
+    ) THEN
+        RETURN;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF flow_copies FOR VALUES FROM (%L) TO (%L)',
+        part, lo, hi
+    );
+END
+$$
+"""
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Recreate flow_copies (partitioned or plain), keeping rows, constraints and indexes.
+
+    A table cannot be turned into a partitioned one in place, so build the
+    new shape next to it, copy the rows across and replay the old
+    constraint and index definitions on the new table.
+    """
+    conn = op.get_bind()
+    # Everything except the primary key, which has to gain (or lose)
+    # billing_month: a partitioned table's unique keys must cover it.
+    constraints = conn.execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = 'flow_copies'::regclass AND contype <> 'p'"
+    )).fetchall()
+    indexes = conn.execute(sa.text(
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+        "WHERE indrelid = 'flow_copies'::regclass AND indexrelid NOT IN "
+        "(SELECT conindid FROM pg_constraint WHERE conrelid = 'flow_copies'::regclass)"
+    )).scalars().all()
+
+    op.execute(
+        "CREATE TABLE flow_copies_rebuilt (LIKE flow_copies INCLUDING DEFAULTS)"
+        + (" PARTITION BY RANGE (billing_month)" if partitioned else "")
+    )
+    op.execute("ALTER TABLE flow_copies RENAME TO flow_copies_previous")
+    op.execute("ALTER TABLE flow_copies_rebuilt RENAME TO flow_copies")
+
+    if partitioned:
+        op.execute("CREATE TABLE flow_copies_default PARTITION OF flow_copies DEFAULT")
+        op.execute(ENSURE_PARTITION_FUNCTION)
+        op.execute(
+            "SELECT flow_copies_ensure_partition(m) FROM ("
+            " SELECT DISTINCT billing_month FROM flow_copies_previous"
+            " UNION SELECT now()::timestamp UNION SELECT now()::timestamp + interval '1 month'"
+            ") AS months(m)"
+        )
+
+    # Load before indexing: one bulk copy, then each index built in one pass.
+    op.execute("INSERT INTO flow_copies SELECT * FROM flow_copies_previous")
+    op.execute("DROP TABLE flow_copies_previous CASCADE")
+
+    op.execute(
+        "ALTER TABLE flow_copies ADD CONSTRAINT flow_copies_pkey PRIMARY KEY "
+        + ("(id, billing_month)" if partitioned else "(id)")
+    )
+    for name, definition in constraints:
+        op.execute(f'ALTER TABLE flow_copies ADD CONSTRAINT "{name}" {definition}')
+    for definition in indexes:
+        op.execute(definition)
+
+
+def upgrade() -> None:
+    # Payout and retention work is always per billing month: with monthly
+    # partitions those queries prune to one partition and old months can be
+    # detached/dropped instead of DELETEd. New months are created ahead of
+    # time via flow_copies_ensure_partition(), at app startup (init_db) and on
+    # the first copy of each month (crud.ensure_flow_copy_partitions).
+    relkind = op.get_bind().execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE oid = 'flow_copies'::regclass"
+    )).scalar()
+    if relkind != 'p':
+        _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    relkind = op.get_bind().execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE oid = 'flow_copies'::regclass"
+    )).scalar()
+    if relkind == 'p':
+        _rebuild(partitioned=False)
+    op.execute("DROP FUNCTION IF EXISTS flow_copies_ensure_partition(timestamp)")
@@ -0,0 +1,90 @@
+"""Store the remaining application-generated ids as native UUID
+
+Revision ID: 0b7d5e9a3c61
+Revises: f3a6b9d2c184
+Create Date: 2026-10-16 11:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d5e9a3c61'
+down_revision: Union[str, None] = 'f3a6b9d2c184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The monetization and connection-manager tables, left on varchar by
+# e2b6f04c8a17. Their ids are uuid4 strings from the application too.
+UUID_COLUMNS = {
+    'subscriptions': ('id',),
+    'flow_copies': ('id',),
+    'creator_payouts': ('id',),
+    'providers': ('id',),
+    'account_connections': ('id', 'provider_id'),
+    'credential_vault_items': ('id', 'connection_id'),
+    'manual_overrides': ('id', 'connection_id'),
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    pending = {}
+    for table, columns in UUID_COLUMNS.items():
+        if table not in existing_tables:
+            continue
+        to_convert = [
+            c['name'] for c in inspector.get_columns(table)
+            if c['name'] in columns and not isinstance(c['type'], sa.Uuid)
+        ]
+        if to_convert:
+            pending[table] = to_convert
+
+    if not pending:
+        return
+
+    # Same dance as e2b6f04c8a17: foreign keys can't span varchar and uuid.
+    foreign_keys = []
+    for table in existing_tables:
+        for fk in inspector.get_foreign_keys(table):
+            local = set(fk['constrained_columns']) & set(pending.get(table, ()))
+            remote = set(fk['referred_columns']) & set(pending.get(fk['referred_table'], ()))
+            if local or remote:
+                foreign_keys.append((table, fk))
+
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table, columns in pending.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(
+                f'ALTER COLUMN "{name}" TYPE uuid USING "{name}"::uuid'
+                for name in columns
+            )
+        )
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'],
+            table,
+            fk['referred_table'],
+            fk['constrained_columns'],
+            fk['referred_columns'],
+            ondelete=fk['options'].get('ondelete'),
+            postgresql_not_valid=True,
+        )
+    with op.get_context().autocommit_block():
+        for table, fk in foreign_keys:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT "{fk["name"]}"')
+
+
+def downgrade() -> None:
+    # Earlier revisions create these columns as uuid, so uuid is also the
+    # correct state below this revision; there is nothing to undo.
+    pass
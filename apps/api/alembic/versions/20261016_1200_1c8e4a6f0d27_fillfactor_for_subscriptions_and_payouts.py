@@ -0,0 +1,35 @@
+"""Lower fillfactor on subscriptions and creator_payouts
+
+Revision ID: 1c8e4a6f0d27
+Revises: 0b7d5e9a3c61
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1c8e4a6f0d27'
+down_revision: Union[str, None] = '0b7d5e9a3c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows here are updated in place, and free space on the page lets an update
+# be HOT when it changes no indexed column. That holds for writes touching
+# only updated_at or paid_at. Status changes are never HOT: status is
+# indexed by ix_subscriptions_status and used in the predicates of
+# uq_subscription_user_active and idx_payouts_open, and stripe_transfer_id
+# is included in idx_payouts_open as well. Only pages written from now on
+# honour the fillfactor; existing pages fill up again as rows are rewritten.
+TABLES = ('subscriptions', 'creator_payouts')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 70)")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
@@ -0,0 +1,57 @@
+"""Allow subscription history: unique live subscription per user
+
+Revision ID: 5d2f8b0e6a94
+Revises: 1c8e4a6f0d27
+Create Date: 2026-10-16 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8b0e6a94'
+down_revision: Union[str, None] = '1c8e4a6f0d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # UNIQUE (user_id) forced a resubscribing user to overwrite their old
+    # row; the real invariant is one live subscription per user.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_subscription_user_active',
+            'subscriptions',
+            ['user_id'],
+            unique=True,
+            postgresql_where=sa.text("status IN ('active', 'trialing', 'past_due')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute("ALTER TABLE subscriptions DROP CONSTRAINT IF EXISTS uq_subscription_user")
+
+
+def downgrade() -> None:
+    # Fails if a user has accumulated more than one subscription row.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_subscription_user',
+            'subscriptions',
+            ['user_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(
+        "ALTER TABLE subscriptions "
+        "ADD CONSTRAINT uq_subscription_user UNIQUE USING INDEX uq_subscription_user"
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_subscription_user_active',
+            table_name='subscriptions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,62 @@
+"""Store monetization and connection-manager timestamps as timestamptz
+
+Revision ID: 7e3a1c9d5b08
+Revises: 5d2f8b0e6a94
+Create Date: 2026-10-16 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3a1c9d5b08'
+down_revision: Union[str, None] = '5d2f8b0e6a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns created as plain timestamp by 20260121_0949 and d09b37a83565
+# before those revisions switched to timestamptz.
+TIMESTAMP_COLUMNS = {
+    'subscriptions': ('current_period_start', 'current_period_end', 'created_at', 'updated_at'),
+    'flow_copies': ('copied_at',),
+    'creator_payouts': ('paid_at', 'created_at', 'updated_at'),
+    'providers': ('created_at', 'updated_at'),
+    'account_connections': ('last_used_at', 'created_at', 'updated_at'),
+    'credential_vault_items': ('created_at', 'updated_at'),
+    'manual_overrides': ('created_at', 'updated_at'),
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    # The stored values are naive UTC (datetime.utcnow()). With the session
+    # in UTC, PostgreSQL 12+ turns timestamp -> timestamptz into a catalog
+    # change instead of rewriting the table; a USING clause would defeat
+    # that, so there is none.
+    op.execute("SET LOCAL TimeZone = 'UTC'")
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        if table not in existing_tables:
+            continue
+        to_convert = [
+            c['name'] for c in inspector.get_columns(table)
+            if c['name'] in columns and not c['type'].timezone
+        ]
+        if to_convert:
+            op.execute(
+                f"ALTER TABLE {table} "
+                + ", ".join(
+                    f'ALTER COLUMN "{name}" TYPE timestamptz'
+                    for name in to_convert
+                )
+            )
+
+
+def downgrade() -> None:
+    # Earlier revisions create these columns as timestamptz, so that is also
+    # the correct state below this revision; there is nothing to undo.
+    pass
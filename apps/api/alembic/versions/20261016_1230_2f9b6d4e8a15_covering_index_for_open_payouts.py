@@ -0,0 +1,45 @@
+"""Covering partial index for open creator payouts
+
+Revision ID: 2f9b6d4e8a15
+Revises: 7e3a1c9d5b08
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2f9b6d4e8a15'
+down_revision: Union[str, None] = '7e3a1c9d5b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The payout worker only scans pending/processing payouts for a month and
+    # reads creator_id/amount_cents/stripe_transfer_id; keeping just those
+    # rows, with the columns included, turns the scan index-only (d09b37a83565
+    # dropped the old full idx_payouts_status). Databases built since
+    # 20260121_0949 started creating it already have it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_payouts_open',
+            'creator_payouts',
+            ['status', 'billing_month'],
+            postgresql_include=['creator_id', 'amount_cents', 'stripe_transfer_id', 'id'],
+            postgresql_where=sa.text("status IN ('pending', 'processing')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_payouts_open',
+            table_name='creator_payouts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
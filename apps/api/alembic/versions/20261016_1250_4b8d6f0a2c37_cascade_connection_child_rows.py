@@ -0,0 +1,59 @@
+"""Cascade deletes from account_connections to vault items and overrides
+
+Revision ID: 4b8d6f0a2c37
+Revises: 3a7c5e9f1b26
+Create Date: 2026-10-16 12:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d6f0a2c37'
+down_revision: Union[str, None] = '3a7c5e9f1b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows that belong to a connection and are deleted along with it.
+CHILD_TABLES = ('credential_vault_items', 'manual_overrides')
+
+
+def _set_ondelete(ondelete: Union[str, None]) -> None:
+    """Recreate the connection_id foreign keys with the given ON DELETE action."""
+    inspector = sa.inspect(op.get_bind())
+    foreign_keys = [
+        (table, fk)
+        for table in CHILD_TABLES
+        for fk in inspector.get_foreign_keys(table)
+        if fk['referred_table'] == 'account_connections'
+        and (fk['options'].get('ondelete') or '').upper() != (ondelete or '')
+    ]
+
+    # Existing rows already satisfy the constraint, so re-add it NOT VALID
+    # (no scan under the ALTER's lock) and validate outside the transaction.
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+        op.create_foreign_key(
+            fk['name'],
+            table,
+            'account_connections',
+            fk['constrained_columns'],
+            fk['referred_columns'],
+            ondelete=ondelete,
+            postgresql_not_valid=True,
+        )
+    with op.get_context().autocommit_block():
+        for table, fk in foreign_keys:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT "{fk["name"]}"')
+
+
+def upgrade() -> None:
+    # delete_connection removes a connection with one DELETE and lets the
+    # database remove its vault items and overrides.
+    _set_ondelete('CASCADE')
+
+
+def downgrade() -> None:
+    _set_ondelete(None)
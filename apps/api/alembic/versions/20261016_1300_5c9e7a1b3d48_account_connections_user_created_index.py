@@ -0,0 +1,54 @@
+"""Index account_connections on (user_id, created_at DESC)
+
+Revision ID: 5c9e7a1b3d48
+Revises: 4b8d6f0a2c37
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e7a1b3d48'
+down_revision: Union[str, None] = '4b8d6f0a2c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # get_user_connections filters on user_id and orders by created_at DESC;
+    # with both in the index the list comes back in order without a sort.
+    # Its leading user_id column makes the single-column index redundant.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_account_connections_user_created',
+            'account_connections',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_account_connections_user_id',
+            table_name='account_connections',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_account_connections_user_id',
+            'account_connections',
+            ['user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_account_connections_user_created',
+            table_name='account_connections',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,48 @@
+"""Full-text search index for prompts
+
+Revision ID: 6e1a3c5b7d92
+Revises: 5c9e7a1b3d48
+Create Date: 2026-10-16 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1a3c5b7d92'
+down_revision: Union[str, None] = '5c9e7a1b3d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match crud._prompt_search_vector() for get_prompts to use the index.
+SEARCH_VECTOR = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary, '')"
+    " || ' ' || coalesce(\"promptText\", ''))"
+)
+
+
+def upgrade() -> None:
+    # get_prompts' ``q`` filter used to ILIKE '%q%' three text columns, which
+    # no B-tree can serve; a GIN index over the combined tsvector answers the
+    # @@ match from its posting lists instead of scanning every prompt.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_prompts_fts',
+            'prompts',
+            [sa.text(SEARCH_VECTOR)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_prompts_fts',
+            table_name='prompts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,63 @@
+"""Covering unique index for per-user monthly flow copy lookups
+
+Revision ID: 8d4f2b6e0a13
+Revises: 6e1a3c5b7d92
+Create Date: 2026-10-16 13:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f2b6e0a13'
+down_revision: Union[str, None] = '6e1a3c5b7d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_flow_copies_user_month_flow'
+DEFINITION = '(user_id, billing_month, flow_id) INCLUDE (counted_for_payout)'
+
+
+def _partitions() -> list:
+    return op.get_bind().execute(sa.text(
+        "SELECT inhrelid::regclass::text FROM pg_inherits "
+        "WHERE inhparent = 'flow_copies'::regclass"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    # has_copied_this_month, count_copies_this_month and get_copies_this_month
+    # all look copies up by user and month (and flow); with those columns
+    # leading and counted_for_payout included they are index-only scans. The
+    # index replaces uq_copy_user_flow_month, which guards the same columns.
+    #
+    # CREATE INDEX CONCURRENTLY does not work on a partitioned table, so the
+    # parent index is created (invalid) on flow_copies alone, each partition
+    # builds its own index concurrently, and attaching the last one makes
+    # the parent index valid.
+    valid = op.get_bind().execute(sa.text(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+    ), {'name': INDEX}).scalar()
+    if not valid:
+        with op.get_context().autocommit_block():
+            op.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {INDEX} ON ONLY flow_copies {DEFINITION}')
+            for partition in _partitions():
+                partition_index = f'{partition}_user_month_flow_idx'
+                op.execute(
+                    f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {partition_index}'
+                    f' ON {partition} {DEFINITION}'
+                )
+                op.execute(f'ALTER INDEX {INDEX} ATTACH PARTITION {partition_index}')
+
+    op.execute('ALTER TABLE flow_copies DROP CONSTRAINT IF EXISTS uq_copy_user_flow_month')
+
+
+def downgrade() -> None:
+    op.execute(
+        'ALTER TABLE flow_copies ADD CONSTRAINT uq_copy_user_flow_month'
+        ' UNIQUE (user_id, flow_id, billing_month)'
+    )
+    # Drops the partitions' attached indexes with it.
+    op.execute(f'DROP INDEX IF EXISTS {INDEX}')
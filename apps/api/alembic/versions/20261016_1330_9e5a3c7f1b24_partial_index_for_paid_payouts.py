@@ -0,0 +1,27 @@
+"""Covering partial index for paid creator payouts (superseded, no-op)
+
+Revision ID: 9e5a3c7f1b24
+Revises: 8d4f2b6e0a13
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = '9e5a3c7f1b24'
+down_revision: Union[str, None] = '8d4f2b6e0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # This revision indexed paid payouts for get_total_earnings' SUM. The
+    # next revision, a7f1c3e5b9d2, replaces that SUM with the maintained
+    # users.total_earnings_cents, so the index would only be built to be
+    # dropped again. Kept as a no-op to leave the revision chain unchanged.
+    pass
+
+
+def downgrade() -> None:
+    # Nothing to undo: upgrade() creates nothing.
+    pass
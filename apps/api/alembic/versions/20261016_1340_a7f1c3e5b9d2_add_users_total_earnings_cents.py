@@ -0,0 +1,43 @@
+"""Add users.total_earnings_cents, a running total of paid payouts
+
+Revision ID: a7f1c3e5b9d2
+Revises: 9e5a3c7f1b24
+Create Date: 2026-10-16 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7f1c3e5b9d2'
+down_revision: Union[str, None] = '9e5a3c7f1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Maintained by crud.update_payout_status so get_total_earnings reads one
+    # row instead of summing a creator's whole payout history. A constant
+    # default is stored in the catalog, so adding the column is no rewrite.
+    op.add_column(
+        'users',
+        sa.Column('total_earnings_cents', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE users SET total_earnings_cents = paid.total
+        FROM (
+            SELECT creator_id, SUM(amount_cents) AS total
+            FROM creator_payouts
+            WHERE status = 'paid'
+            GROUP BY creator_id
+        ) AS paid
+        WHERE users.id = paid.creator_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'total_earnings_cents')
@@ -0,0 +1,57 @@
+"""Recode credential vault items from hex to base64
+
+Revision ID: b3d5f7a9c1e4
+Revises: a7f1c3e5b9d2
+Create Date: 2026-10-16 13:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e4'
+down_revision: Union[str, None] = 'a7f1c3e5b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# EncryptionService now stores URL-safe base64 of iv || content || auth_tag
+# instead of hex iv:auth_tag:content. This is a pure re-encoding of the same
+# bytes, so no key is needed. PostgreSQL's base64 is the standard alphabet,
+# wrapped every 76 characters; translate() maps it to the URL-safe alphabet
+# and drops the line breaks.
+
+
+def upgrade() -> None:
+    op.execute(
+        r"""
+        UPDATE credential_vault_items
+        SET encrypted_data = translate(
+            encode(
+                decode(split_part(encrypted_data, ':', 1), 'hex')
+                || decode(split_part(encrypted_data, ':', 3), 'hex')
+                || decode(split_part(encrypted_data, ':', 2), 'hex'),
+                'base64'
+            ),
+            E'+/\n', '-_'
+        )
+        WHERE encrypted_data LIKE '%:%:%'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE credential_vault_items
+        SET encrypted_data = encode(substr(raw, 1, 12), 'hex')
+            || ':' || encode(substr(raw, length(raw) - 15), 'hex')
+            || ':' || encode(substr(raw, 13, length(raw) - 28), 'hex')
+        FROM (
+            SELECT id AS raw_id, decode(translate(encrypted_data, '-_', '+/'), 'base64') AS raw
+            FROM credential_vault_items
+            WHERE encrypted_data NOT LIKE '%:%'
+        ) AS decoded
+        WHERE id = decoded.raw_id
+        """
+    )
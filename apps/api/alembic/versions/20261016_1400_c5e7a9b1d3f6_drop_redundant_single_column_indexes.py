@@ -0,0 +1,52 @@
+"""Drop single-column indexes covered by composite ones
+
+Revision ID: c5e7a9b1d3f6
+Revises: b3d5f7a9c1e4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a9b1d3f6'
+down_revision: Union[str, None] = 'b3d5f7a9c1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each of these leads a composite index that serves the same lookups, so they
+# only add write cost to every insert:
+#   ix_likes_user_id              -> uq_like_user_target (user_id, target_type, target_id)
+#   ix_creator_payouts_creator_id -> uq_payout_creator_month (creator_id, billing_month)
+#   ix_flow_copies_user_id        -> ix_flow_copies_user_month_flow (user_id, billing_month, flow_id)
+# ix_flow_copies_creator_id is never used: copies are only read by creator
+# for payouts, which ix_flow_copies_creator_payout covers.
+INDEXES = [
+    ('ix_likes_user_id', 'likes', ['user_id']),
+    ('ix_creator_payouts_creator_id', 'creator_payouts', ['creator_id']),
+]
+PARTITIONED_INDEXES = [
+    ('ix_flow_copies_user_id', 'flow_copies', ['user_id']),
+    ('ix_flow_copies_creator_id', 'flow_copies', ['creator_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    # DROP INDEX CONCURRENTLY does not work on partitioned indexes; dropping
+    # the parent index drops the partitions' indexes with it.
+    for name, table, _ in PARTITIONED_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+    for name, table, columns in PARTITIONED_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
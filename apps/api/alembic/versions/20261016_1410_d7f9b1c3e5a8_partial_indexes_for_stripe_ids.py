@@ -0,0 +1,67 @@
+"""Partial indexes for users' Stripe ids
+
+Revision ID: d7f9b1c3e5a8
+Revises: c5e7a9b1d3f6
+Create Date: 2026-10-16 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f9b1c3e5a8'
+down_revision: Union[str, None] = 'c5e7a9b1d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (partial index, column, full index it replaces)
+STRIPE_ID_INDEXES = [
+    ('ix_users_stripe_customer', 'stripe_customer_id', 'ix_users_stripe_customer_id'),
+    ('ix_users_stripe_connect', 'stripe_connect_id', 'ix_users_stripe_connect_id'),
+]
+
+
+def upgrade() -> None:
+    # Most users never touch Stripe, so full indexes on these columns are
+    # mostly NULL entries that every user INSERT still has to maintain.
+    # ix_subscriptions_stripe_subscription_id duplicates the unique index
+    # uq_subscription_stripe_id on the same column.
+    with op.get_context().autocommit_block():
+        for name, column, old_name in STRIPE_ID_INDEXES:
+            op.create_index(
+                name,
+                'users',
+                [column],
+                postgresql_where=sa.text(f'{column} IS NOT NULL'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                old_name, table_name='users', postgresql_concurrently=True, if_exists=True
+            )
+        op.drop_index(
+            'ix_subscriptions_stripe_subscription_id',
+            table_name='subscriptions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_subscriptions_stripe_subscription_id',
+            'subscriptions',
+            ['stripe_subscription_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, column, old_name in STRIPE_ID_INDEXES:
+            op.create_index(
+                old_name, 'users', [column], postgresql_concurrently=True, if_not_exists=True
+            )
+            op.drop_index(
+                name, table_name='users', postgresql_concurrently=True, if_exists=True
+            )
@@ -1,20 +1,13 @@
-import sqlite3
+from _db_introspect import snapshot
 
 # Check the API directory database
-conn = sqlite3.connect('./flowtab.db')
-cursor = conn.cursor()
+versions, tables = snapshot('./flowtab.db')
 
-try:
-    # Check alembic version
-    cursor.execute('SELECT * FROM alembic_version')
-    print("Alembic version:", cursor.fetchall())
-except sqlite3.OperationalError as e:
-    print(f"Alembic version table error: {e}")
+if versions is None:
+    print("Alembic version table missing")
+else:
+    print("Alembic version:", versions)
 
-# Check all tables
-cursor.execute('SELECT name FROM sqlite_master WHERE type="table" ORDER BY name')
 print("\nAll tables in apps/api/flowtab.db:")
-for row in cursor.fetchall():
-    print(f"  - {row[0]}")
-
-conn.close()
+for name in tables:
+    print(f"  - {name}")
@@ -1,16 +1,9 @@
-import sqlite3
+from _db_introspect import snapshot
 
-conn = sqlite3.connect('../../flowtab.db')
-cursor = conn.cursor()
+versions, tables = snapshot('../../flowtab.db')
 
-# Check alembic version
-cursor.execute('SELECT * FROM alembic_version')
-print("Alembic version:", cursor.fetchall())
+print("Alembic version:", versions)
 
-# Check all tables
-cursor.execute('SELECT name FROM sqlite_master WHERE type="table" ORDER BY name')
 print("\nAll tables:")
-for row in cursor.fetchall():
-    print(f"  - {row[0]}")
-
-conn.close()
+for name in tables:
+    print(f"  - {name}")
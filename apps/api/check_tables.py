@@ -1,8 +1,4 @@
-import sqlite3
+from _db_introspect import snapshot
 
-conn = sqlite3.connect('../../flowtab.db')
-cursor = conn.cursor()
-cursor.execute('SELECT name FROM sqlite_master WHERE type="table" ORDER BY name')
-tables = [row[0] for row in cursor.fetchall()]
+_, tables = snapshot('../../flowtab.db')
 print('\n'.join(tables))
-conn.close()
@@ -1,12 +1,10 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from apps.api.db import engine
 from apps.api.models import Prompt
 
 with Session(engine) as session:
-    statement = select(Prompt)
-    results = session.exec(statement).all()
-    types = set(p.type for p in results)
-    print(f"Distinct types: {types}")
-    for t in types:
-        count = len([p for p in results if p.type == t])
+    statement = select(Prompt.type, func.count()).group_by(Prompt.type)
+    counts = session.exec(statement).all()
+    print(f"Distinct types: {set(t for t, _ in counts)}")
+    for t, count in counts:
         print(f"Type {t}: {count} items")
@@ -2,18 +2,49 @@
 CRUD operations for connection management.
 """
 
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
-from sqlmodel import Session, select, col
-from sqlalchemy import and_
-from sqlalchemy.orm import selectinload
+from sqlmodel import Session, delete, select, col
+from sqlalchemy import and_, func, insert, update
+from sqlalchemy.orm import joinedload, selectinload
 
-from apps.api.models import Provider, AccountConnection, CredentialVaultItem, ManualOverride
+from apps.api.models import (
+    Provider, AccountConnection, CredentialVaultItem, ManualOverride, is_valid_id
+)
 from apps.api.encryption import encryption_service
 from apps.api.schemas import ConnectionCreate, ConnectionRead, ProviderRead
 
 
-def get_providers(session: Session, active_only: bool = True) -> list[Provider]:
+# Providers are reference data, written only by seed_providers.py in another
+# process, so lookups are served from a process-local cache of ProviderRead
+# snapshots (not session-bound ORM objects); the TTL bounds how long a
+# reseed takes to show up. Misses are not cached.
+_PROVIDER_CACHE_TTL_SECONDS = 60
+_provider_cache: dict[tuple, tuple[float, object]] = {}
+
+
+def _cached_provider_lookup(key: tuple, load):
+    """Return ``load()`` for ``key``, reusing a result younger than the TTL."""
+    now = time.monotonic()
+    hit = _provider_cache.get(key)
+    if hit is not None and now - hit[0] < _PROVIDER_CACHE_TTL_SECONDS:
+        return hit[1]
+
+    value = load()
+    if value is not None:
+        _provider_cache[key] = (now, value)
+    return value
+
+
+def clear_provider_cache() -> None:
+    """Drop all cached provider lookups."""
+    _provider_cache.clear()
+
+
+def get_providers(session: Session, active_only: bool = True) -> list[ProviderRead]:
     """
     Get all providers.
 
@@ -24,14 +55,18 @@ def get_providers(session: Session, active_only: bool = True) -> list[Provider]:
     Returns:
         List of providers
     """
-    query = select(Provider)
-    if active_only:
-        query = query.where(Provider.is_active == True)
 
-    return session.exec(query.order_by(col(Provider.display_name))).all()
+    def load() -> list[ProviderRead]:
+        query = select(Provider)
+        if active_only:
+            query = query.where(Provider.is_active == True)
+        providers = session.exec(query.order_by(col(Provider.display_name))).all()
+        return [ProviderRead.model_validate(provider) for provider in providers]
+
+    return _cached_provider_lookup(("all", active_only), load)
 
 
-def get_provider_by_id(session: Session, provider_id: str) -> Optional[Provider]:
+def get_provider_by_id(session: Session, provider_id: str) -> Optional[ProviderRead]:
     """
     Get a provider by ID.
 
@@ -42,10 +77,17 @@ def get_provider_by_id(session: Session, provider_id: str) -> Optional[Provider]
     Returns:
         Provider or None
     """
-    return session.exec(select(Provider).where(Provider.id == provider_id)).first()
+    if not is_valid_id(provider_id):
+        return None
+
+    def load() -> Optional[ProviderRead]:
+        provider = session.exec(select(Provider).where(Provider.id == provider_id)).first()
+        return ProviderRead.model_validate(provider) if provider else None
+
+    return _cached_provider_lookup(("id", provider_id), load)
 
 
-def get_provider_by_slug(session: Session, slug: str) -> Optional[Provider]:
+def get_provider_by_slug(session: Session, slug: str) -> Optional[ProviderRead]:
     """
     Get a provider by slug.
 
@@ -56,7 +98,12 @@ def get_provider_by_slug(session: Session, slug: str) -> Optional[Provider]:
     Returns:
         Provider or None
     """
-    return session.exec(select(Provider).where(Provider.slug == slug)).first()
+
+    def load() -> Optional[ProviderRead]:
+        provider = session.exec(select(Provider).where(Provider.slug == slug)).first()
+        return ProviderRead.model_validate(provider) if provider else None
+
+    return _cached_provider_lookup(("slug", slug), load)
 
 
 def get_user_connections(
@@ -97,6 +144,9 @@ def get_connection_by_id(
     Returns:
         Connection or None
     """
+    if not is_valid_id(connection_id):
+        return None
+
     query = select(AccountConnection).where(
         and_(
             AccountConnection.id == connection_id, AccountConnection.user_id == user_id
@@ -104,12 +154,20 @@ def get_connection_by_id(
     )
 
     if include_provider:
-        # Join with provider
-        query = query.options(selectinload(AccountConnection.provider))
+        # Single row: join the provider in rather than a second SELECT
+        query = query.options(joinedload(AccountConnection.provider))
 
     return session.exec(query).first()
 
 
+# Provider flag each connection type requires, and the error when it's unset.
+_CONNECTION_TYPE_SUPPORT = {
+    "api_key": ("supports_api_key", "Provider does not support API key authentication"),
+    "oauth": ("supports_oauth", "Provider does not support OAuth authentication"),
+    "manual": ("supports_manual", "Provider does not support manual configuration"),
+}
+
+
 def create_connection(
     session: Session, user_id: str, connection_data: ConnectionCreate
 ) -> AccountConnection:
@@ -122,7 +180,7 @@ def create_connection(
         connection_data: Connection creation data
 
     Returns:
-        Created connection
+        Created connection, with its provider loaded
 
     Raises:
         ValueError: If provider not found or invalid connection type
@@ -134,15 +192,12 @@ def create_connection(
 
     # Validate connection type is supported by provider
     connection_type = connection_data.connection_type
+    if connection_type not in _CONNECTION_TYPE_SUPPORT:
+        raise ValueError(f"Unsupported connection type: {connection_type}")
 
-    if connection_type == "api_key" and not provider.supports_api_key:
-        raise ValueError(f"Provider does not support API key authentication")
-
-    if connection_type == "oauth" and not provider.supports_oauth:
-        raise ValueError(f"Provider does not support OAuth authentication")
-
-    if connection_type == "manual" and not provider.supports_manual:
-        raise ValueError(f"Provider does not support manual configuration")
+    support_flag, unsupported_message = _CONNECTION_TYPE_SUPPORT[connection_type]
+    if not getattr(provider, support_flag):
+        raise ValueError(unsupported_message)
 
     # Validate credentials are provided if needed
     if connection_type == "api_key" and not connection_data.credentials:
@@ -160,17 +215,24 @@ def create_connection(
     session.add(connection)
     session.flush()  # Get the connection ID
 
-    # Encrypt and store credentials if provided
+    # Encrypt and store credentials if provided, as one multi-row INSERT.
+    # Building each row through the model fills in id and timestamps.
     if connection_data.credentials:
-        for key_name, credential_value in connection_data.credentials.items():
-            encrypted_data = encryption_service.encrypt(credential_value)
-
-            vault_item = CredentialVaultItem(
-                connection_id=connection.id,
-                encrypted_data=encrypted_data,
-                key_name=key_name,
-            )
-            session.add(vault_item)
+        key_names = list(connection_data.credentials)
+        encrypted_values = encryption_service.encrypt_many(
+            list(connection_data.credentials.values())
+        )
+        session.exec(
+            insert(CredentialVaultItem),
+            params=[
+                CredentialVaultItem(
+                    connection_id=connection.id,
+                    encrypted_data=encrypted_data,
+                    key_name=key_name,
+                ).model_dump()
+                for key_name, encrypted_data in zip(key_names, encrypted_values)
+            ],
+        )
 
     # Store manual config if provided
     if connection_data.manual_config:
@@ -180,9 +242,13 @@ def create_connection(
         session.add(manual_override)
 
     session.commit()
-    session.refresh(connection)
 
-    return connection
+    # One SELECT after the commit, not INSERT ... RETURNING: the response
+    # needs the provider row, which RETURNING can't supply, and the stored
+    # timestamps (timestamptz comes back aware). Sessions don't expire on
+    # commit, so expire the instance for the reload to overwrite it.
+    session.expire(connection)
+    return get_connection_by_id(session, connection.id, user_id)
 
 
 def delete_connection(session: Session, connection_id: str, user_id: str) -> bool:
@@ -197,34 +263,67 @@ def delete_connection(session: Session, connection_id: str, user_id: str) -> boo
     Returns:
         True if deleted, False if not found
     """
-    connection = get_connection_by_id(
-        session, connection_id, user_id, include_provider=False
-    )
-
-    if not connection:
+    if not is_valid_id(connection_id):
         return False
 
-    # Delete associated credential vault items
-    vault_items = session.exec(
-        select(CredentialVaultItem).where(
-            CredentialVaultItem.connection_id == connection_id
+    # Vault items and manual overrides go with it via ON DELETE CASCADE.
+    result = session.exec(
+        delete(AccountConnection).where(
+            AccountConnection.id == connection_id,
+            AccountConnection.user_id == user_id,
         )
-    ).all()
-    for item in vault_items:
-        session.delete(item)
-
-    # Delete associated manual overrides
-    manual_overrides = session.exec(
-        select(ManualOverride).where(ManualOverride.connection_id == connection_id)
-    ).all()
-    for override in manual_overrides:
-        session.delete(override)
-
-    # Delete the connection
-    session.delete(connection)
+    )
     session.commit()
 
-    return True
+    return result.rowcount > 0
+
+
+# Decrypted credentials are kept briefly so repeated lookups for the same
+# connection skip AES-GCM, keyed by vault item id. Plaintext secrets must not
+# linger in memory: entries expire after the TTL and the cache is capped, with
+# entries in store order so storing drops expired ones, then the oldest beyond
+# the cap, from the front. A hit also needs the same ciphertext, so a
+# re-encrypted item is never served a stale value, and a deleted item is
+# never looked up again (its row is read first). Routes run in the
+# threadpool, so the cache is only touched under its lock; decryption
+# itself runs outside it.
+_CREDENTIAL_CACHE_TTL_SECONDS = 60
+_CREDENTIAL_CACHE_SIZE = 1024
+_credential_cache: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+_credential_cache_lock = threading.Lock()
+
+
+def _decrypt(item_id: str, encrypted_data: str) -> str:
+    """Decrypt a vault item's data, reusing a result younger than the TTL."""
+    now = time.monotonic()
+    with _credential_cache_lock:
+        hit = _credential_cache.get(item_id)
+    if (
+        hit is not None
+        and now - hit[0] < _CREDENTIAL_CACHE_TTL_SECONDS
+        and hit[1] == encrypted_data
+    ):
+        return hit[2]
+
+    value = encryption_service.decrypt(encrypted_data)
+    with _credential_cache_lock:
+        _credential_cache.pop(item_id, None)
+        while _credential_cache:
+            stored_at = next(iter(_credential_cache.values()))[0]
+            if (
+                now - stored_at < _CREDENTIAL_CACHE_TTL_SECONDS
+                and len(_credential_cache) < _CREDENTIAL_CACHE_SIZE
+            ):
+                break
+            _credential_cache.popitem(last=False)
+        _credential_cache[item_id] = (now, encrypted_data, value)
+    return value
+
+
+def clear_credential_cache() -> None:
+    """Drop all cached decrypted credentials."""
+    with _credential_cache_lock:
+        _credential_cache.clear()
 
 
 def get_connection_credentials(
@@ -244,28 +343,34 @@ def get_connection_credentials(
     Raises:
         ValueError: If connection not found or not owned by user
     """
-    # Verify connection exists and belongs to user
-    connection = get_connection_by_id(
-        session, connection_id, user_id, include_provider=False
-    )
-    if not connection:
-        raise ValueError("Connection not found")
-
-    # Get and decrypt credentials
-    vault_items = session.exec(
-        select(CredentialVaultItem).where(
-            CredentialVaultItem.connection_id == connection_id
+    # The ownership check rides along with the vault items: no rows means
+    # no such connection for this user, a NULL key_name means no items.
+    rows = session.exec(
+        select(
+            CredentialVaultItem.id,
+            CredentialVaultItem.key_name,
+            CredentialVaultItem.encrypted_data,
+        )
+        .select_from(AccountConnection)
+        .outerjoin(CredentialVaultItem)
+        .where(
+            AccountConnection.id == connection_id,
+            AccountConnection.user_id == user_id,
         )
     ).all()
+    if not rows:
+        raise ValueError("Connection not found")
 
     credentials = {}
-    for item in vault_items:
+    for item_id, key_name, encrypted_data in rows:
+        if key_name is None:
+            continue
         try:
-            decrypted_value = encryption_service.decrypt(item.encrypted_data)
-            credentials[item.key_name] = decrypted_value
+            decrypted_value = _decrypt(item_id, encrypted_data)
+            credentials[key_name] = decrypted_value
         except Exception as e:
             raise ValueError(
-                f"Failed to decrypt credential '{item.key_name}': {str(e)}"
+                f"Failed to decrypt credential '{key_name}': {str(e)}"
             )
 
     return credentials
@@ -286,19 +391,43 @@ def get_manual_config(session: Session, connection_id: str, user_id: str) -> dic
     Raises:
         ValueError: If connection not found or not owned by user
     """
-    # Verify connection exists and belongs to user
-    connection = get_connection_by_id(
-        session, connection_id, user_id, include_provider=False
-    )
+    # Ownership check and override in one row: none means no such connection
+    # for this user, a NULL config means no override.
+    row = session.exec(
+        select(AccountConnection.id, ManualOverride.config)
+        .select_from(AccountConnection)
+        .outerjoin(ManualOverride)
+        .where(
+            AccountConnection.id == connection_id,
+            AccountConnection.user_id == user_id,
+        )
+    ).first()
+    if row is None:
+        raise ValueError("Connection not found")
+
+    return row.config or {}
+
+
+def _update_connection(session: Session, connection_id: str, values: dict) -> AccountConnection:
+    """
+    Apply ``values`` to a connection in one UPDATE ... RETURNING round trip.
+
+    Raises:
+        ValueError: If the connection does not exist
+    """
+    connection = session.exec(
+        update(AccountConnection)
+        .where(AccountConnection.id == connection_id)
+        .values(**values)
+        .returning(AccountConnection)
+    ).scalar_one_or_none()
+
     if not connection:
         raise ValueError("Connection not found")
 
-    # Get manual override
-    manual_override = session.exec(
-        select(ManualOverride).where(ManualOverride.connection_id == connection_id)
-    ).first()
+    session.commit()
 
-    return manual_override.config if manual_override else {}
+    return connection
 
 
 def update_connection_status(
@@ -316,22 +445,11 @@ def update_connection_status(
     Returns:
         Updated connection
     """
-    connection = session.exec(
-        select(AccountConnection).where(AccountConnection.id == connection_id)
-    ).first()
-
-    if not connection:
-        raise ValueError("Connection not found")
-
-    connection.status = status
+    values = {"status": status}
     if last_error:
-        connection.last_error = last_error
-
-    session.add(connection)
-    session.commit()
-    session.refresh(connection)
+        values["last_error"] = last_error
 
-    return connection
+    return _update_connection(session, connection_id, values)
 
 
 def record_connection_usage(session: Session, connection_id: str) -> AccountConnection:
@@ -345,21 +463,8 @@ def record_connection_usage(session: Session, connection_id: str) -> AccountConn
     Returns:
         Updated connection
     """
-    connection = session.exec(
-        select(AccountConnection).where(AccountConnection.id == connection_id)
-    ).first()
-
-    if not connection:
-        raise ValueError("Connection not found")
-
-    from datetime import datetime
-
-    connection.last_used_at = datetime.utcnow()
-    connection.status = "active"
-    connection.last_error = None
-
-    session.add(connection)
-    session.commit()
-    session.refresh(connection)
-
-    return connection
+    return _update_connection(
+        session,
+        connection_id,
+        {"last_used_at": func.now(), "status": "active", "last_error": None},
+    )
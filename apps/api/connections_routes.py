@@ -19,6 +19,7 @@ from apps.api.schemas import (
 )
 from apps.api.connections_crud import (
     get_providers,
+    get_provider_by_id,
     get_user_connections,
     get_connection_by_id,
     create_connection,
@@ -60,48 +61,20 @@ def list_connections(
     Requires authentication. Returns connections with provider information
     but never includes decrypted credentials.
     """
-    connections = get_user_connections(session, current_user.id, include_provider=True)
-
-    # Convert to response schemas
-    connection_reads = []
-    for conn in connections:
-        connection_dict = {
-            "id": conn.id,
-            "user_id": conn.user_id,
-            "provider_id": conn.provider_id,
-            "label": conn.label,
-            "connection_type": conn.connection_type,
-            "status": conn.status,
-            "last_used_at": conn.last_used_at,
-            "last_error": conn.last_error,
-            "created_at": conn.created_at,
-            "updated_at": conn.updated_at,
-            "provider": None,
-        }
-
-        # Add provider info if available
-        if hasattr(conn, "provider") and conn.provider:
-            provider = conn.provider
-            connection_dict["provider"] = ProviderRead(
-                id=provider.id,
-                name=provider.name,
-                slug=provider.slug,
-                display_name=provider.display_name,
-                description=provider.description,
-                api_endpoint=provider.api_endpoint,
-                auth_type=provider.auth_type,
-                supports_api_key=provider.supports_api_key,
-                supports_oauth=provider.supports_oauth,
-                supports_manual=provider.supports_manual,
-                rate_limit_per_minute=provider.rate_limit_per_minute,
-                rate_limit_per_hour=provider.rate_limit_per_hour,
-                documentation_url=provider.documentation_url,
-                is_active=provider.is_active,
+    connections = get_user_connections(session, current_user.id, include_provider=False)
+
+    # Providers come from the provider cache as shared ProviderRead
+    # snapshots, so rows for the same provider reuse one object and the
+    # list needs no provider query.
+    return ConnectionListResponse(
+        items=[
+            ConnectionRead(
+                **conn.model_dump(),
+                provider=get_provider_by_id(session, conn.provider_id),
             )
-
-        connection_reads.append(ConnectionRead(**connection_dict))
-
-    return ConnectionListResponse(items=connection_reads)
+            for conn in connections
+        ]
+    )
 
 
 @router.post("", response_model=ConnectionRead, status_code=status.HTTP_201_CREATED)
@@ -117,27 +90,7 @@ def create_connection_route(
     """
     try:
         connection = create_connection(session, current_user.id, connection_data)
-
-        # Get provider info for response
-        provider = get_providers.__globals__["get_provider_by_id"](
-            session, connection.provider_id
-        )
-
-        connection_dict = {
-            "id": connection.id,
-            "user_id": connection.user_id,
-            "provider_id": connection.provider_id,
-            "label": connection.label,
-            "connection_type": connection.connection_type,
-            "status": connection.status,
-            "last_used_at": connection.last_used_at,
-            "last_error": connection.last_error,
-            "created_at": connection.created_at,
-            "updated_at": connection.updated_at,
-            "provider": ProviderRead.model_validate(provider) if provider else None,
-        }
-
-        return ConnectionRead(**connection_dict)
+        return ConnectionRead.model_validate(connection)
 
     except ValueError as e:
         raise HTTPException(
@@ -196,23 +149,4 @@ def get_connection_route(
             detail="Connection not found",
         )
 
-    # Get provider info for response
-    provider = get_providers.__globals__["get_provider_by_id"](
-        session, connection.provider_id
-    )
-
-    connection_dict = {
-        "id": connection.id,
-        "user_id": connection.user_id,
-        "provider_id": connection.provider_id,
-        "label": connection.label,
-        "connection_type": connection.connection_type,
-        "status": connection.status,
-        "last_used_at": connection.last_used_at,
-        "last_error": connection.last_error,
-        "created_at": connection.created_at,
-        "updated_at": connection.updated_at,
-        "provider": ProviderRead.model_validate(provider) if provider else None,
-    }
-
-    return ConnectionRead(**connection_dict)
+    return ConnectionRead.model_validate(connection)
@@ -6,27 +6,86 @@ including search, filtering, pagination, and CRUD operations.
 """
 
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Any
 
-from sqlmodel import Session, select
-from sqlalchemy import String, func, or_
+from sqlmodel import Session, delete, select
+from sqlalchemy import String, event, exists, func, or_, text, update
+from sqlalchemy.dialects.postgresql import array, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached, selectinload
 from sqlalchemy.sql.expression import cast
 
 from apps.api.models import (
     Prompt, User, Comment, Like, Subscription,
-    FlowCopy, CreatorPayout, Save
+    FlowCopy, CreatorPayout, Save, LIVE_SUBSCRIPTION_STATUSES, is_valid_id
 )
-from apps.api.schemas import PromptCreate, UserCreate
+from apps.api.schemas import PromptCreate, PromptListItem, UserCreate
+
+
+# get_user_by_email runs on every authenticated request (get_current_user),
+# so found users are cached briefly as column snapshots, not ORM objects
+# tied to the session that loaded them. Any ORM update or delete of a user
+# clears the cache; the TTL bounds staleness from writes made elsewhere.
+# Snapshots include the password hash, so the cache is also capped: entries
+# are kept in store order, and storing drops expired ones and then the
+# oldest beyond the cap. Lookups come from the event loop and from
+# threadpool routes at once, so the cache is only touched under its lock.
+# users.email is citext, so keys are lowercased: case variants of an address
+# are one row and share one entry.
+_USER_CACHE_TTL_SECONDS = 60
+_USER_CACHE_SIZE = 1000
+_user_by_email_cache: dict[str, tuple[float, dict]] = {}
+_user_by_email_lock = threading.Lock()
+
+
+def clear_user_cache() -> None:
+    """Drop all cached get_user_by_email results."""
+    with _user_by_email_lock:
+        _user_by_email_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    clear_user_cache()
 
 
 def get_user_by_email(session: Session, email: str) -> User | None:
     """
     Get a user by email.
     """
+    now = time.monotonic()
+    key = email.lower()
+    with _user_by_email_lock:
+        hit = _user_by_email_cache.get(key)
+    if hit is not None and now - hit[0] < _USER_CACHE_TTL_SECONDS:
+        # Rebuild the row as if just loaded and attach it without a SELECT
+        user = User(**hit[1])
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
     statement = select(User).where(User.email == email)
-    return session.exec(statement).first()
+    user = session.exec(statement).first()
+    if user is not None:
+        snapshot = user.model_dump()
+        with _user_by_email_lock:
+            _user_by_email_cache.pop(key, None)
+            # Oldest first: stop at the first fresh entry once under the cap
+            while _user_by_email_cache:
+                oldest = next(iter(_user_by_email_cache))
+                stored_at = _user_by_email_cache[oldest][0]
+                if (
+                    now - stored_at < _USER_CACHE_TTL_SECONDS
+                    and len(_user_by_email_cache) < _USER_CACHE_SIZE
+                ):
+                    break
+                _user_by_email_cache.pop(oldest, None)
+            _user_by_email_cache[key] = (now, snapshot)
+    return user
 
 
 def get_user_by_username(session: Session, username: str) -> User | None:
@@ -80,6 +139,147 @@ def get_prompt_by_slug(session: Session, slug: str) -> Prompt | None:
     return result
 
 
+def get_prompt_id_by_slug(session: Session, slug: str) -> str | None:
+    """
+    Look up only the id of the prompt with the given slug.
+
+    Answered from the covering slug index without touching the prompts table.
+
+    Args:
+        session: SQLAlchemy database session
+        slug: URL-friendly unique identifier
+
+    Returns:
+        The prompt id if found, None otherwise
+    """
+    statement = select(Prompt.id).where(Prompt.slug == slug)
+    return session.exec(statement).first()
+
+
+def _prompt_search_vector():
+    """
+    The tsvector searched by get_prompts on PostgreSQL.
+
+    Must stay identical to the ix_prompts_fts index expression.
+    """
+    return func.to_tsvector(
+        "english",
+        func.coalesce(Prompt.title, "")
+        + " "
+        + func.coalesce(Prompt.summary, "")
+        + " "
+        + func.coalesce(Prompt.promptText, ""),
+    )
+
+
+def _apply_prompt_filters(
+    session: Session,
+    statement,
+    q: str | None,
+    tags: list[str] | None,
+    type_: str | None,
+    worksWith: list[str] | None,
+):
+    """
+    Add the get_prompts filters to ``statement``.
+
+    Returns:
+        Tuple of (filtered statement, full-text rank expression or None)
+    """
+    is_postgres = session.get_bind().dialect.name == "postgresql"
+
+    # Apply text search across title, summary, and promptText: full-text
+    # match on PostgreSQL (served by ix_prompts_fts), ILIKE elsewhere
+    search_rank = None
+    if q:
+        if is_postgres:
+            search_vector = _prompt_search_vector()
+            search_query = func.plainto_tsquery("english", q)
+            statement = statement.where(search_vector.op("@@")(search_query))
+            search_rank = func.ts_rank_cd(search_vector, search_query)
+        else:
+            search_pattern = f"%{q}%"
+            statement = statement.where(
+                or_(
+                    Prompt.title.ilike(search_pattern),
+                    Prompt.summary.ilike(search_pattern),
+                    Prompt.promptText.ilike(search_pattern),
+                )
+            )
+
+    # Apply type filter
+    if type_:
+        statement = statement.where(Prompt.type == type_)
+
+    # Apply tags filter (AND logic - prompts must contain ALL specified tags)
+    if tags:
+        if is_postgres:
+            # JSONB containment of the whole list, served by ix_prompts_tags_gin
+            statement = statement.where(Prompt.tags.contains(tags))
+        else:
+            # Match each tag as a quoted string inside the serialized JSON array
+            for tag in tags:
+                pattern = '%"' + tag.replace('"', '""') + '"%'
+                statement = statement.where(cast(Prompt.tags, type_=String).like(pattern))
+
+    # Apply worksWith filter (OR logic - prompts must contain ANY specified tool)
+    if worksWith:
+        if is_postgres:
+            # JSONB ?| (any of these strings), served by ix_prompts_works_with_gin
+            statement = statement.where(Prompt.worksWith.has_any(array(worksWith)))
+        else:
+            statement = statement.where(
+                or_(*(
+                    cast(Prompt.worksWith, type_=String).like('%"' + tool.replace('"', '""') + '"%')
+                    for tool in worksWith
+                ))
+            )
+
+    return statement, search_rank
+
+
+def _page_prompts(
+    session: Session,
+    columns: tuple,
+    skip: int,
+    limit: int,
+    q: str | None,
+    tags: list[str] | None,
+    type_: str | None,
+    worksWith: list[str] | None,
+) -> tuple[list, int]:
+    """
+    Select ``columns`` for one page of filtered prompts.
+
+    Returns:
+        Tuple of (list of result rows, total count)
+    """
+    # One query returns the page and, via COUNT(*) OVER (), the total number
+    # of matches (the window is computed before OFFSET/LIMIT apply)
+    statement, search_rank = _apply_prompt_filters(
+        session,
+        select(*columns, func.count().over().label("total")),
+        q, tags, type_, worksWith,
+    )
+
+    # Apply pagination and ordering (best full-text matches first, if any)
+    if search_rank is not None:
+        statement = statement.order_by(search_rank.desc())
+    statement = statement.order_by(Prompt.createdAt.desc()).offset(skip).limit(limit)
+
+    rows = session.exec(statement).all()
+    if rows:
+        return rows, rows[0].total
+
+    # An empty page carries no total; only a page past the end needs counting
+    if not skip:
+        return [], 0
+    count_statement, _ = _apply_prompt_filters(
+        session, select(func.count(Prompt.id)), q, tags, type_, worksWith
+    )
+    return [], session.exec(count_statement).one()
+
+
 def get_prompts(
     session: Session,
     skip: int = 0,
@@ -98,106 +298,58 @@ def get_prompts(
         limit: Maximum number of results to return
         q: Search query for text search across title, summary, and promptText
         tags: List of tags to filter by (AND logic - prompts must contain ALL specified tags)
-
+        type_: Type of content to filter by ('prompt' or 'discussion')
         worksWith: List of tools to filter by (OR logic - prompts must contain ANY specified tool)
 
     Returns:
         Tuple of (list of prompts, total count)
     """
-    # Start with base query
-    statement: Select[tuple[Prompt]] = select(Prompt)
-
-    # Apply text search (ILIKE across title, summary, and promptText)
-    if q:
-        search_pattern = f"%{q}%"
-        statement = statement.where(
-            or_(
-                Prompt.title.ilike(search_pattern),
-                Prompt.summary.ilike(search_pattern),
-                Prompt.promptText.ilike(search_pattern),
-            )
-        )
+    rows, total = _page_prompts(
+        session, (Prompt,), skip, limit, q, tags, type_, worksWith
+    )
+    return [prompt for prompt, _ in rows], total
 
-    # Apply difficulty filter (exact match)
-    
-    # Apply type filter
-    if type_:
-        statement = statement.where(Prompt.type == type_)
 
+def get_prompts_summary(
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    q: str | None = None,
+    tags: list[str] | None = None,
+    type_: str | None = None,
+    worksWith: list[str] | None = None,
+) -> tuple[list[PromptListItem], int]:
+    """
+    Query prompts like get_prompts, loading only the list-view columns.
 
-    # Apply tags filter (AND logic - prompts must contain ALL specified tags)
-    if tags:
-        for tag in tags:
-            # For SQLite and PostgreSQL compatibility, filter by checking if tag is in the JSON array
-            # Use string-based filtering which works with both databases
-            # Escape quotes in the tag value
-            escaped_tag = tag.replace('"', '""')
-            pattern = '%"' + escaped_tag + '"%'
-            statement = statement.where(cast(Prompt.tags, type_=String).like(pattern))
+    promptText and notes can be long and are never shown in a list, so they
+    are left out of the SELECT rather than fetched and discarded.
 
-    # Apply worksWith filter (OR logic - prompts must contain ANY specified tool)
-    if worksWith:
-        # Build OR conditions for each tool
-        works_with_conditions = []
-        for tool in worksWith:
-            # Escape quotes in the tool value
-            escaped_tool = tool.replace('"', '""')
-            pattern = '%"' + escaped_tool + '"%'
-            works_with_conditions.append(
-                cast(Prompt.worksWith, type_=String).like(pattern)
-            )
-        if works_with_conditions:
-            statement = statement.where(or_(*works_with_conditions))
-
-    # Get total count before pagination
-    # Use a simpler count query to avoid subquery issues
-    # Count the ID column instead of using select_from with the statement
-    count_statement = select(func.count(Prompt.id))
-    # Apply the same filters to the count statement
-    if q:
-        search_pattern = f"%{q}%"
-        count_statement = count_statement.where(
-            or_(
-                Prompt.title.ilike(search_pattern),
-                Prompt.summary.ilike(search_pattern),
-                Prompt.promptText.ilike(search_pattern),
-            )
-        )
+    Returns:
+        Tuple of (list of prompt list items, total count)
+    """
+    rows, total = _page_prompts(
+        session, Prompt.summary_columns(), skip, limit, q, tags, type_, worksWith
+    )
+    return [PromptListItem.model_validate(row._mapping) for row in rows], total
 
-    if type_:
-        count_statement = count_statement.where(Prompt.type == type_)
 
-    if tags:
-        for tag in tags:
-            escaped_tag = tag.replace('"', '""')
-            pattern = '%"' + escaped_tag + '"%'
-            count_statement = count_statement.where(
-                cast(Prompt.tags, type_=String).like(pattern)
-            )
-    if worksWith:
-        works_with_conditions = []
-        for tool in worksWith:
-            escaped_tool = tool.replace('"', '""')
-            pattern = '%"' + escaped_tool + '"%'
-            works_with_conditions.append(
-                cast(Prompt.worksWith, type_=String).like(pattern)
-            )
-        if works_with_conditions:
-            count_statement = count_statement.where(or_(*works_with_conditions))
-    total_count = session.exec(count_statement).one()
+# The tag list changes only when a prompt is written, and those writes go
+# through create_prompt / update_prompt / delete_prompt, which clear it; the
+# TTL bounds how long writes from elsewhere (seed.py) take to show up.
+_TAGS_CACHE_TTL_SECONDS = 300
+_tags_cache: tuple[float, list[str]] | None = None
 
-    # Apply pagination and ordering
-    statement = statement.order_by(Prompt.createdAt.desc()).offset(skip).limit(limit)
 
-    # Execute query
-    results = session.exec(statement).all()
-
-    return list(results), total_count
+def clear_tags_cache() -> None:
+    """Drop the cached get_all_tags result."""
+    global _tags_cache
+    _tags_cache = None
 
 
 def get_all_tags(session: Session) -> list[str]:
     """
-    Query all prompts and collect unique tags.
+    Collect the unique tags across all prompts.
 
     Args:
         session: SQLAlchemy database session
@@ -205,18 +357,32 @@ def get_all_tags(session: Session) -> list[str]:
     Returns:
         Sorted list of unique tags
     """
-    # Get all prompts
-    statement = select(Prompt)
-    results = session.exec(statement).all()
+    global _tags_cache
+    now = time.monotonic()
+    if _tags_cache is not None and now - _tags_cache[0] < _TAGS_CACHE_TTL_SECONDS:
+        return _tags_cache[1]
+
+    if session.get_bind().dialect.name == "postgresql":
+        # Unnest and de-duplicate in the database; only the tags come back
+        tag = func.jsonb_array_elements_text(Prompt.tags)
+        unique_tags = list(session.exec(select(tag).distinct().order_by(tag)).all())
+    else:
+        # Read just the tags column and union the lists here, streaming the
+        # rows in batches rather than materializing them all at once
+        tag_set = set()
+        statement = select(Prompt.tags).execution_options(yield_per=1000)
+        for prompt_tags in session.exec(statement):
+            if prompt_tags:
+                tag_set.update(prompt_tags)
+        unique_tags = sorted(tag_set)
+
+    _tags_cache = (now, unique_tags)
+    return unique_tags
 
-    # Collect all unique tags
-    unique_tags = set()
-    for prompt in results:
-        if prompt.tags:
-            unique_tags.update(prompt.tags)
 
-    # Return sorted list
-    return sorted(list(unique_tags))
+_SLUG_SEPARATOR_RE = re.compile(r"[\s_]+")
+_SLUG_INVALID_CHAR_RE = re.compile(r"[^a-z0-9-]")
+_SLUG_REPEATED_HYPHEN_RE = re.compile(r"-+")
 
 
 def slugify_title(title: str) -> str:
@@ -236,13 +402,13 @@ def slugify_title(title: str) -> str:
     slug = title.lower()
 
     # Replace spaces and underscores with hyphens
-    slug = re.sub(r"[\s_]+", "-", slug)
+    slug = _SLUG_SEPARATOR_RE.sub("-", slug)
 
     # Remove special characters except hyphens and alphanumeric
-    slug = re.sub(r"[^a-z0-9-]", "", slug)
+    slug = _SLUG_INVALID_CHAR_RE.sub("", slug)
 
     # Remove consecutive hyphens
-    slug = re.sub(r"-+", "-", slug)
+    slug = _SLUG_REPEATED_HYPHEN_RE.sub("-", slug)
 
     # Remove leading/trailing hyphens
     slug = slug.strip("-")
@@ -250,8 +416,37 @@ def slugify_title(title: str) -> str:
     return slug
 
 
+def _free_slug(session: Session, base_slug: str) -> str:
+    """
+    Return ``base_slug``, or ``base_slug-N`` with the lowest free N.
+
+    Fetches every taken slug of that shape in one query instead of probing
+    candidates one at a time.
+    """
+    taken = set(
+        session.exec(
+            select(Prompt.slug).where(
+                or_(
+                    Prompt.slug == base_slug,
+                    Prompt.slug.startswith(base_slug + "-", autoescape=True),
+                )
+            )
+        ).all()
+    )
+
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
 def create_prompt(
-    session: Session, prompt_create: PromptCreate, author_id: str | None = None
+    session: Session,
+    prompt_create: PromptCreate,
+    author_id: str | None = None,
+    flush_only: bool = False,
 ) -> Prompt:
     """
     Create a new prompt from PromptCreate schema.
@@ -263,6 +458,8 @@ def create_prompt(
         session: SQLAlchemy database session
         prompt_create: Pydantic schema with prompt data
         author_id: ID of the user creating the prompt
+        flush_only: Only flush the INSERT and leave committing to the caller,
+            so bulk loads can create many prompts in one transaction
 
     Returns:
         The created prompt
@@ -275,14 +472,10 @@ def create_prompt(
 
     # Ensure slug uniqueness
     base_slug = slug
-    counter = 1
-    while get_prompt_by_slug(session, slug) is not None:
-        slug = f"{base_slug}-{counter}"
-        counter += 1
 
     # Create new prompt instance (datetime and UUID handled by model defaults)
     prompt = Prompt(
-        slug=slug,
+        slug=_free_slug(session, base_slug),
         title=prompt_create.title,
         summary=prompt_create.summary,
 
@@ -297,10 +490,25 @@ def create_prompt(
         author_id=author_id,
     )
 
-    # Add to session, commit, and refresh
     session.add(prompt)
-    session.commit()
+    if flush_only:
+        # The row is already complete (ids and timestamps come from model
+        # defaults), so there is nothing to refresh
+        session.flush()
+        clear_tags_cache()
+        return prompt
+
+    # Commit and refresh
+    try:
+        session.commit()
+    except IntegrityError:
+        # Another request took the slug between the check and the insert
+        session.rollback()
+        prompt.slug = _free_slug(session, base_slug)
+        session.add(prompt)
+        session.commit()
     session.refresh(prompt)
+    clear_tags_cache()
 
     return prompt
 
@@ -329,17 +537,40 @@ def update_prompt(
     session.add(prompt)
     session.commit()
     session.refresh(prompt)
+    clear_tags_cache()
 
     return prompt
 
 
-from sqlalchemy.orm import joinedload
+def adjust_prompt_counter(
+    session: Session, prompt_id: str, counter: str, delta: int
+) -> int | None:
+    """
+    Add ``delta`` to one of a prompt's cached counters, in place.
+
+    One UPDATE ... RETURNING, without loading the prompt; decrements stop at
+    zero. updatedAt is left alone, as it only tracks content edits. The
+    caller commits.
+
+    Returns:
+        The new value, or None if nothing changed (no such prompt, or the
+        counter was already zero)
+    """
+    column = getattr(Prompt, counter)
+    statement = update(Prompt).where(Prompt.id == prompt_id)
+    if delta < 0:
+        statement = statement.where(column >= -delta)
+    return session.exec(
+        statement.values({column: func.coalesce(column, 0) + delta}).returning(column)
+    ).scalar_one_or_none()
+
 
 def get_comments_for_prompt(session: Session, prompt_id: str) -> list[Comment]:
     statement = (
         select(Comment)
         .where(Comment.prompt_id == prompt_id)
-        .options(joinedload(Comment.author))
+        # Authors in one extra SELECT ... IN, not repeated on every comment row
+        .options(selectinload(Comment.author))
         .order_by(Comment.createdAt.asc())
     )
     return list(session.exec(statement).all())
@@ -350,47 +581,29 @@ def create_comment(
 ) -> Comment:
     comment = Comment(prompt_id=prompt_id, author_id=author_id, body=body)
     session.add(comment)
-    
-    # Increment prompt comment count
-    from apps.api.models import Prompt
-    prompt = session.get(Prompt, prompt_id)
-    if prompt:
-        prompt.comment_count = (prompt.comment_count or 0) + 1
-        session.add(prompt)
-    
+
+    # Increment prompt comment count in place, without loading the prompt
+    adjust_prompt_counter(session, prompt_id, "comment_count", 1)
+
     session.commit()
     session.refresh(comment)
     return comment
 
 
 def get_comment_by_id(session: Session, comment_id: str) -> Comment | None:
-    statement = select(Comment).where(Comment.id == comment_id)
-    return session.exec(statement).first()
+    if not is_valid_id(comment_id):
+        return None
+    return session.get(Comment, comment_id)
 
 
 def delete_comment(session: Session, comment: Comment) -> None:
-    # Decrement prompt comment count
-    from apps.api.models import Prompt
-    prompt = session.get(Prompt, comment.prompt_id)
-    if prompt and prompt.comment_count and prompt.comment_count > 0:
-        prompt.comment_count -= 1
-        session.add(prompt)
-    
+    # Decrement prompt comment count in place, never below zero
+    adjust_prompt_counter(session, comment.prompt_id, "comment_count", -1)
+
     session.delete(comment)
     session.commit()
 
 
-def get_like(
-    session: Session, *, user_id: str, target_type: str, target_id: str
-) -> Like | None:
-    statement = select(Like).where(
-        Like.user_id == user_id,
-        Like.target_type == target_type,
-        Like.target_id == target_id,
-    )
-    return session.exec(statement).first()
-
-
 def like_target(
     session: Session, *, user_id: str, target_type: str, target_id: str
 ) -> bool:
@@ -411,18 +624,15 @@ def unlike_target(
 ) -> bool:
     """Ensure a like is removed. Returns True if a like was deleted."""
 
-    like = get_like(
-        session,
-        user_id=user_id,
-        target_type=target_type,
-        target_id=target_id,
+    result = session.exec(
+        delete(Like).where(
+            Like.user_id == user_id,
+            Like.target_type == target_type,
+            Like.target_id == target_id,
+        )
     )
-    if not like:
-        return False
-
-    session.delete(like)
     session.commit()
-    return True
+    return result.rowcount > 0
 
 
 def delete_prompt(session: Session, prompt: Prompt) -> None:
@@ -435,16 +645,7 @@ def delete_prompt(session: Session, prompt: Prompt) -> None:
     """
     session.delete(prompt)
     session.commit()
-
-
-from apps.api.models import Save
-
-def get_save(session: Session, *, user_id: str, prompt_id: str) -> Save | None:
-    statement = select(Save).where(
-        Save.user_id == user_id,
-        Save.prompt_id == prompt_id,
-    )
-    return session.exec(statement).first()
+    clear_tags_cache()
 
 
 def save_prompt(session: Session, *, user_id: str, prompt_id: str) -> bool:
@@ -461,29 +662,58 @@ def save_prompt(session: Session, *, user_id: str, prompt_id: str) -> bool:
 
 def unsave_prompt(session: Session, *, user_id: str, prompt_id: str) -> bool:
     """Ensure a bookmark (save) is removed. Returns True if removed."""
-    save = get_save(session, user_id=user_id, prompt_id=prompt_id)
-    if not save:
-        return False
-
-    session.delete(save)
+    result = session.exec(
+        delete(Save).where(Save.user_id == user_id, Save.prompt_id == prompt_id)
+    )
     session.commit()
-    return True
+    return result.rowcount > 0
 
 
 # Subscription CRUD
 
 def get_subscription_by_user(session: Session, user_id: str) -> Subscription | None:
-    """Get subscription for a user."""
-    statement = select(Subscription).where(Subscription.user_id == user_id)
+    """Get a user's live subscription, or their most recent one."""
+    statement = (
+        select(Subscription)
+        .where(Subscription.user_id == user_id)
+        .order_by(
+            Subscription.status.in_(LIVE_SUBSCRIPTION_STATUSES).desc(),
+            Subscription.created_at.desc(),
+        )
+    )
     return session.exec(statement).first()
 
 
+# Stripe subscription ID -> row id. A row's Stripe ID never changes, so
+# entries can't go stale; a deleted row just misses in session.get().
+# Webhook handlers look the same subscription up more than once per
+# session, and with the id known the repeats are identity-map hits.
+_SUBSCRIPTION_ID_CACHE_SIZE = 5000
+_subscription_ids: dict[str, str] = {}
+
+
+def clear_subscription_id_cache() -> None:
+    """Drop all cached Stripe subscription ID lookups."""
+    _subscription_ids.clear()
+
+
 def get_subscription_by_stripe_id(session: Session, stripe_id: str) -> Subscription | None:
     """Get subscription by Stripe subscription ID."""
+    subscription_id = _subscription_ids.get(stripe_id)
+    if subscription_id is not None:
+        subscription = session.get(Subscription, subscription_id)
+        if subscription is not None:
+            return subscription
+
     statement = select(Subscription).where(
         Subscription.stripe_subscription_id == stripe_id
     )
-    return session.exec(statement).first()
+    subscription = session.exec(statement).first()
+    if subscription is not None:
+        if len(_subscription_ids) >= _SUBSCRIPTION_ID_CACHE_SIZE:
+            _subscription_ids.clear()
+        _subscription_ids[stripe_id] = subscription.id
+    return subscription
 
 
 def create_or_update_subscription(
@@ -496,17 +726,30 @@ def create_or_update_subscription(
     current_period_end: datetime,
     plan_id: str = "premium_monthly",
 ) -> Subscription:
-    """Create or update a subscription."""
-    subscription = get_subscription_by_user(session, user_id)
+    """Create or update the row for a Stripe subscription."""
+    subscription = get_subscription_by_stripe_id(session, stripe_subscription_id)
+
+    if status in LIVE_SUBSCRIPTION_STATUSES:
+        # A user has at most one live subscription (uq_subscription_user_active).
+        # Stripe can report a new subscription before the old one ends, so the
+        # latest live one wins: end the user's others in this transaction,
+        # before this row's change is flushed.
+        session.exec(
+            update(Subscription)
+            .where(
+                Subscription.user_id == user_id,
+                Subscription.stripe_subscription_id != stripe_subscription_id,
+                Subscription.status.in_(LIVE_SUBSCRIPTION_STATUSES),
+            )
+            .values(status="canceled")
+        )
 
     if subscription:
-        subscription.stripe_subscription_id = stripe_subscription_id
         subscription.stripe_customer_id = stripe_customer_id
         subscription.status = status
         subscription.current_period_start = current_period_start
         subscription.current_period_end = current_period_end
         subscription.plan_id = plan_id
-        subscription.updated_at = datetime.utcnow()
     else:
         subscription = Subscription(
             user_id=user_id,
@@ -526,13 +769,11 @@ def create_or_update_subscription(
 
 def cancel_subscription(session: Session, subscription_id: str) -> Subscription:
     """Cancel a subscription."""
-    statement = select(Subscription).where(Subscription.id == subscription_id)
-    subscription = session.exec(statement).first()
+    subscription = session.get(Subscription, subscription_id)
 
     if subscription:
         subscription.status = "canceled"
         subscription.cancel_at_period_end = True
-        subscription.updated_at = datetime.utcnow()
         session.add(subscription)
         session.commit()
         session.refresh(subscription)
@@ -552,7 +793,7 @@ def get_billing_month_start(date: datetime | None = None) -> datetime:
 def count_copies_this_month(session: Session, user_id: str) -> int:
     """Count total copies a user has made this month."""
     billing_month = get_billing_month_start()
-    statement = select(func.count(FlowCopy.id)).where(
+    statement = select(func.count()).where(
         FlowCopy.user_id == user_id,
         FlowCopy.billing_month == billing_month,
         FlowCopy.counted_for_payout == True
@@ -579,12 +820,56 @@ def has_copied_this_month(
 ) -> bool:
     """Check if user has already copied this flow this month."""
     billing_month = get_billing_month_start()
-    statement = select(FlowCopy).where(
-        FlowCopy.user_id == user_id,
-        FlowCopy.flow_id == flow_id,
-        FlowCopy.billing_month == billing_month
+    # Only columns of ix_flow_copies_user_month_flow, so this is an index-only
+    # probe; EXISTS stops at the first match and returns just a boolean.
+    statement = select(
+        exists().where(
+            FlowCopy.user_id == user_id,
+            FlowCopy.flow_id == flow_id,
+            FlowCopy.billing_month == billing_month
+        )
     )
-    return session.exec(statement).first() is not None
+    return session.exec(statement).one()
+
+
+# Billing months whose flow_copies partitions this process has already
+# ensured, so the check costs one query per month rather than one per copy.
+_partitioned_months: set[datetime] = set()
+
+
+def ensure_flow_copy_partitions(bind, billing_month: datetime) -> None:
+    """
+    Make sure flow_copies has partitions for ``billing_month`` and the month after.
+
+    Runs in its own short transaction, so the lock that creating a partition
+    takes on flow_copies is not held for the rest of the caller's work. That
+    lock waits for every open transaction that has read flow_copies, so call
+    this before the caller's own session touches the table. If
+    flow_copies_default already holds copies for a month (e.g. recorded by a
+    script that skipped this check), flow_copies_ensure_partition
+    leaves that month in the default partition: reads stay correct, they just
+    don't prune. Moving such a month out means detaching the default
+    partition, creating the month's partition, moving the rows across and
+    reattaching the default, which is left to a manual maintenance step.
+    No-op outside PostgreSQL.
+    """
+    if bind.dialect.name != "postgresql" or billing_month in _partitioned_months:
+        return
+
+    with bind.begin() as conn:
+        # Serialize with other processes ensuring the same month, so only one
+        # of them creates each partition
+        conn.execute(text(
+            "SELECT pg_advisory_xact_lock(hashtext('flow_copies_ensure_partition'))"
+        ))
+        conn.execute(
+            text(
+                "SELECT flow_copies_ensure_partition(:month),"
+                " flow_copies_ensure_partition(:month + interval '1 month')"
+            ),
+            {"month": billing_month},
+        )
+    _partitioned_months.add(billing_month)
 
 
 def record_flow_copy(
@@ -597,23 +882,30 @@ def record_flow_copy(
     """Record a flow copy event (append-only log)."""
     billing_month = get_billing_month_start()
 
-    # Check if already copied
-    if has_copied_this_month(session, user_id, flow_id):
-        raise ValueError(
-            f"User {user_id} has already copied Flow {flow_id} this month"
-        )
-
-    copy = FlowCopy(
+    # Building the row through the model fills in id and copied_at
+    values = FlowCopy(
         user_id=user_id,
         flow_id=flow_id,
         creator_id=creator_id,
         billing_month=billing_month,
         counted_for_payout=counted_for_payout,
-    )
+    ).model_dump()
+
+    # One round trip: a repeat copy this month hits
+    # ix_flow_copies_user_month_flow and inserts (and returns) nothing
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    copy = session.exec(
+        insert(FlowCopy)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["user_id", "billing_month", "flow_id"])
+        .returning(FlowCopy)
+    ).scalar_one_or_none()
+    if copy is None:
+        raise ValueError(
+            f"User {user_id} has already copied Flow {flow_id} this month"
+        )
 
-    session.add(copy)
     session.commit()
-    session.refresh(copy)
     return copy
 
 
@@ -667,28 +959,46 @@ def update_payout_status(
     stripe_transfer_id: str | None = None,
 ) -> CreatorPayout:
     """Update payout status."""
-    statement = select(CreatorPayout).where(CreatorPayout.id == payout_id)
-    payout = session.exec(statement).first()
+    # Locked so concurrent updates can't both count the same payout as paid;
+    # taking the lock always costs a SELECT, even for an already loaded row.
+    # populate_existing makes that SELECT overwrite a loaded row, so was_paid
+    # is the status under the lock, not one from before another session's
+    # commit (sessions don't expire on commit).
+    payout = session.get(
+        CreatorPayout, payout_id, with_for_update=True, populate_existing=True
+    )
 
     if payout:
+        was_paid = payout.status == "paid"
         payout.status = status
         if stripe_transfer_id:
             payout.stripe_transfer_id = stripe_transfer_id
         if status == "paid":
             payout.paid_at = datetime.utcnow()
-        payout.updated_at = datetime.utcnow()
         session.add(payout)
+
+        # Keep the creator's running total in step with their paid payouts
+        earned = 0
+        if status == "paid" and not was_paid:
+            earned = payout.amount_cents
+        elif was_paid and status != "paid":
+            earned = -payout.amount_cents
+        if earned:
+            session.exec(
+                update(User)
+                .where(User.id == payout.creator_id)
+                .values(total_earnings_cents=User.total_earnings_cents + earned)
+            )
+
         session.commit()
         session.refresh(payout)
+        if earned:
+            clear_user_cache()
 
     return payout
 
 
 def get_total_earnings(session: Session, creator_id: str) -> int:
     """Get total earnings in cents for a creator (from paid payouts)."""
-    statement = select(func.sum(CreatorPayout.amount_cents)).where(
-        CreatorPayout.creator_id == creator_id,
-        CreatorPayout.status == "paid"
-    )
-    total = session.exec(statement).one()
-    return total or 0
+    statement = select(User.total_earnings_cents).where(User.id == creator_id)
+    return session.exec(statement).first() or 0
@@ -1,8 +1,14 @@
 import os
+import sqlite3
 from typing import Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
+from apps.api.crud import ensure_flow_copy_partitions, get_billing_month_start
 from apps.api.models import (
     Prompt,
     User,
@@ -33,18 +39,57 @@ else:
 
 if "sqlite" in database_url:
     connect_args = {"check_same_thread": False}
-    engine = create_engine(database_url, connect_args=connect_args, echo=False)
+    # Every new connection to :memory: opens an empty database of its own;
+    # StaticPool keeps one connection so all sessions see the same tables.
+    pool_kwargs = {"poolclass": StaticPool} if ":memory:" in database_url else {}
+    engine = create_engine(
+        database_url, connect_args=connect_args, echo=False, **pool_kwargs
+    )
 else:
-    engine = create_engine(database_url, echo=False)
+    # Pin the session time zone: naive datetime.utcnow() values written to
+    # timestamptz columns must be read as UTC, whatever the server default.
+    connect_args = {"options": "-c timezone=UTC"}
+    # Keep warm connections around so requests don't pay for a new
+    # connection (TCP, TLS, auth) each time; pre-ping replaces ones the
+    # server has closed before handing them out.
+    engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
+
+# SQLite only enforces foreign keys, and so ON DELETE CASCADE, when switched on
+# for each connection. Listening on the Engine class covers engines installed
+# with set_test_engine as well as the default one.
+@event.listens_for(Engine, "connect")
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# A session lives for one request, so objects can't go stale between
+# commits; keeping their loaded state saves a SELECT per object touched
+# after a commit. Values the database changes itself (e.g. trigger-
+# maintained like_count) are refreshed explicitly where they're read.
+SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
 # Allow overriding the engine for testing
 _test_engine = None
 
 
 def set_test_engine(test_engine):
-    """Set the test engine for testing."""
+    """Set the test engine for testing (None restores the default engine)."""
     global _test_engine
     _test_engine = test_engine
+    SessionLocal.configure(bind=get_engine())
 
 
 def get_engine():
@@ -56,13 +101,12 @@ def get_engine():
 def init_db() -> None:
     """Initialize the database with all tables."""
     SQLModel.metadata.create_all(engine)
+    # flow_copies is partitioned by billing month; have this month's and
+    # next month's partitions in place before copies arrive.
+    ensure_flow_copy_partitions(engine, get_billing_month_start())
 
 
 def get_session() -> Generator[Session, None, None]:
     """Dependency for getting a database session."""
-    current_engine = get_engine()
-    session = Session(current_engine)
-    try:
+    with SessionLocal() as session:
         yield session
-    finally:
-        session.close()
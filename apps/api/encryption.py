@@ -4,7 +4,10 @@ Encryption Service for Credential Vault.
 Uses AES-256-GCM encryption via the cryptography library.
 """
 
+import base64
+import binascii
 import os
+from functools import lru_cache
 from typing import Tuple
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -12,6 +15,21 @@ from cryptography.hazmat.backends import default_backend
 
 from settings import settings
 
+# GCM nonce and authentication tag sizes, in bytes
+IV_SIZE = 12
+AUTH_TAG_SIZE = 16
+
+
+@lru_cache(maxsize=32)
+def _build_aesgcm(encryption_key: str) -> AESGCM:
+    """
+    Build the AES-GCM cipher for a hex key.
+
+    Cached per key, so every EncryptionService built with the same key
+    shares one cipher and its expanded key schedule.
+    """
+    return AESGCM(bytes.fromhex(encryption_key))
+
 
 class EncryptionService:
     """Service for encrypting and decrypting sensitive credential data."""
@@ -35,7 +53,7 @@ class EncryptionService:
                 f"Encryption key must be 32 bytes (64 hex chars), got {len(self.key)} bytes"
             )
 
-        self.aesgcm = AESGCM(self.key)
+        self.aesgcm = _build_aesgcm(encryption_key)
 
     def encrypt(self, plaintext: str) -> str:
         """
@@ -45,34 +63,49 @@ class EncryptionService:
             plaintext: Text to encrypt
 
         Returns:
-            Encrypted string in format: iv:auth_tag:encrypted_content
-            (all hex-encoded)
+            Encrypted string: URL-safe base64 of iv + encrypted_content + auth_tag
         """
         # Generate a random 12-byte IV (nonce) for GCM
-        iv = os.urandom(12)
+        iv = os.urandom(IV_SIZE)
 
-        # Encrypt the plaintext (must be bytes)
-        plaintext_bytes = plaintext.encode("utf-8")
-        ciphertext = self.aesgcm.encrypt(iv, plaintext_bytes, None)
+        return self._seal(iv, plaintext)
 
-        # Split into ciphertext (first part) and auth tag (last 16 bytes)
-        # GCM appends the auth tag to the ciphertext
-        auth_tag = ciphertext[-16:]
-        encrypted_content = ciphertext[:-16]
+    def encrypt_many(self, plaintexts: list[str]) -> list[str]:
+        """
+        Encrypt several plaintexts using AES-256-GCM, each under its own IV.
 
-        # Encode to hex and combine with colons
-        iv_hex = iv.hex()
-        auth_tag_hex = auth_tag.hex()
-        encrypted_hex = encrypted_content.hex()
+        Same result as calling encrypt() on each, but all the IVs come from a
+        single read of the OS random source.
 
-        return f"{iv_hex}:{auth_tag_hex}:{encrypted_hex}"
+        Args:
+            plaintexts: Texts to encrypt
+
+        Returns:
+            Encrypted strings, in the same order as ``plaintexts``
+        """
+        ivs = os.urandom(IV_SIZE * len(plaintexts))
+
+        return [
+            self._seal(ivs[i * IV_SIZE:(i + 1) * IV_SIZE], plaintext)
+            for i, plaintext in enumerate(plaintexts)
+        ]
+
+    def _seal(self, iv: bytes, plaintext: str) -> str:
+        """Encrypt ``plaintext`` under ``iv`` and encode the result for storage."""
+        # Encrypt the plaintext (must be bytes); GCM appends the auth tag
+        # to the ciphertext, so the two are stored together as they come
+        plaintext_bytes = plaintext.encode("utf-8")
+        ciphertext = self.aesgcm.encrypt(iv, plaintext_bytes, None)
+
+        return base64.urlsafe_b64encode(iv + ciphertext).decode("ascii")
 
     def decrypt(self, encrypted_text: str) -> str:
         """
         Decrypt ciphertext using AES-256-GCM.
 
         Args:
-            encrypted_text: Encrypted string in format: iv:auth_tag:encrypted_content
+            encrypted_text: Encrypted string as returned by encrypt(), or in the
+                older iv:auth_tag:encrypted_content hex format
 
         Returns:
             Decrypted plaintext string
@@ -81,30 +114,39 @@ class EncryptionService:
             ValueError: If format is invalid or decryption fails
         """
         try:
-            # Parse the encrypted string
+            raw = self._decode(encrypted_text)
+
+            # Decrypt (the ciphertext still carries its auth tag)
+            plaintext_bytes = self.aesgcm.decrypt(raw[:IV_SIZE], raw[IV_SIZE:], None)
+
+            return plaintext_bytes.decode("utf-8")
+
+        except Exception as e:
+            raise ValueError(f"Decryption failed: {str(e)}") from e
+
+    @staticmethod
+    def _decode(encrypted_text: str) -> bytes:
+        """Unpack an encrypted string into iv + encrypted_content + auth_tag bytes."""
+        if ":" in encrypted_text:
+            # Hex format written before Alembic revision b3d5f7a9c1e4 recoded
+            # the vault; rows written by older deployments may still use it
             parts = encrypted_text.split(":")
             if len(parts) != 3:
                 raise ValueError(
                     "Invalid encrypted format. Expected: iv:auth_tag:encrypted_content"
                 )
-
             iv_hex, auth_tag_hex, encrypted_hex = parts
+            return bytes.fromhex(iv_hex) + bytes.fromhex(encrypted_hex) + bytes.fromhex(auth_tag_hex)
 
-            # Decode from hex
-            iv = bytes.fromhex(iv_hex)
-            auth_tag = bytes.fromhex(auth_tag_hex)
-            encrypted_content = bytes.fromhex(encrypted_hex)
-
-            # Reconstruct the ciphertext with auth tag
-            ciphertext = encrypted_content + auth_tag
-
-            # Decrypt
-            plaintext_bytes = self.aesgcm.decrypt(iv, ciphertext, None)
-
-            return plaintext_bytes.decode("utf-8")
-
-        except Exception as e:
-            raise ValueError(f"Decryption failed: {str(e)}") from e
+        try:
+            raw = base64.urlsafe_b64decode(encrypted_text)
+        except binascii.Error:
+            raw = b""
+        if len(raw) < IV_SIZE + AUTH_TAG_SIZE:
+            raise ValueError(
+                "Invalid encrypted format. Expected: base64 of iv + encrypted_content + auth_tag"
+            )
+        return raw
 
 
 # Singleton instance
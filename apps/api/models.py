@@ -1,22 +1,70 @@
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import JSON, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, JSON, DateTime, Enum, Index, SmallInteger, String, UniqueConstraint, event, func, text
+from sqlalchemy.dialects.postgresql import CITEXT, JSONB, UUID
 import uuid
 from datetime import datetime
+from typing import Optional
+
+# Name constraints the way Postgres names unnamed ones, so tables built by
+# create_all, by the Alembic revisions and by autogenerate all agree.
+SQLModel.metadata.naming_convention = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "%(table_name)s_%(column_0_name)s_key",
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+    "pk": "%(table_name)s_pkey",
+}
+
+
+def _updated_at_column_kwargs() -> dict:
+    """Column options for a last-updated timestamp the database maintains.
+
+    Every UPDATE (ORM flush or Core) sets it to now() on the server, so
+    callers don't assign it and it follows database time.
+    """
+    return {"server_default": func.now(), "onupdate": func.now()}
+
+
+# Prompt list columns: JSONB on PostgreSQL, plain JSON elsewhere (SQLite).
+PROMPT_LIST_TYPE = JSONB().with_variant(JSON(), "sqlite")
+
+# Ids and the columns referencing them: native uuid on PostgreSQL, as the
+# migrations create them, but still handled as strings by the application.
+ID_TYPE = UUID(as_uuid=False).with_variant(String(), "sqlite")
+
+
+def is_valid_id(value: str) -> bool:
+    """Whether ``value`` can be an id; Postgres rejects non-UUID input outright.
+
+    Lookups by an id taken from a request check this first and treat a
+    malformed id as not found.
+    """
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
 
 
 class Prompt(SQLModel, table=True):
     """Database model for prompts."""
 
     __tablename__ = "prompts"
+    __table_args__ = (
+        # Covers id so slug -> id lookups are answered from the index alone.
+        Index("ix_prompts_slug", "slug", unique=True, postgresql_include=["id"]),
+        # get_prompts filters tags with @> and worksWith with ?|
+        Index("ix_prompts_tags_gin", "tags", postgresql_using="gin"),
+        Index("ix_prompts_works_with_gin", "worksWith", postgresql_using="gin"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
         description="Unique identifier (UUID)",
+        sa_type=ID_TYPE,
     )
 
-    slug: str = Field(unique=True, index=True, max_length=255)
+    slug: str = Field(max_length=255)
 
     title: str = Field(max_length=500)
 
@@ -25,22 +73,23 @@ class Prompt(SQLModel, table=True):
     # Type: 'prompt' or 'discussion'
     type: str = Field(default="prompt", index=True, max_length=20)
 
-    # JSON fields for arrays - using SQLAlchemy Column with JSON type
+    # JSON fields for arrays - JSONB on PostgreSQL (as created by the
+    # migrations), so they can be indexed and queried by containment
     worksWith: list[str] = Field(
         default_factory=list,
-        sa_column=Column(JSON),
+        sa_column=Column(PROMPT_LIST_TYPE),
         description="List of compatible tools/browsers",
     )
 
     tags: list[str] = Field(
         default_factory=list,
-        sa_column=Column(JSON),
+        sa_column=Column(PROMPT_LIST_TYPE),
         description="List of tags for categorization",
     )
 
     targetSites: list[str] = Field(
         default_factory=list,
-        sa_column=Column(JSON),
+        sa_column=Column(PROMPT_LIST_TYPE),
         description="List of target websites",
     )
 
@@ -48,7 +97,7 @@ class Prompt(SQLModel, table=True):
 
     steps: list[str] = Field(
         default_factory=list,
-        sa_column=Column(JSON),
+        sa_column=Column(PROMPT_LIST_TYPE),
         description="Step-by-step instructions",
     )
 
@@ -58,14 +107,19 @@ class Prompt(SQLModel, table=True):
         default=None,
         foreign_key="users.id",
         description="ID of the user who created this prompt",
+        sa_type=ID_TYPE,
     )
 
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
     )
 
+    # Set by update_prompt on content edits only, so counter updates (likes,
+    # saves, comments, copies) don't reorder "recently updated" prompts
     updatedAt: datetime = Field(
-        default_factory=datetime.utcnow, description="Last update timestamp"
+        default_factory=datetime.utcnow,
+        description="Last update timestamp",
+        sa_column_kwargs={"server_default": func.now()},
     )
 
     like_count: int = Field(default=0, description="Number of likes")
@@ -83,6 +137,46 @@ class Prompt(SQLModel, table=True):
     price: int = Field(default=0, description="Price in cents (0 = free)")
     currency: str = Field(default="usd", max_length=3)
 
+    @classmethod
+    def summary_columns(cls) -> tuple:
+        """Columns shown in prompt lists: everything but promptText and notes."""
+        return (
+            cls.id,
+            cls.slug,
+            cls.title,
+            cls.summary,
+            cls.type,
+            cls.worksWith,
+            cls.tags,
+            cls.targetSites,
+            cls.steps,
+            cls.author_id,
+            cls.createdAt,
+            cls.updatedAt,
+            cls.like_count,
+            cls.saves_count,
+            cls.comment_count,
+            cls.price,
+            cls.currency,
+        )
+
+
+# Full-text index behind the get_prompts ``q`` search (installed for existing
+# databases by Alembic revision 6e1a3c5b7d92). The expression must match
+# crud._prompt_search_vector() exactly for the planner to use it.
+event.listen(
+    Prompt.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE INDEX ix_prompts_fts ON prompts USING gin (
+            to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary, '')
+                || ' ' || coalesce("promptText", ''))
+        )
+        """
+    ).execute_if(dialect="postgresql"),
+)
+
 
 class OAuthAccount(SQLModel, table=True):
     """Database model for OAuth accounts linked to a user."""
@@ -96,12 +190,14 @@ class OAuthAccount(SQLModel, table=True):
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
         description="Unique identifier (UUID)",
+        sa_type=ID_TYPE,
     )
 
     user_id: str = Field(
         foreign_key="users.id",
         index=True,
         description="User ID owning this OAuth account",
+        sa_type=ID_TYPE,
     )
 
     provider: str = Field(index=True, max_length=32)
@@ -119,23 +215,28 @@ class Comment(SQLModel, table=True):
     """Forum comment attached to a prompt."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_prompt_created", "prompt_id", "createdAt"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
         description="Unique identifier (UUID)",
+        sa_type=ID_TYPE,
     )
 
     prompt_id: str = Field(
         foreign_key="prompts.id",
-        index=True,
         description="Prompt ID this comment belongs to",
+        sa_type=ID_TYPE,
     )
 
     author_id: str = Field(
         foreign_key="users.id",
         index=True,
         description="User ID who wrote the comment",
+        sa_type=ID_TYPE,
     )
 
     body: str = Field(description="Comment body")
@@ -156,38 +257,174 @@ class Like(SQLModel, table=True):
         UniqueConstraint(
             "user_id", "target_type", "target_id", name="uq_like_user_target"
         ),
+        Index(
+            "ix_likes_prompt_target",
+            "target_id",
+            postgresql_where=text("target_type = 'prompt'"),
+        ),
+        Index(
+            "ix_likes_comment_target",
+            "target_id",
+            postgresql_where=text("target_type = 'comment'"),
+        ),
     )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
         description="Unique identifier (UUID)",
+        sa_type=ID_TYPE,
     )
 
-    user_id: str = Field(foreign_key="users.id", index=True)
-    target_type: str = Field(index=True, max_length=16)  # prompt | comment
-    target_id: str = Field(index=True)
+    user_id: str = Field(foreign_key="users.id", sa_type=ID_TYPE)
+    target_type: str = Field(
+        max_length=16, sa_type=Enum("prompt", "comment", name="target_type")
+    )
+    target_id: str = Field(sa_type=ID_TYPE)
 
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
     )
 
 
+# prompts.like_count / comments.like_count are maintained by triggers on likes
+# (installed for existing databases by Alembic revision 7a3e5c1b9f60).
+# On Postgres the trigger is deferred to commit, so the counter row is locked
+# only briefly at the end of the liking transaction.
+for _ddl in (
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION likes_tick() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.target_type = 'prompt' THEN
+                    UPDATE prompts SET like_count = like_count + 1 WHERE id = NEW.target_id;
+                ELSE
+                    UPDATE comments SET like_count = like_count + 1 WHERE id = NEW.target_id;
+                END IF;
+                RETURN NEW;
+            END IF;
+            IF OLD.target_type = 'prompt' THEN
+                UPDATE prompts SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.target_id;
+            ELSE
+                UPDATE comments SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.target_id;
+            END IF;
+            RETURN OLD;
+        END
+        $$
+        """
+    ).execute_if(dialect="postgresql"),
+    DDL(
+        """
+        CREATE CONSTRAINT TRIGGER likes_tick
+        AFTER INSERT OR DELETE ON likes
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION likes_tick()
+        """
+    ).execute_if(dialect="postgresql"),
+    DDL(
+        """
+        CREATE TRIGGER likes_tick_insert AFTER INSERT ON likes
+        BEGIN
+            UPDATE prompts SET like_count = like_count + 1
+            WHERE NEW.target_type = 'prompt' AND id = NEW.target_id;
+            UPDATE comments SET like_count = like_count + 1
+            WHERE NEW.target_type = 'comment' AND id = NEW.target_id;
+        END
+        """
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        """
+        CREATE TRIGGER likes_tick_delete AFTER DELETE ON likes
+        BEGIN
+            UPDATE prompts SET like_count = MAX(like_count - 1, 0)
+            WHERE OLD.target_type = 'prompt' AND id = OLD.target_id;
+            UPDATE comments SET like_count = MAX(like_count - 1, 0)
+            WHERE OLD.target_type = 'comment' AND id = OLD.target_id;
+        END
+        """
+    ).execute_if(dialect="sqlite"),
+):
+    event.listen(Like.__table__, "after_create", _ddl)
+
+
+CaseInsensitiveString = String(255).with_variant(CITEXT(), "postgresql")
+
+# citext is an extension; the migrations install it, and create_all needs it
+# before the users table too.
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext").execute_if(dialect="postgresql"),
+)
+
+# timestamptz on PostgreSQL; the application writes naive UTC values, which
+# db.py makes the server read as UTC.
+Timestamp = DateTime(timezone=True)
+
+# Bits of User.flags.
+USER_ACTIVE = 1
+USER_SUPERUSER = 2
+USER_SELLER = 4
+
+USER_FLAGS = {
+    "is_active": USER_ACTIVE,
+    "is_superuser": USER_SUPERUSER,
+    "is_seller": USER_SELLER,
+}
+
+
+def _flag_property(bit: int, doc: str) -> property:
+    """Expose one bit of ``flags`` as a read/write boolean attribute."""
+
+    def getter(self) -> bool:
+        return bool(self.flags & bit)
+
+    def setter(self, value: bool) -> None:
+        self.flags = self.flags | bit if value else self.flags & ~bit
+
+    return property(getter, setter, doc=doc)
+
+
 class User(SQLModel, table=True):
     """Database model for users."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Only users who have been through Stripe have these ids, so the
+        # indexes leave out the (mostly) NULL rows.
+        Index(
+            "ix_users_stripe_customer",
+            "stripe_customer_id",
+            postgresql_where=text("stripe_customer_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_users_stripe_connect",
+            "stripe_connect_id",
+            postgresql_where=text("stripe_connect_id IS NOT NULL"),
+        ),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
         description="Unique identifier (UUID)",
+        sa_type=ID_TYPE,
+    )
+    # citext on Postgres: the unique indexes also serve case-insensitive lookups
+    email: str = Field(
+        unique=True, index=True, max_length=255, sa_type=CaseInsensitiveString
+    )
+    username: str = Field(
+        unique=True, index=True, max_length=255, sa_type=CaseInsensitiveString
     )
-    email: str = Field(unique=True, index=True, max_length=255)
-    username: str = Field(unique=True, index=True, max_length=255)
     hashed_password: str = Field()
-    is_active: bool = Field(default=True)
-    is_superuser: bool = Field(default=False)
+    # is_active / is_superuser / is_seller packed into one column (USER_* bits)
+    flags: int = Field(
+        default=USER_ACTIVE,
+        sa_column=Column(SmallInteger, nullable=False, server_default=text("1")),
+    )
 
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
@@ -196,7 +433,7 @@ class User(SQLModel, table=True):
 
     # Subscription fields
     stripe_customer_id: str | None = Field(
-        default=None, index=True, description="Stripe Customer ID for subscriptions"
+        default=None, description="Stripe Customer ID for subscriptions"
     )
     is_creator: bool = Field(
         default=False, description="Whether the user is a content creator"
@@ -204,12 +441,25 @@ class User(SQLModel, table=True):
 
     # Marketplace fields (creator payouts)
     stripe_connect_id: str | None = Field(
-        default=None, index=True, description="Stripe Connect Account ID"
+        default=None, description="Stripe Connect Account ID"
     )
-    is_seller: bool = Field(
-        default=False, description="Whether the user has enabled selling"
+    # Sum of the user's paid payouts, kept by crud.update_payout_status
+    total_earnings_cents: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": text("0")},
+        description="Lifetime paid payouts in cents",
     )
 
+    is_active = _flag_property(USER_ACTIVE, "Whether the account may sign in")
+    is_superuser = _flag_property(USER_SUPERUSER, "Whether the user is an admin")
+    is_seller = _flag_property(USER_SELLER, "Whether the user has enabled selling")
+
+    def __init__(self, **data):
+        flag_values = {name: data.pop(name) for name in USER_FLAGS if name in data}
+        super().__init__(**data)
+        for name, value in flag_values.items():
+            setattr(self, name, value)
+
 
 class Save(SQLModel, table=True):
     """A user's bookmark of a prompt."""
@@ -217,14 +467,16 @@ class Save(SQLModel, table=True):
     __tablename__ = "saves"
     __table_args__ = (
         UniqueConstraint("user_id", "prompt_id", name="uq_save_user_prompt"),
+        Index("ix_saves_user_created", "user_id", text('"createdAt" DESC')),
     )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
-    user_id: str = Field(foreign_key="users.id", index=True)
-    prompt_id: str = Field(foreign_key="prompts.id", index=True)
+    user_id: str = Field(foreign_key="users.id", sa_type=ID_TYPE)
+    prompt_id: str = Field(foreign_key="prompts.id", index=True, sa_type=ID_TYPE)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -236,10 +488,11 @@ class Purchase(SQLModel, table=True):
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
-    buyer_id: str = Field(foreign_key="users.id", index=True)
-    seller_id: str = Field(foreign_key="users.id", index=True)
-    prompt_id: str = Field(foreign_key="prompts.id", index=True)
+    buyer_id: str = Field(foreign_key="users.id", index=True, sa_type=ID_TYPE)
+    seller_id: str = Field(foreign_key="users.id", index=True, sa_type=ID_TYPE)
+    prompt_id: str = Field(foreign_key="prompts.id", index=True, sa_type=ID_TYPE)
 
     amount_cents: int = Field(description="Total amount charged in cents")
     platform_fee_cents: int = Field(description="Fee taken by platform in cents")
@@ -253,33 +506,55 @@ class Purchase(SQLModel, table=True):
     createdAt: datetime = Field(default_factory=datetime.utcnow)
 
 
+# Stripe statuses of a subscription that still grants (or may regain) access.
+LIVE_SUBSCRIPTION_STATUSES = ("active", "trialing", "past_due")
+
+_live_subscription = text(
+    "status IN (%s)" % ", ".join(f"'{status}'" for status in LIVE_SUBSCRIPTION_STATUSES)
+)
+
+
 class Subscription(SQLModel, table=True):
-    """User subscription state (managed by Stripe webhooks)."""
+    """User subscription state (managed by Stripe webhooks).
+
+    A user keeps one row per Stripe subscription; at most one of them is live.
+    """
 
     __tablename__ = "subscriptions"
     __table_args__ = (
-        UniqueConstraint("user_id", name="uq_subscription_user"),
+        Index(
+            "uq_subscription_user_active",
+            "user_id",
+            unique=True,
+            postgresql_where=_live_subscription,
+            sqlite_where=_live_subscription,
+        ),
         UniqueConstraint("stripe_subscription_id", name="uq_subscription_stripe_id"),
     )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
-    user_id: str = Field(foreign_key="users.id", index=True)
+    user_id: str = Field(foreign_key="users.id", index=True, sa_type=ID_TYPE)
 
-    stripe_subscription_id: str = Field(index=True, max_length=255)
+    stripe_subscription_id: str = Field(max_length=255)
     stripe_customer_id: str = Field(max_length=255)
 
     status: str = Field(max_length=20, index=True)  # active, canceled, past_due, unpaid
     plan_id: str = Field(default="premium_monthly", max_length=50)
 
-    current_period_start: datetime = Field()
-    current_period_end: datetime = Field()
+    current_period_start: datetime = Field(sa_type=Timestamp)
+    current_period_end: datetime = Field(sa_type=Timestamp)
     cancel_at_period_end: bool = Field(default=False)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_type=Timestamp,
+        sa_column_kwargs=_updated_at_column_kwargs(),
+    )
 
 
 class FlowCopy(SQLModel, table=True):
@@ -287,28 +562,106 @@ class FlowCopy(SQLModel, table=True):
 
     __tablename__ = "flow_copies"
     __table_args__ = (
-        UniqueConstraint(
-            "user_id", "flow_id", "billing_month", name="uq_copy_user_flow_month"
+        # One copy per user, flow and month; the monthly per-user lookups
+        # (has_copied / count / list) are index-only scans on it.
+        Index(
+            "ix_flow_copies_user_month_flow",
+            "user_id",
+            "billing_month",
+            "flow_id",
+            unique=True,
+            postgresql_include=["counted_for_payout"],
+        ),
+        # Payout-counted copies per creator/month, covering the aggregation.
+        Index(
+            "ix_flow_copies_creator_payout",
+            "creator_id",
+            "billing_month",
+            postgresql_include=["flow_id", "id"],
+            postgresql_where=text("counted_for_payout = true"),
         ),
+        # Index-only count of a user's counted copies this month.
+        Index(
+            "ix_flow_copies_user_payout",
+            "user_id",
+            "billing_month",
+            postgresql_where=text("counted_for_payout = true"),
+        ),
+        # Append-only log: BRIN summaries cover month/time range scans.
+        Index(
+            "idx_copies_billing_brin",
+            "billing_month",
+            "copied_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Monthly partitions, see flow_copies_ensure_partition below.
+        {"postgresql_partition_by": "RANGE (billing_month)"},
     )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
-    user_id: str = Field(foreign_key="users.id", index=True)
-    flow_id: str = Field(foreign_key="prompts.id", index=True)
+    user_id: str = Field(foreign_key="users.id", sa_type=ID_TYPE)
+    flow_id: str = Field(foreign_key="prompts.id", index=True, sa_type=ID_TYPE)
     creator_id: str = Field(
-        index=True, description="Denormalized for faster aggregation"
+        description="Denormalized for faster aggregation", sa_type=ID_TYPE
     )
 
     counted_for_payout: bool = Field(
         default=False, description="Whether this copy counts toward creator payout"
     )
-    copied_at: datetime = Field(default_factory=datetime.utcnow)
+    copied_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    # Part of the primary key because flow_copies is partitioned on it.
     billing_month: datetime = Field(
-        description="First day of billing month (YYYY-MM-01)"
-    )
+        primary_key=True, description="First day of billing month (YYYY-MM-01)"
+    )
+
+
+# Mirrors Alembic revisions f3a6b9d2c184 and 3a7c5e9f1b26 for databases built
+# by create_all. Copies for a month without its own partition land in
+# flow_copies_default; init_db and the copy endpoint create the current and
+# next month's partitions ahead of time (crud.ensure_flow_copy_partitions).
+# Partitions are analyzed after 1% new rows so the counted_for_payout partial
+# index estimates keep up with the inserts.
+for _ddl in (
+    DDL(
+        "CREATE TABLE flow_copies_default PARTITION OF flow_copies DEFAULT"
+        " WITH (autovacuum_vacuum_scale_factor = 0.05,"
+        " autovacuum_analyze_scale_factor = 0.01)"
+    ).execute_if(dialect="postgresql"),
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION flow_copies_ensure_partition(month timestamp)
+        RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            lo timestamp := date_trunc('month', month);
+            hi timestamp := lo + interval '1 month';
+            part text := 'flow_copies_' || to_char(lo, 'YYYYMM');
+        BEGIN
+            IF to_regclass(part) IS NOT NULL THEN
+                RETURN;
+            END IF;
+            IF EXISTS (
+                SELECT 1 FROM flow_copies_default
+                WHERE billing_month >= lo AND billing_month < hi
+            ) THEN
+                RETURN;
+            END IF;
+            EXECUTE format(
+                'CREATE TABLE %%I PARTITION OF flow_copies FOR VALUES FROM (%%L) TO (%%L)'
+                ' WITH (autovacuum_vacuum_scale_factor = 0.05,'
+                ' autovacuum_analyze_scale_factor = 0.01)',
+                part, lo, hi
+            );
+        END
+        $$
+        """
+    ).execute_if(dialect="postgresql"),
+):
+    event.listen(FlowCopy.__table__, "after_create", _ddl)
 
 
 class CreatorPayout(SQLModel, table=True):
@@ -317,13 +670,22 @@ class CreatorPayout(SQLModel, table=True):
     __tablename__ = "creator_payouts"
     __table_args__ = (
         UniqueConstraint("creator_id", "billing_month", name="uq_payout_creator_month"),
+        # Payout worker queue: open payouts for a month, index-only.
+        Index(
+            "idx_payouts_open",
+            "status",
+            "billing_month",
+            postgresql_include=["creator_id", "amount_cents", "stripe_transfer_id", "id"],
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
     )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
-    creator_id: str = Field(foreign_key="users.id", index=True)
+    creator_id: str = Field(foreign_key="users.id", sa_type=ID_TYPE)
     billing_month: datetime = Field(
         description="First day of billing month (YYYY-MM-01)"
     )
@@ -335,10 +697,38 @@ class CreatorPayout(SQLModel, table=True):
         default="pending", max_length=20
     )  # pending, processing, paid, failed
     stripe_transfer_id: str | None = Field(default=None)
-    paid_at: datetime | None = Field(default=None)
+    paid_at: datetime | None = Field(default=None, sa_type=Timestamp)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_type=Timestamp,
+        sa_column_kwargs=_updated_at_column_kwargs(),
+    )
+
+
+# Subscriptions and payouts are updated in place (status, updated_at,
+# paid_at); leaving 30% of each page free lets those updates stay HOT.
+# Mirrors Alembic revision 1c8e4a6f0d27.
+for _table in (Subscription.__table__, CreatorPayout.__table__):
+    event.listen(
+        _table,
+        "after_create",
+        DDL("ALTER TABLE %(table)s SET (fillfactor = 70)").execute_if(
+            dialect="postgresql"
+        ),
+    )
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+# Payout rows change less often than copies; mirrors Alembic revision
+# 3a7c5e9f1b26.
+event.listen(
+    CreatorPayout.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE creator_payouts SET (autovacuum_vacuum_scale_factor = 0.1,"
+        " autovacuum_analyze_scale_factor = 0.05)"
+    ).execute_if(dialect="postgresql"),
+)
 
 
 # Connection Manager Models
@@ -352,6 +742,7 @@ class Provider(SQLModel, table=True):
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
 
     name: str = Field(unique=True, max_length=100, index=True)
@@ -377,22 +768,41 @@ class Provider(SQLModel, table=True):
 
     is_active: bool = Field(default=True)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
 
 
 class AccountConnection(SQLModel, table=True):
     """User's connection to an AI provider."""
 
     __tablename__ = "account_connections"
+    __table_args__ = (
+        # get_user_connections lists newest first; this also serves plain
+        # user_id lookups and the users foreign key.
+        Index("ix_account_connections_user_created", "user_id", text("created_at DESC")),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
 
-    user_id: str = Field(foreign_key="users.id", index=True)
-    provider_id: str = Field(foreign_key="providers.id", index=True)
+    user_id: str = Field(foreign_key="users.id", sa_type=ID_TYPE)
+    provider_id: str = Field(foreign_key="providers.id", index=True, sa_type=ID_TYPE)
+    provider: Provider = Relationship()
+    # Children are removed by the ON DELETE CASCADE foreign keys; the ORM
+    # never needs to load them just to delete a connection.
+    credential_items: list["CredentialVaultItem"] = Relationship(
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True}
+    )
+    manual_override: Optional["ManualOverride"] = Relationship(
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+            "uselist": False,
+        }
+    )
 
     label: str = Field(
         max_length=100, description="User-defined label for this connection"
@@ -405,11 +815,11 @@ class AccountConnection(SQLModel, table=True):
     )  # active, inactive, error
 
     # Last usage tracking
-    last_used_at: datetime | None = Field(default=None)
+    last_used_at: datetime | None = Field(default=None, sa_type=Timestamp)
     last_error: str | None = Field(default=None, max_length=500)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
 
 
 class CredentialVaultItem(SQLModel, table=True):
@@ -420,11 +830,15 @@ class CredentialVaultItem(SQLModel, table=True):
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
 
-    connection_id: str = Field(foreign_key="account_connections.id", index=True)
+    connection_id: str = Field(
+        foreign_key="account_connections.id", index=True, ondelete="CASCADE",
+        sa_type=ID_TYPE,
+    )
 
-    # Encrypted data (format: iv:auth_tag:encrypted_content)
+    # Encrypted data (format: URL-safe base64 of iv + encrypted_content + auth_tag)
     encrypted_data: str = Field()
 
     # Metadata
@@ -432,8 +846,8 @@ class CredentialVaultItem(SQLModel, table=True):
         max_length=100, description="Name of the credential key (e.g., 'api_key')"
     )
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
 
 
 class ManualOverride(SQLModel, table=True):
@@ -444,12 +858,16 @@ class ManualOverride(SQLModel, table=True):
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()),
         primary_key=True,
+        sa_type=ID_TYPE,
     )
 
-    connection_id: str = Field(foreign_key="account_connections.id", index=True)
+    connection_id: str = Field(
+        foreign_key="account_connections.id", index=True, ondelete="CASCADE",
+        sa_type=ID_TYPE,
+    )
 
     # JSON configuration for manual overrides
     config: dict = Field(default_factory=dict, sa_column=Column(JSON))
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_type=Timestamp)
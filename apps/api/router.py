@@ -12,6 +12,7 @@ import urllib.parse
 from typing import Literal, Any
 
 from fastapi import APIRouter, Depends, Query, Header, Response, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError as PydanticValidationError
 from sqlmodel import Session, select
@@ -31,10 +32,16 @@ from apps.api.schemas import (
     Token,
     OAuthExchangeRequest,
     OAuthStartResponse,
+    SubscriptionRead,
+    SubscriptionStatusResponse,
+    FlowCopyResponse,
+    CreatorAccountResponse,
+    CreatorEarningsResponse,
 )
 from apps.api.crud import (
     get_prompt_by_slug,
-    get_prompts,
+    get_prompt_id_by_slug,
+    get_prompts_summary,
     get_all_tags,
     create_prompt,
     update_prompt,
@@ -47,8 +54,19 @@ from apps.api.crud import (
     create_comment,
     get_comment_by_id,
     delete_comment,
+    adjust_prompt_counter,
     like_target,
     unlike_target,
+    save_prompt as crud_save_prompt,
+    unsave_prompt as crud_unsave_prompt,
+    get_subscription_by_user,
+    count_copies_this_month,
+    has_copied_this_month,
+    ensure_flow_copy_partitions,
+    get_billing_month_start,
+    record_flow_copy as record_copy,
+    get_payouts_for_creator,
+    get_total_earnings,
 )
 from apps.api.settings import settings
 from apps.api.db import get_session
@@ -69,7 +87,7 @@ import secrets
 
 import httpx
 
-from apps.api.models import User, OAuthAccount, Prompt, Comment
+from apps.api.models import User, OAuthAccount, Prompt, Comment, is_valid_id
 from sqlalchemy.exc import IntegrityError
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
@@ -660,9 +678,7 @@ def oauth_exchange_code(
 
     user = None
     if existing_account:
-        user = session.exec(
-            select(User).where(User.id == existing_account.user_id)
-        ).first()
+        user = session.get(User, existing_account.user_id)
         if user is None:
             # Dangling account; treat as missing.
             existing_account = None
@@ -825,7 +841,7 @@ def list_prompts(
     Query parameters:
     - q: Search query for text search across title, summary, and promptText
     - tags: Comma-separated list of tags to filter by (AND logic)
-    - difficulty: Difficulty level to filter by (beginner, intermediate, advanced)
+    - type: Type of content to filter by (prompt, discussion)
     - worksWith: Comma-separated list of tools to filter by (OR logic)
     - page: Page number (default: 1)
     - pageSize: Number of items per page (default: 20, max: 100)
@@ -838,8 +854,8 @@ def list_prompts(
         # Calculate skip for pagination
         skip = (page - 1) * pageSize
 
-        # Call get_prompts with filters
-        prompts, total = get_prompts(
+        # List views only need the summary columns
+        prompts, total = get_prompts_summary(
             session=session,
             skip=skip,
             limit=pageSize,
@@ -967,15 +983,15 @@ def list_prompt_comments(
     """List all comments for a prompt (public)."""
 
     try:
-        prompt = get_prompt_by_slug(session=session, slug=slug)
-        if prompt is None:
+        prompt_id = get_prompt_id_by_slug(session=session, slug=slug)
+        if prompt_id is None:
             return error_response(
                 error="Not found",
                 message=f"Prompt with slug '{slug}' not found",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        comments = get_comments_for_prompt(session=session, prompt_id=prompt.id)
+        comments = get_comments_for_prompt(session=session, prompt_id=prompt_id)
         return CommentListResponse(items=comments)
 
     except Exception:
@@ -1065,18 +1081,14 @@ def like_prompt(
         if limiter:
             return limiter
 
-        created = like_target(
+        like_target(
             session=session,
             user_id=current_user.id,
             target_type="prompt",
             target_id=prompt.id,
         )
 
-        if created:
-            prompt.like_count = (prompt.like_count or 0) + 1
-            session.add(prompt)
-            session.commit()
-
+        # like_count is maintained by the likes trigger; read back its value.
         session.refresh(prompt)
         return LikeStatusResponse(liked=True, likeCount=prompt.like_count)
 
@@ -1119,18 +1131,13 @@ def unlike_prompt(
         if limiter:
             return limiter
 
-        deleted = unlike_target(
+        unlike_target(
             session=session,
             user_id=current_user.id,
             target_type="prompt",
             target_id=prompt.id,
         )
 
-        if deleted and (prompt.like_count or 0) > 0:
-            prompt.like_count = prompt.like_count - 1
-            session.add(prompt)
-            session.commit()
-
         session.refresh(prompt)
         return LikeStatusResponse(liked=False, likeCount=prompt.like_count)
 
@@ -1173,18 +1180,14 @@ def like_comment(
         if limiter:
             return limiter
 
-        created = like_target(
+        like_target(
             session=session,
             user_id=current_user.id,
             target_type="comment",
             target_id=comment.id,
         )
 
-        if created:
-            comment.like_count = (comment.like_count or 0) + 1
-            session.add(comment)
-            session.commit()
-
+        # like_count is maintained by the likes trigger; read back its value.
         session.refresh(comment)
         return LikeStatusResponse(liked=True, likeCount=comment.like_count)
 
@@ -1227,18 +1230,13 @@ def unlike_comment(
         if limiter:
             return limiter
 
-        deleted = unlike_target(
+        unlike_target(
             session=session,
             user_id=current_user.id,
             target_type="comment",
             target_id=comment.id,
         )
 
-        if deleted and (comment.like_count or 0) > 0:
-            comment.like_count = comment.like_count - 1
-            session.add(comment)
-            session.commit()
-
         session.refresh(comment)
         return LikeStatusResponse(liked=False, likeCount=comment.like_count)
 
@@ -1402,18 +1400,15 @@ def save_prompt_endpoint(
             status_code=404,
         )
 
-    # Use 'save_prompt' from crud (ensure it is imported)
-    from apps.api.crud import save_prompt as crud_save_prompt
-
     was_saved = crud_save_prompt(
         session=session, user_id=current_user.id, prompt_id=prompt.id
     )
+    saves_count = prompt.saves_count
     if was_saved:
-        prompt.saves_count += 1
-        session.add(prompt)
+        saves_count = adjust_prompt_counter(session, prompt.id, "saves_count", 1)
         session.commit()
 
-    return {"liked": True, "likeCount": prompt.saves_count}
+    return {"liked": True, "likeCount": saves_count}
 
 
 @router.delete(
@@ -1435,17 +1430,15 @@ def unsave_prompt_endpoint(
             status_code=404,
         )
 
-    from apps.api.crud import unsave_prompt as crud_unsave_prompt
-
     was_unsaved = crud_unsave_prompt(
         session=session, user_id=current_user.id, prompt_id=prompt.id
     )
+    saves_count = prompt.saves_count
     if was_unsaved:
-        prompt.saves_count = max(0, prompt.saves_count - 1)
-        session.add(prompt)
+        saves_count = adjust_prompt_counter(session, prompt.id, "saves_count", -1) or 0
         session.commit()
 
-    return {"liked": False, "likeCount": prompt.saves_count}
+    return {"liked": False, "likeCount": saves_count}
 
 
 # --- Stripe / Marketplace Endpoints ---
@@ -1556,10 +1549,21 @@ def buy_prompt(
 # ============================================================================
 
 
+def _apply_subscription_event(event: dict) -> dict:
+    """Handle a Stripe subscription event in a session of its own."""
+    from apps.api.stripe_utils import handle_subscription_event
+
+    sessions = get_session()
+    try:
+        return handle_subscription_event(next(sessions), event)
+    finally:
+        sessions.close()
+
+
 @router.post("/webhooks/stripe", tags=["webhooks"])
 async def stripe_webhook(request: Request):
     """Handle Stripe webhook events."""
-    from apps.api.stripe_utils import stripe_client, handle_subscription_event
+    from apps.api.stripe_utils import stripe_client
 
     body = await request.body()
     signature = request.headers.get("stripe-signature")
@@ -1581,10 +1585,10 @@ async def stripe_webhook(request: Request):
 
         event = json.loads(body)
 
-        # Handle subscription events
+        # Handle subscription events. The database work is synchronous, so
+        # it runs in the threadpool rather than blocking the event loop.
         if event["type"].startswith("customer.subscription"):
-            session = get_session().__next__()
-            result = handle_subscription_event(session, event)
+            result = await run_in_threadpool(_apply_subscription_event, event)
             if result.get("status") == "error":
                 return error_response(
                     error="Webhook Error",
@@ -1604,9 +1608,6 @@ def get_my_subscription(
     session: Session = Depends(get_session),
 ):
     """Get current user's subscription status."""
-    from apps.api.crud import get_subscription_by_user, count_copies_this_month
-    from apps.api.schemas import SubscriptionStatusResponse, SubscriptionRead
-
     subscription = get_subscription_by_user(session, current_user.id)
     copies_this_month = count_copies_this_month(session, current_user.id)
     copies_remaining = max(0, 100 - copies_this_month)
@@ -1674,17 +1675,8 @@ def record_flow_copy(
     Tracks copies for payout calculation.
     Returns how many copies the user has left this month.
     """
-    from apps.api.crud import (
-        get_prompt_by_slug,
-        get_subscription_by_user,
-        record_flow_copy as record_copy,
-        count_copies_this_month,
-        has_copied_this_month,
-    )
-    from apps.api.schemas import FlowCopyResponse
-
     # Get the flow
-    flow = session.get(Prompt, flow_id)
+    flow = session.get(Prompt, flow_id) if is_valid_id(flow_id) else None
     if not flow:
         return error_response(
             error="Not Found", message="Flow not found", status_code=404
@@ -1697,6 +1689,10 @@ def record_flow_copy(
             error="Forbidden", message="Premium subscription required", status_code=403
         )
 
+    # The first copy of a new month creates its partition if no restart has
+    # yet; before the checks below, which read flow_copies in this session.
+    ensure_flow_copy_partitions(session.get_bind(), get_billing_month_start())
+
     # Check if already copied this month
     if has_copied_this_month(session, current_user.id, flow_id):
         return error_response(
@@ -1725,8 +1721,7 @@ def record_flow_copy(
         )
 
         # Update flow total_copies counter
-        flow.total_copies = (flow.total_copies or 0) + 1
-        session.add(flow)
+        adjust_prompt_counter(session, flow_id, "total_copies", 1)
         session.commit()
 
         # Return response
@@ -1757,9 +1752,6 @@ def get_my_earnings(
     session: Session = Depends(get_session),
 ):
     """Get creator earnings and account balance."""
-    from apps.api.crud import get_payouts_for_creator, get_total_earnings
-    from apps.api.schemas import CreatorAccountResponse, CreatorEarningsResponse
-
     payouts = get_payouts_for_creator(session, current_user.id)
     total_earnings_cents = get_total_earnings(session, current_user.id)
 
@@ -93,12 +93,12 @@ class PromptUpdate(BaseModel):
     price: int | None = Field(default=None, ge=0)
 
 
-class PromptRead(BaseModel):
+class PromptListItem(BaseModel):
     """
-    Schema for reading a prompt.
+    Schema for a prompt in a list.
 
-    Used for GET responses. Contains all prompt fields including
-    auto-generated fields like id, createdAt, and updatedAt.
+    Used for GET /v1/prompts items. Contains every prompt field except
+    the full promptText and notes, which only the detail view shows.
     """
 
     id: str = Field(description="Unique identifier for the prompt")
@@ -123,19 +123,10 @@ class PromptRead(BaseModel):
         description="List of target websites this prompt works with",
     )
 
-    promptText: str = Field(
-        description="The actual prompt text to be used",
-    )
-
     steps: list[str] = Field(
         description="Step-by-step instructions",
     )
 
-    notes: str | None = Field(
-        default=None,
-        description="Additional notes or warnings",
-    )
-
     author_id: str | None = Field(
         default=None,
         description="ID of the user who created this prompt",
@@ -178,6 +169,24 @@ class PromptRead(BaseModel):
         from_attributes = True
 
 
+class PromptRead(PromptListItem):
+    """
+    Schema for reading a prompt.
+
+    Used for GET responses. Contains all prompt fields including
+    auto-generated fields like id, createdAt, and updatedAt.
+    """
+
+    promptText: str = Field(
+        description="The actual prompt text to be used",
+    )
+
+    notes: str | None = Field(
+        default=None,
+        description="Additional notes or warnings",
+    )
+
+
 class PromptListResponse(BaseModel):
     """
     Schema for paginated list of prompts.
@@ -185,7 +194,7 @@ class PromptListResponse(BaseModel):
     Used for GET /v1/prompts response.
     """
 
-    items: list[PromptRead] = Field(description="List of prompts")
+    items: list[PromptListItem] = Field(description="List of prompts")
 
     page: int = Field(
         ge=1,
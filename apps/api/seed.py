@@ -302,7 +302,7 @@ Price drops below target OR monitoring period expires.""",
                 skipped_count += 1
             else:
                 # Create the prompt
-                prompt = create_prompt(session, prompt_data)
+                prompt = create_prompt(session, prompt_data, flush_only=True)
                 
                 # Mock like counts for initial quality seeding
                 if prompt.slug == "resolve-github-merge-conflicts":
@@ -315,13 +315,13 @@ Price drops below target OR monitoring period expires.""",
                     prompt.like_count = 14
                 elif prompt.slug == "twitter-thread-unroller":
                     prompt.like_count = 7
-                
-                session.add(prompt)
-                session.commit()
-                
+
                 logger.info(f"  ✅ Created prompt: {prompt_data.slug}")
                 created_count += 1
 
+        # All new prompts in one transaction
+        session.commit()
+
         # Print summary
         logger.info("\n📊 Seed complete!")
         logger.info(f"  • Created: {created_count} prompts")
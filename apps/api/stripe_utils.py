@@ -223,7 +223,6 @@ def handle_subscription_deleted(session: Session, user, data: dict) -> dict:
 
     if subscription:
         subscription.status = "canceled"
-        subscription.updated_at = datetime.utcnow()
         session.add(subscription)
         session.commit()
 
@@ -51,6 +51,19 @@ def db_session(test_engine):
 
     set_test_engine(test_engine)
 
+    # Each test starts from an empty database, so drop cached query results
+    from apps.api.connections_crud import clear_credential_cache
+    from apps.api.crud import (
+        clear_subscription_id_cache,
+        clear_tags_cache,
+        clear_user_cache,
+    )
+
+    clear_tags_cache()
+    clear_user_cache()
+    clear_subscription_id_cache()
+    clear_credential_cache()
+
     # Create all tables
     SQLModel.metadata.create_all(test_engine)
 
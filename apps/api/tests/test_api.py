@@ -20,6 +20,7 @@ def test_list_prompts_pagination(client, seeded_prompts):
     - The correct number of items is returned based on pageSize
     - Pagination parameters are correctly reflected in the response
     - Total count reflects the number of seeded prompts
+    - List items leave out promptText and notes (PromptListItem)
     """
     response = client.get("/v1/prompts?page=1&pageSize=10")
 
@@ -30,6 +31,8 @@ def test_list_prompts_pagination(client, seeded_prompts):
     assert data["page"] == 1
     assert data["pageSize"] == 10
     assert data["total"] == 25
+    assert "promptText" not in data["items"][0]
+    assert "notes" not in data["items"][0]
 
 
 def test_filter_by_tag(client, db_session):
@@ -90,3 +90,13 @@ def test_delete_comment_author_only(client, db_session, auth_headers, registered
     listing = client.get(f"/v1/prompts/{prompt['slug']}/comments")
     assert listing.status_code == 200
     assert listing.json()["items"] == []
+
+
+def test_malformed_comment_id_not_found(client, db_session, auth_headers):
+    # Ids are native uuid on Postgres; anything else is simply not found
+    for method in ("put", "delete"):
+        resp = getattr(client, method)("/v1/comments/not-a-uuid/like", headers=auth_headers)
+        assert resp.status_code == 404
+
+    resp = client.delete("/v1/comments/not-a-uuid", headers=auth_headers)
+    assert resp.status_code == 404
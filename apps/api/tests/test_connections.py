@@ -6,6 +6,7 @@ import os
 import pytest
 
 from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, create_engine, select
 
 os.environ["TESTING"] = "true"
@@ -19,13 +20,21 @@ from apps.api.models import (
     ManualOverride,
 )
 from apps.api.db import set_test_engine
+from apps.api.connections_crud import clear_credential_cache, clear_provider_cache
+from apps.api.crud import clear_subscription_id_cache, clear_user_cache
 from apps.api.encryption import encryption_service
 
 
 @pytest.fixture
 def test_db():
     """Create a test database."""
-    engine = create_engine("sqlite:///:memory:")
+    # One shared connection, so the app's sessions (on the TestClient's
+    # thread) see the tables and rows created here
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     set_test_engine(engine)
 
     # Create tables
@@ -62,10 +71,15 @@ def test_db():
     for provider in providers:
         session.add(provider)
     session.commit()
+    clear_provider_cache()
+    clear_credential_cache()
+    clear_user_cache()
+    clear_subscription_id_cache()
 
     yield session
 
     session.close()
+    set_test_engine(None)
 
 
 @pytest.fixture
@@ -283,6 +297,9 @@ class TestConnectionsAPI:
         assert data["id"] == connection_id
         assert data["label"] == "Test Connection"
         assert "credentials" not in data
+        # The create response shows the stored row, same as a later read
+        assert data["created_at"] == create_response.json()["created_at"]
+        assert data["updated_at"] == create_response.json()["updated_at"]
 
     def test_get_connection_not_found(self, authenticated_client: TestClient):
         """Test getting non-existent connection."""
@@ -316,6 +333,40 @@ class TestConnectionsAPI:
         get_response = authenticated_client.get(f"/v1/connections/{connection_id}")
         assert get_response.status_code == 404
 
+    def test_delete_connection_removes_child_rows(
+        self, authenticated_client: TestClient, test_db: Session
+    ):
+        """Test that deleting a connection cascades to its vault items and overrides."""
+        provider = test_db.exec(select(Provider).where(Provider.slug == "zai")).first()
+
+        connection_data = {
+            "provider_id": provider.id,
+            "label": "Cascade",
+            "connection_type": "api_key",
+            "credentials": {"api_key": "sk-test"},
+            "manual_config": {"model": "gpt-4"},
+        }
+
+        create_response = authenticated_client.post(
+            "/v1/connections", json=connection_data
+        )
+        connection_id = create_response.json()["id"]
+
+        vault_items = select(CredentialVaultItem).where(
+            CredentialVaultItem.connection_id == connection_id
+        )
+        overrides = select(ManualOverride).where(
+            ManualOverride.connection_id == connection_id
+        )
+        assert len(test_db.exec(vault_items).all()) == 1
+        assert len(test_db.exec(overrides).all()) == 1
+
+        response = authenticated_client.delete(f"/v1/connections/{connection_id}")
+
+        assert response.status_code == 204
+        assert test_db.exec(vault_items).all() == []
+        assert test_db.exec(overrides).all() == []
+
     def test_delete_connection_not_found(self, authenticated_client: TestClient):
         """Test deleting non-existent connection."""
         response = authenticated_client.delete("/v1/connections/non-existent-id")
@@ -368,9 +419,7 @@ class TestCredentialEncryption:
 
         # Verify encrypted data is not plaintext
         assert vault_item.encrypted_data != "sk-secret-key-12345"
-        assert (
-            ":" in vault_item.encrypted_data
-        )  # Should have iv:auth_tag:content format
+        assert encryption_service.decrypt(vault_item.encrypted_data) == "sk-secret-key-12345"
 
     def test_credentials_can_be_decrypted(
         self, test_db: Session, authenticated_client: TestClient
@@ -399,3 +448,52 @@ class TestCredentialEncryption:
         decrypted = encryption_service.decrypt(vault_item.encrypted_data)
 
         assert decrypted == original_key
+
+    def test_cached_credentials_not_served_after_delete(
+        self, test_db: Session, authenticated_client: TestClient, test_user: User
+    ):
+        """Verify cached decrypted credentials can't outlive their connection."""
+        from apps.api import connections_crud
+
+        provider = test_db.exec(select(Provider).where(Provider.slug == "zai")).first()
+
+        connection_data = {
+            "provider_id": provider.id,
+            "label": "Cache Test",
+            "connection_type": "api_key",
+            "credentials": {"api_key": "sk-cached"},
+        }
+
+        response = authenticated_client.post("/v1/connections", json=connection_data)
+        connection_id = response.json()["id"]
+
+        credentials = connections_crud.get_connection_credentials(
+            test_db, connection_id, test_user.id
+        )
+        item_id = test_db.exec(
+            select(CredentialVaultItem.id).where(
+                CredentialVaultItem.connection_id == connection_id
+            )
+        ).one()
+
+        assert credentials == {"api_key": "sk-cached"}
+        assert item_id in connections_crud._credential_cache
+
+        assert connections_crud.delete_connection(test_db, connection_id, test_user.id)
+        with pytest.raises(ValueError):
+            connections_crud.get_connection_credentials(
+                test_db, connection_id, test_user.id
+            )
+
+    def test_credential_cache_is_bounded(self, monkeypatch):
+        """Verify the decrypted-credential cache drops its oldest entries past the cap."""
+        from apps.api import connections_crud
+
+        monkeypatch.setattr(connections_crud, "_CREDENTIAL_CACHE_SIZE", 2)
+        for item_id in ("a", "b", "c"):
+            value = connections_crud._decrypt(
+                item_id, encryption_service.encrypt(f"secret-{item_id}")
+            )
+            assert value == f"secret-{item_id}"
+
+        assert list(connections_crud._credential_cache) == ["b", "c"]
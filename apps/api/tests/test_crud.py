@@ -6,6 +6,9 @@ This module contains tests for the CRUD functions in crud.py:
 - get_prompts
 - get_all_tags
 - create_prompt
+- update_prompt
+- adjust_prompt_counter
+- get_user_by_email
 - slugify_title
 """
 
@@ -14,9 +17,12 @@ from apps.api.crud import (
     get_prompts,
     get_all_tags,
     create_prompt,
+    update_prompt,
+    adjust_prompt_counter,
+    get_user_by_email,
     slugify_title,
 )
-from apps.api.schemas import PromptCreate
+from apps.api.schemas import PromptCreate, PromptUpdate
 
 
 def test_get_prompt_by_slug_found(db_session):
@@ -420,6 +426,80 @@ def test_create_prompt_duplicate_slug(db_session):
     assert result.slug == "duplicate-slug-1"
 
 
+def test_counter_updates_keep_updated_at(db_session):
+    """
+    Test that cached counters don't move a prompt's updatedAt.
+
+    Verifies that:
+    - adjust_prompt_counter changes the counter but not updatedAt
+    - Decrements stop at zero
+    - update_prompt does move updatedAt
+    """
+    from datetime import datetime
+    from apps.api.models import Prompt
+
+    updated_at = datetime(2024, 1, 1)
+    prompt = Prompt(
+        slug="counter-prompt",
+        title="Counter Prompt",
+        summary="Counter prompt",
+        worksWith=["Chrome"],
+        tags=["test"],
+        targetSites=["example.com"],
+        promptText="Test prompt text",
+        steps=["Step 1"],
+        updatedAt=updated_at,
+    )
+    db_session.add(prompt)
+    db_session.commit()
+
+    assert adjust_prompt_counter(db_session, prompt.id, "saves_count", 1) == 1
+    assert adjust_prompt_counter(db_session, prompt.id, "total_copies", 1) == 1
+    db_session.commit()
+    db_session.refresh(prompt)
+
+    assert prompt.saves_count == 1
+    assert prompt.total_copies == 1
+    # Depending on the sqlmodel version, datetimes load back as aware UTC
+    assert prompt.updatedAt.replace(tzinfo=None) == updated_at
+
+    assert adjust_prompt_counter(db_session, prompt.id, "comment_count", -1) is None
+
+    result = update_prompt(db_session, prompt, PromptUpdate(title="Renamed"))
+
+    assert result.updatedAt.replace(tzinfo=None) > updated_at
+
+
+def test_get_user_by_email_cache_cleared_on_update(db_session):
+    """
+    Test that an updated user is not served from the lookup cache.
+
+    Verifies that:
+    - A found user is cached
+    - Updating the user drops the cached entry
+    - The next lookup, from a fresh session, sees the update
+    """
+    from sqlmodel import Session
+    from apps.api import crud
+    from apps.api.models import User
+
+    user = User(email="cached@example.com", username="cached", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+
+    with Session(db_session.get_bind()) as session:
+        assert get_user_by_email(session, "cached@example.com").username == "cached"
+    assert "cached@example.com" in crud._user_by_email_cache
+
+    user.username = "renamed"
+    db_session.add(user)
+    db_session.commit()
+
+    assert "cached@example.com" not in crud._user_by_email_cache
+    with Session(db_session.get_bind()) as session:
+        assert get_user_by_email(session, "cached@example.com").username == "renamed"
+
+
 def test_slugify_title():
     """
     Test the slugify_title helper function.
@@ -454,3 +534,30 @@ def test_slugify_title():
     
     # Complex case
     assert slugify_title("My_Great_Title_123!!!") == "my-great-title-123"
+
+
+def test_get_user_by_email_cache_is_bounded(db_session, monkeypatch):
+    """
+    Test that the user lookup cache doesn't grow without bound.
+
+    Verifies that:
+    - Storing beyond the cap drops the oldest entries
+    - Storing drops expired entries
+    """
+    from apps.api import crud
+    from apps.api.models import User
+
+    monkeypatch.setattr(crud, "_USER_CACHE_SIZE", 2)
+    for name in ("first", "second", "third"):
+        db_session.add(User(email=f"{name}@example.com", username=name, hashed_password="x"))
+    db_session.commit()
+
+    for name in ("first", "second", "third"):
+        get_user_by_email(db_session, f"{name}@example.com")
+
+    assert list(crud._user_by_email_cache) == ["second@example.com", "third@example.com"]
+
+    monkeypatch.setattr(crud, "_USER_CACHE_TTL_SECONDS", 0)
+    get_user_by_email(db_session, "first@example.com")
+
+    assert list(crud._user_by_email_cache) == ["first@example.com"]
@@ -2,6 +2,8 @@
 Unit tests for encryption service.
 """
 
+import base64
+
 import pytest
 
 from encryption import EncryptionService
@@ -67,20 +69,38 @@ class TestEncryptionService:
 
         encrypted = encryption_service.encrypt(plaintext)
 
-        # Format should be: iv:auth_tag:encrypted_content
-        parts = encrypted.split(":")
-        assert len(parts) == 3
+        # Format should be: URL-safe base64 of iv + encrypted_content + auth_tag
+        raw = base64.urlsafe_b64decode(encrypted)
+
+        # IV (12 bytes) + encrypted content (as long as the plaintext) + auth tag (16 bytes)
+        assert len(raw) == 12 + len(plaintext) + 16
+
+    def test_legacy_hex_format_decrypts(self):
+        """Test that values in the older iv:auth_tag:encrypted_content hex format still decrypt."""
+        encryption_service = EncryptionService(
+            "0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+        )
+        plaintext = "legacy secret"
+
+        raw = base64.urlsafe_b64decode(encryption_service.encrypt(plaintext))
+        iv, encrypted_content, auth_tag = raw[:12], raw[12:-16], raw[-16:]
+        legacy = f"{iv.hex()}:{auth_tag.hex()}:{encrypted_content.hex()}"
 
-        iv_hex, auth_tag_hex, encrypted_hex = parts
+        assert encryption_service.decrypt(legacy) == plaintext
 
-        # IV should be 12 bytes = 24 hex chars
-        assert len(iv_hex) == 24
+    def test_encrypt_many(self):
+        """Test that batch encryption matches encrypting each value on its own."""
+        encryption_service = EncryptionService(
+            "0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+        )
+        plaintexts = ["sk-one", "", "sk-three"]
 
-        # Auth tag should be 16 bytes = 32 hex chars
-        assert len(auth_tag_hex) == 32
+        encrypted = encryption_service.encrypt_many(plaintexts)
 
-        # Encrypted content should be at least some length
-        assert len(encrypted_hex) > 0
+        assert len(encrypted) == len(plaintexts)
+        assert len(set(encrypted)) == len(plaintexts)  # Each value has its own IV
+        assert [encryption_service.decrypt(e) for e in encrypted] == plaintexts
+        assert encryption_service.encrypt_many([]) == []
 
     def test_encryption_uniqueness(self):
         """Test that encrypting the same text twice produces different ciphertexts."""
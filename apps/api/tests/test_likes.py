@@ -88,3 +88,49 @@ def test_like_unlike_comment_idempotent(client, db_session, auth_headers):
     unlike2 = client.delete(f"/v1/comments/{comment['id']}/like", headers=auth_headers)
     assert unlike2.status_code == 200
     assert unlike2.json()["likeCount"] == 0
+
+
+def test_like_count_trigger(db_session):
+    """The likes triggers keep like_count in step, never below zero."""
+    from apps.api.crud import like_target, unlike_target
+    from apps.api.models import Comment, Prompt, User
+
+    user = User(email="liker@example.com", username="liker", hashed_password="x")
+    prompt = Prompt(
+        slug="liked-flow",
+        title="Liked Flow",
+        summary="A flow",
+        worksWith=["Chrome"],
+        tags=["forum"],
+        targetSites=["example.com"],
+        promptText="Do the thing",
+        steps=["One"],
+    )
+    db_session.add_all([user, prompt])
+    db_session.commit()
+    comment = Comment(prompt_id=prompt.id, author_id=user.id, body="First!")
+    db_session.add(comment)
+    db_session.commit()
+
+    assert like_target(db_session, user_id=user.id, target_type="prompt", target_id=prompt.id)
+    db_session.refresh(prompt)
+    db_session.refresh(comment)
+    assert prompt.like_count == 1
+    assert comment.like_count == 0
+
+    assert like_target(db_session, user_id=user.id, target_type="comment", target_id=comment.id)
+    db_session.refresh(comment)
+    assert comment.like_count == 1
+
+    assert unlike_target(db_session, user_id=user.id, target_type="prompt", target_id=prompt.id)
+    db_session.refresh(prompt)
+    assert prompt.like_count == 0
+
+    # A stray like row removed when the counter is already at zero
+    prompt.like_count = 0
+    comment.like_count = 0
+    db_session.add_all([prompt, comment])
+    db_session.commit()
+    assert unlike_target(db_session, user_id=user.id, target_type="comment", target_id=comment.id)
+    db_session.refresh(comment)
+    assert comment.like_count == 0
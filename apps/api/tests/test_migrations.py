@@ -0,0 +1,53 @@
+"""
+Sanity checks for the Alembic revision graph.
+"""
+
+import ast
+from collections import Counter
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+API_DIR = Path(__file__).resolve().parent.parent
+VERSIONS_DIR = API_DIR / "alembic" / "versions"
+
+
+def _declared_revision(path: Path) -> str | None:
+    """Return the ``revision`` id assigned at module level in a revision file."""
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.AnnAssign):
+            target, value = node.target, node.value
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id == "revision":
+            return ast.literal_eval(value)
+    return None
+
+
+class TestMigrations:
+    """Test cases for the migration history."""
+
+    def test_revision_ids_are_unique(self):
+        """Test no two revision files declare the same revision id.
+
+        Alembic only warns on duplicates and keeps whichever file it loads
+        last, so read the ids straight from the files.
+        """
+        revisions = Counter(
+            _declared_revision(path) for path in VERSIONS_DIR.glob("*.py")
+        )
+        duplicates = [rev for rev, count in revisions.items() if count > 1]
+
+        assert None not in revisions
+        assert duplicates == []
+
+    def test_single_head(self):
+        """Test the revision graph has exactly one head."""
+        config = Config(str(API_DIR / "alembic.ini"))
+        config.set_main_option("script_location", str(API_DIR / "alembic"))
+        script = ScriptDirectory.from_config(config)
+
+        assert len(script.get_heads()) == 1
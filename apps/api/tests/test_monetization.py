@@ -0,0 +1,227 @@
+"""
+Monetization CRUD tests for the Flowtab.Pro backend.
+
+This module contains tests for the subscription, copy and payout functions
+in crud.py:
+- get_subscription_by_user
+- create_or_update_subscription
+- record_flow_copy
+- update_payout_status
+- get_total_earnings
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from apps.api.crud import (
+    count_copies_this_month,
+    create_or_update_subscription,
+    get_billing_month_start,
+    get_subscription_by_user,
+    get_total_earnings,
+    get_user_by_email,
+    record_flow_copy,
+    update_payout_status,
+)
+from apps.api.models import CreatorPayout, Prompt, Subscription, User
+
+
+def _create_user(session, name: str = "creator") -> User:
+    user = User(
+        email=f"{name}@example.com",
+        username=name,
+        hashed_password="not-a-real-hash",
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _create_subscription(session, user: User, status: str, created_at: datetime) -> Subscription:
+    subscription = Subscription(
+        user_id=user.id,
+        stripe_subscription_id=f"sub_{status}_{created_at:%Y%m%d}",
+        stripe_customer_id="cus_test",
+        status=status,
+        current_period_start=created_at,
+        current_period_end=created_at + timedelta(days=30),
+        created_at=created_at,
+    )
+    session.add(subscription)
+    session.commit()
+    return subscription
+
+
+def test_get_subscription_by_user_prefers_live(db_session):
+    """
+    Test that a live subscription wins over a newer ended one.
+
+    Verifies that:
+    - The active subscription is returned even though a canceled one is newer
+    - Without a live subscription, the most recent one is returned
+    """
+    user = _create_user(db_session)
+    active = _create_subscription(db_session, user, "active", datetime(2024, 1, 1))
+    canceled = _create_subscription(db_session, user, "canceled", datetime(2024, 6, 1))
+
+    assert get_subscription_by_user(db_session, user.id).id == active.id
+
+    active.status = "canceled"
+    db_session.add(active)
+    db_session.commit()
+
+    assert get_subscription_by_user(db_session, user.id).id == canceled.id
+
+
+def test_one_live_subscription_per_user(db_session):
+    """
+    Test the uq_subscription_user_active constraint.
+
+    Verifies that:
+    - Ended subscriptions can sit next to a live one
+    - A second live subscription for the same user is rejected
+    """
+    user = _create_user(db_session)
+    _create_subscription(db_session, user, "canceled", datetime(2024, 1, 1))
+    _create_subscription(db_session, user, "active", datetime(2024, 2, 1))
+
+    with pytest.raises(IntegrityError):
+        _create_subscription(db_session, user, "past_due", datetime(2024, 3, 1))
+    db_session.rollback()
+
+
+def test_new_live_subscription_ends_the_old_one(db_session):
+    """
+    Test that a newly reported live subscription replaces the old live one.
+
+    Verifies that:
+    - Recording a second active Stripe subscription does not conflict
+    - The earlier live subscription is canceled
+    - Updates to the new subscription leave the old one alone
+    """
+    user = _create_user(db_session)
+    old = _create_subscription(db_session, user, "active", datetime(2024, 1, 1))
+
+    period_start = datetime(2024, 2, 1)
+    for status in ("active", "past_due"):
+        new = create_or_update_subscription(
+            db_session,
+            user_id=user.id,
+            stripe_subscription_id="sub_new",
+            stripe_customer_id="cus_test",
+            status=status,
+            current_period_start=period_start,
+            current_period_end=period_start + timedelta(days=30),
+        )
+        assert new.status == status
+
+    db_session.refresh(old)
+    assert old.status == "canceled"
+    assert get_subscription_by_user(db_session, user.id).id == new.id
+
+
+def test_record_flow_copy_rejects_duplicates(db_session):
+    """
+    Test that a repeat copy in the same month is not recorded.
+
+    Verifies that:
+    - The first copy is recorded for the current billing month
+    - A second copy of the same flow raises ValueError
+    - Only one copy is counted
+    """
+    creator = _create_user(db_session)
+    copier = _create_user(db_session, "copier")
+    flow = Prompt(
+        slug="copied-flow",
+        title="Copied Flow",
+        summary="A flow",
+        worksWith=["Chrome"],
+        tags=["test"],
+        targetSites=["example.com"],
+        promptText="Test prompt text",
+        steps=["Step 1"],
+        author_id=creator.id,
+    )
+    db_session.add(flow)
+    db_session.commit()
+
+    copy = record_flow_copy(
+        db_session, copier.id, flow.id, creator.id, counted_for_payout=True
+    )
+
+    # RETURNING may load the month back as aware UTC (newer sqlmodel)
+    assert copy.billing_month.replace(tzinfo=None) == get_billing_month_start()
+
+    with pytest.raises(ValueError):
+        record_flow_copy(
+            db_session, copier.id, flow.id, creator.id, counted_for_payout=True
+        )
+
+    assert count_copies_this_month(db_session, copier.id) == 1
+
+
+def test_update_payout_status_tracks_total_earnings(db_session):
+    """
+    Test that users.total_earnings_cents follows payout status changes.
+
+    Verifies that:
+    - Marking a payout paid adds its amount
+    - Marking it paid again changes nothing
+    - Moving it from paid to failed takes the amount back out
+    - Cached get_user_by_email results see each change
+    """
+    creator = _create_user(db_session)
+    payout = CreatorPayout(
+        creator_id=creator.id,
+        billing_month=datetime(2024, 1, 1),
+        copy_count=10,
+        amount_cents=70,
+    )
+    db_session.add(payout)
+    db_session.commit()
+
+    # Prime the user cache
+    assert get_user_by_email(db_session, creator.email).total_earnings_cents == 0
+
+    update_payout_status(db_session, payout.id, "paid")
+    assert get_total_earnings(db_session, creator.id) == 70
+    assert get_user_by_email(db_session, creator.email).total_earnings_cents == 70
+
+    update_payout_status(db_session, payout.id, "paid")
+    assert get_total_earnings(db_session, creator.id) == 70
+
+    update_payout_status(db_session, payout.id, "failed")
+    assert get_total_earnings(db_session, creator.id) == 0
+    assert get_user_by_email(db_session, creator.email).total_earnings_cents == 0
+
+
+def test_update_payout_status_rereads_a_loaded_payout(db_session):
+    """
+    Test that a payout paid by another session is not counted twice.
+
+    Verifies that:
+    - A payout already loaded in this session is re-read under the lock
+    - Marking it paid again leaves total_earnings_cents unchanged
+    """
+    from sqlmodel import Session
+
+    creator = _create_user(db_session)
+    payout = CreatorPayout(
+        creator_id=creator.id,
+        billing_month=datetime(2024, 1, 1),
+        copy_count=100,
+        amount_cents=700,
+    )
+    db_session.add(payout)
+    db_session.commit()
+    assert db_session.get(CreatorPayout, payout.id).status == "pending"
+
+    with Session(db_session.get_bind()) as other:
+        update_payout_status(other, payout.id, "paid")
+    assert get_total_earnings(db_session, creator.id) == 700
+
+    update_payout_status(db_session, payout.id, "paid")
+    assert get_total_earnings(db_session, creator.id) == 700
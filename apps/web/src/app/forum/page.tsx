@@ -1,5 +1,5 @@
 import { fetchPrompts } from "@/lib/api";
-import { Prompt } from "@/lib/apiTypes";
+import { PromptListItem } from "@/lib/apiTypes";
 import Link from "next/link";
 import { formatDistanceToNow } from "date-fns";
 import { MessageSquare, Plus, User as UserIcon } from "lucide-react";
@@ -50,7 +50,7 @@ export default async function ForumPage() {
     );
 }
 
-function DiscussionCard({ discussion }: { discussion: Prompt }) {
+function DiscussionCard({ discussion }: { discussion: PromptListItem }) {
     return (
         <Link
             href={`/forum/${discussion.slug}`}
@@ -1,5 +1,5 @@
 import { Suspense } from "react";
-import { fetchPrompts, fetchTags, type Prompt } from "@/lib/api";
+import { fetchPrompts, fetchTags, type PromptListItem } from "@/lib/api";
 import { PromptCard } from "@/components/PromptCard";
 import { SearchAndFilters } from "@/components/SearchAndFilters";
 import { SearchFiltersSkeleton } from "@/components/SearchFiltersSkeleton";
@@ -61,7 +61,7 @@ export default async function LibraryPage(props: {
                         </Link>
                     </div>
                     <div className="grid gap-6 grid-cols-1 sm:grid-cols-2 lg:grid-cols-3">
-                        {featuredPrompts.map((p: Prompt) => (
+                        {featuredPrompts.map((p: PromptListItem) => (
                             <PromptCard key={`featured-${p.id}`} prompt={p} />
                         ))}
                         {/* Fallback if no featured prompts found, to ensure strip exists as requested */}
@@ -87,7 +87,7 @@ export default async function LibraryPage(props: {
 
                     <div className="grid gap-8 grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 animate-in fade-in slide-in-from-bottom-12 duration-1000 delay-300">
                         {prompts.length > 0 ? (
-                            prompts.map((p: Prompt) => (
+                            prompts.map((p: PromptListItem) => (
                                 <PromptCard key={p.id} prompt={p} />
                             ))
                         ) : (
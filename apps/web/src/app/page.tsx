@@ -1,4 +1,4 @@
-import { fetchPrompts, type Prompt } from "@/lib/api";
+import { fetchPrompts, type PromptListItem } from "@/lib/api";
 import { PromptCard } from "@/components/PromptCard";
 import Link from "next/link";
 import { Button } from "@/components/ui/button";
@@ -129,7 +129,7 @@ export default async function Home() {
           </div>
 
           <div className="grid gap-8 sm:grid-cols-2 lg:grid-cols-3">
-            {featuredPrompts.map((prompt: Prompt) => (
+            {featuredPrompts.map((prompt: PromptListItem) => (
               <PromptCard key={prompt.id} prompt={prompt} />
             ))}
           </div>
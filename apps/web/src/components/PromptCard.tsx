@@ -1,7 +1,7 @@
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import Link from "next/link";
-import { type Prompt } from "@/lib/api";
+import { type PromptListItem } from "@/lib/api";
 import { Heart, Bookmark, BarChart } from "lucide-react"; // Using BarChart as placeholder for difficulty or just text
 import Image from "next/image";
 
@@ -13,7 +13,7 @@ const WORKS_WITH_MAP: Record<string, string> = {
     "atlas": "/images/logos/atlas.png",
 };
 
-export function PromptCard({ prompt }: { prompt: Prompt }) {
+export function PromptCard({ prompt }: { prompt: PromptListItem }) {
     const isDraft = prompt.tags.includes("Draft") || prompt.title.includes("Draft");
     const creatorName = prompt.author_id || "Flowtab";
     const lastUpdated = prompt.updatedAt
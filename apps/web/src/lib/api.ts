@@ -4,6 +4,7 @@ import {
   type CommentListResponse,
   type LikeStatusResponse,
   type Prompt,
+  type PromptListItem,
   type PromptListResponse,
   type TagsResponse,
   type User,
@@ -16,6 +17,7 @@ export type {
   CommentListResponse,
   LikeStatusResponse,
   Prompt,
+  PromptListItem,
   PromptListResponse,
   TagsResponse,
   User,
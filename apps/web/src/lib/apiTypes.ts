@@ -1,5 +1,6 @@
 
-export interface Prompt {
+// A prompt as listed by GET /v1/prompts: everything but promptText and notes.
+export interface PromptListItem {
   id: string;
   slug: string;
   title: string;
@@ -8,9 +9,7 @@ export interface Prompt {
   worksWith: string[];
   tags: string[];
   targetSites: string[];
-  promptText: string;
   steps: string[];
-  notes: string;
   author_id?: string;
   createdAt: string; // ISO
   updatedAt: string; // ISO
@@ -22,6 +21,11 @@ export interface Prompt {
   currency: string;
 }
 
+export interface Prompt extends PromptListItem {
+  promptText: string;
+  notes: string;
+}
+
 export interface Comment {
   id: string;
   prompt_id: string;
@@ -48,7 +52,7 @@ export interface LikeStatusResponse {
 
 
 export interface PromptListResponse {
-  items: Prompt[];
+  items: PromptListItem[];
   page: number;
   pageSize: number;
   total: number;